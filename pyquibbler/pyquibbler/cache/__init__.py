@@ -1,10 +1,13 @@
-from typing import Any
+from typing import Any, Optional
+
+from pyquibbler.utilities.general_utils import Shape
 
 from .holistic_cache import HolisticCache
 from .shallow import NdVoidCache
 from .shallow.dict_cache import DictCache
 from .shallow.indexable_cache import IndexableCache
-from .shallow.nd_cache import NdFieldArrayShallowCache, NdUnstructuredArrayCache
+from .shallow.nd_cache import NdFieldArrayShallowCache, NdUnstructuredArrayCache, NdTiledArrayCache, \
+    get_bool_mask_of_component
 from .shallow.shallow_cache import ShallowCache
 from .cache import Cache, CacheStatus
 from .holistic_cache import PathCannotHaveComponentsException
@@ -12,13 +15,17 @@ from .cache_utils import get_uncached_paths_matching_path, \
     get_cached_data_at_truncated_path_given_result_at_uncached_path
 
 
-def create_cache(result: Any) -> ShallowCache:
+def create_cache(result: Any, tile_shape: Optional[Shape] = None) -> ShallowCache:
     """
     Create a new cache object matching the result- if no cache is found that specifically supports the requested
     object, a shallow cache will be created which does not support partial invalidation (paths must be whole in
-    validation and invalidation)
+    validation and invalidation).
+    If a tile shape is given, arrays spanning more than one tile are cached with per-tile validity.
     """
 
+    if NdTiledArrayCache.supports_result_with_tile_shape(result, tile_shape):
+        return NdTiledArrayCache.create_invalid_cache_from_result(result, tile_shape)
+
     cache_classes = {
         NdFieldArrayShallowCache,
         NdUnstructuredArrayCache,
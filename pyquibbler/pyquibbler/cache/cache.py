@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
 from enum import Enum
+from sys import getsizeof
 from typing import Tuple, Type, Any
 
+import numpy as np
+
 from pyquibbler.path import Path, Paths
 
 
@@ -107,3 +110,14 @@ class Cache(ABC):
 
     def make_a_copy_if_value_is_a_view(self):
         pass
+
+    @staticmethod
+    def _get_nbytes_of(obj: Any) -> int:
+        # as in CachedQuibFuncCall._should_cache, we only measure the outer size of non-array objects
+        return obj.nbytes if isinstance(obj, (np.ndarray, np.generic)) else getsizeof(obj)
+
+    def get_nbytes(self) -> int:
+        """
+        Get the (approximate) memory size of the cache, in bytes.
+        """
+        return self._get_nbytes_of(self._value)
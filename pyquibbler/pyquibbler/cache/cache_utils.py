@@ -2,8 +2,10 @@ from __future__ import annotations
 from typing import Optional, Any
 
 from pyquibbler.path import deep_get, deep_set, Path, Paths
+from pyquibbler.utilities.general_utils import Shape
 from .cache import Cache
 from .holistic_cache import HolisticCache
+from .shallow.nd_cache import NdTiledArrayCache
 
 
 def get_cached_data_at_truncated_path_given_result_at_uncached_path(cache, result, truncated_path, uncached_path):
@@ -13,6 +15,10 @@ def get_cached_data_at_truncated_path_given_result_at_uncached_path(cache, resul
 
     if isinstance(cache, HolisticCache):
         value = valid_value
+    elif isinstance(cache, NdTiledArrayCache) and len(uncached_path) == 1:
+        # The uncached paths of a tiled cache are its own (whole-tile) truncated paths, so we avoid copying the
+        # whole cached array
+        value = valid_value
     else:
         new_data = deep_set(data, uncached_path, valid_value)
         value = deep_get(new_data, truncated_path)
@@ -20,14 +26,14 @@ def get_cached_data_at_truncated_path_given_result_at_uncached_path(cache, resul
     return value
 
 
-def ensure_cache_matches_result(cache: Optional[Cache], new_result: Any) -> Cache:
+def ensure_cache_matches_result(cache: Optional[Cache], new_result: Any, tile_shape: Optional[Shape] = None) -> Cache:
     """
     Ensure there exists a current cache matching the given result; if the held cache does not match,
     this function will now recreate the cache to match it
     """
     from pyquibbler.cache import create_cache
     if cache is None or not cache.matches_result(new_result):
-        cache = create_cache(new_result)
+        cache = create_cache(new_result, tile_shape)
     return cache
 
 
@@ -1,3 +1,5 @@
 from .nd_unstructured_array_cache import NdUnstructuredArrayCache
 from .nd_field_array_cache import NdFieldArrayShallowCache
 from .nd_void_cache import NdVoidCache
+from .nd_tiled_array_cache import NdTiledArrayCache
+from .invalid_mask import get_bool_mask_of_component
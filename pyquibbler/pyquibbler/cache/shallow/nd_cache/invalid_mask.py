@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from copy import copy
+from typing import Any, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from pyquibbler.path import SpecialComponent
+from pyquibbler.utilities.general_utils import Shape
+
+
+EMPTY_INDICES = np.array([], dtype=np.intp)
+
+
+def get_bool_mask_of_component(component: Any, shape: Shape) -> Optional[NDArray[bool]]:
+    """
+    Return the bool mask of the elements referenced by a component of an uncached path of an array: a bool mask in
+    the shape of the array, or a tuple of index arrays, one per axis (as created by
+    `InvalidMask.create_component_at_indices`). Returns None for any other component.
+    """
+    if isinstance(component, np.ndarray) and component.dtype == np.bool_ and component.shape == tuple(shape):
+        return component
+    if isinstance(component, tuple) and len(component) == len(shape) > 0 \
+            and all(isinstance(indices, np.ndarray) and indices.dtype.kind in 'iu' for indices in component):
+        mask = np.zeros(shape, dtype=np.bool_)
+        mask[component] = True
+        return mask
+    return None
+
+
+class InvalidMask:
+    """
+    A boolean mask of the invalid elements of a cached array, whose representation adapts to the invalid region:
+
+    - uniform: all elements are valid, or all are invalid.
+    - sparse: uniform, except for the elements at a sorted array of flat indices.
+    - dense: a boolean array. Used once the deviating elements exceed DENSITY_THRESHOLD of the array (where the
+      flat indices take more memory than the array), until the mask is set uniform again.
+
+    Setting and querying the mask at a component then take O(referenced elements + deviating elements), rather
+    than O(size of the array). In particular, querying an all-valid mask is O(1).
+    """
+
+    DENSITY_THRESHOLD = 1 / np.dtype(np.intp).itemsize
+
+    def __init__(self, shape: Shape, value: bool):
+        self._shape = tuple(shape)
+        self._size = int(np.prod(self._shape, dtype=np.intp))
+        self._uniform_value = bool(value)
+        self._deviating_indices: NDArray[np.intp] = EMPTY_INDICES
+        self._dense: Optional[NDArray[bool]] = None
+
+    @property
+    def shape(self) -> Shape:
+        return self._shape
+
+    @property
+    def is_dense(self) -> bool:
+        return self._dense is not None
+
+    @property
+    def _is_uniform(self) -> bool:
+        return not self.is_dense and len(self._deviating_indices) == 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._dense.nbytes if self.is_dense else self._deviating_indices.nbytes
+
+    def _get_flat_indices(self, component: Any) -> NDArray[np.intp]:
+        """
+        The sorted flat indices of the elements referenced by an indexing component, computed from zero-stride
+        views of the index along each axis, in O(referenced elements).
+        """
+        if component is SpecialComponent.ALL:
+            component = True
+        elif component is SpecialComponent.OUT_OF_ARRAY:
+            component = slice(None)
+        if isinstance(component, np.ndarray) and component.dtype == np.bool_ and component.shape == self._shape:
+            return np.flatnonzero(component)
+        flat_indices = np.broadcast_to(np.intp(0), self._shape)[component]
+        stride = 1
+        for axis in reversed(range(len(self._shape))):
+            axis_indices = np.arange(self._shape[axis]).reshape((-1, ) + (1, ) * (len(self._shape) - axis - 1))
+            flat_indices = flat_indices + np.broadcast_to(axis_indices, self._shape)[component] * stride
+            stride *= self._shape[axis]
+        return np.unique(flat_indices)
+
+    def _set_uniform(self, value: bool):
+        self._uniform_value = value
+        self._deviating_indices = EMPTY_INDICES
+        self._dense = None
+
+    def _convert_to_dense(self):
+        self._dense = np.full(self._shape, self._uniform_value)
+        self._dense.reshape(-1)[self._deviating_indices] = not self._uniform_value
+        self._deviating_indices = EMPTY_INDICES
+
+    def set_at_component(self, component: Any, value: bool):
+        """
+        Set the mask at the elements referenced by the component.
+        """
+        value = bool(value)
+        indices = self._get_flat_indices(component)
+        if len(indices) == 0:
+            return
+        if len(indices) == self._size:
+            self._set_uniform(value)
+        elif self.is_dense:
+            self._dense.reshape(-1)[indices] = value
+        elif value == self._uniform_value:
+            self._deviating_indices = np.setdiff1d(self._deviating_indices, indices, assume_unique=True)
+        else:
+            self._deviating_indices = np.union1d(self._deviating_indices, indices)
+            if len(self._deviating_indices) == self._size:
+                self._set_uniform(value)
+            elif len(self._deviating_indices) > self.DENSITY_THRESHOLD * self._size:
+                self._convert_to_dense()
+
+    def get_invalid_indices(self) -> NDArray[np.intp]:
+        """
+        The sorted flat indices of all invalid elements.
+        """
+        if self.is_dense:
+            return np.flatnonzero(self._dense)
+        if not self._uniform_value:
+            return self._deviating_indices
+        return np.setdiff1d(np.arange(self._size), self._deviating_indices, assume_unique=True)
+
+    def get_invalid_indices_at_component(self, component: Any) -> NDArray[np.intp]:
+        """
+        The sorted flat indices of the invalid elements referenced by the component.
+        """
+        if self._is_uniform and not self._uniform_value:
+            return EMPTY_INDICES
+        indices = self._get_flat_indices(component)
+        if self.is_dense:
+            return indices[self._dense.reshape(-1)[indices]]
+        is_deviating = np.isin(indices, self._deviating_indices, assume_unique=True)
+        return indices[is_deviating != self._uniform_value]
+
+    def create_bool_mask_at_indices(self, indices: NDArray[np.intp]) -> NDArray[bool]:
+        """
+        Create an array of False in the shape of the mask, with True at the given flat indices.
+        """
+        mask = np.zeros(self._shape, dtype=np.bool_)
+        mask.reshape(-1)[indices] = True
+        return mask
+
+    def create_component_at_indices(self, indices: NDArray[np.intp]) -> Any:
+        """
+        Create an indexing component referencing the elements at the given sorted flat indices: a tuple of index
+        arrays (one per axis) when the indices are sparse, taking O(indices), or otherwise a boolean mask in the
+        shape of the mask.
+        """
+        if len(self._shape) == 0 or len(indices) > self.DENSITY_THRESHOLD * self._size:
+            return self.create_bool_mask_at_indices(indices)
+        return np.unravel_index(indices, self._shape)
+
+    def is_all_invalid(self) -> bool:
+        if self.is_dense:
+            return bool(np.all(self._dense))
+        return self._is_uniform and self._uniform_value
+
+    def is_all_valid(self) -> bool:
+        if self.is_dense:
+            return not np.any(self._dense)
+        return self._is_uniform and not self._uniform_value
+
+    def __array__(self, dtype=None, copy=None):
+        if self.is_dense:
+            return self._dense if dtype is None else self._dense.astype(dtype)
+        return self.create_bool_mask_at_indices(self.get_invalid_indices()).astype(dtype or np.bool_)
+
+    def __copy__(self):
+        mask = InvalidMask.__new__(InvalidMask)
+        mask.__dict__.update(self.__dict__)
+        mask._dense = copy(self._dense)
+        return mask
+
+    def __repr__(self):
+        return f'{type(self).__name__}({np.asarray(self)})'
@@ -1,13 +1,17 @@
+from typing import List, Dict
+
 import numpy as np
 
 from pyquibbler.cache.shallow.nd_cache.nd_indexable_cache import NdIndexableCache
-from pyquibbler.utilities.general_utils import create_bool_mask_with_true_at_indices
-from pyquibbler.path import PathComponent
+from pyquibbler.cache.shallow.nd_cache.invalid_mask import InvalidMask
+from pyquibbler.path import PathComponent, Path
 
 
 class NdFieldArrayShallowCache(NdIndexableCache):
     """
-    A cache for any ndarray which has dtype names (ie a "field array")
+    A cache for any ndarray which has dtype names (ie a "field array").
+
+    The invalid elements of each field are kept in an InvalidMask.
     """
 
     SUPPORTING_TYPES = (np.ndarray,)
@@ -18,33 +22,50 @@ class NdFieldArrayShallowCache(NdIndexableCache):
 
     @classmethod
     def create_invalid_cache_from_result(cls, result):
-        mask = np.full(result.shape, True, dtype=[(name, np.bool_) for name in result.dtype.names])
         return cls(
             result,
-            invalid_mask=mask
+            invalid_mask={name: InvalidMask(result.shape, True) for name in result.dtype.names}
         )
 
-    def _create_paths_for_indices(self, indices):
-        boolean_mask_of_indices = create_bool_mask_with_true_at_indices(self._value.shape, indices)
+    def get_nbytes(self) -> int:
+        return self._get_nbytes_of(self._value) + sum(mask.nbytes for mask in self._invalid_mask.values())
+
+    def _set_valid_at_all_paths(self):
+        self._invalid_mask = {name: InvalidMask(self._value.shape, False) for name in self._invalid_mask}
+
+    @staticmethod
+    def _get_referenced_names(path_component: PathComponent) -> List[str]:
+        component = path_component.component
+        return [component] if isinstance(component, str) else list(component)
+
+    def _set_invalid_mask_at_non_empty_path(self, path: Path, value: bool) -> None:
+        with self._raise_on_invalid_indexing(path[:1]):
+            if path[0].referencing_field_in_field_array(type(self._value)):
+                for name in self._get_referenced_names(path[0]):
+                    if name not in self._invalid_mask:
+                        raise IndexError(f'no field of name {name}')
+                    self._invalid_mask[name] = InvalidMask(self._value.shape, value)
+            else:
+                for mask in self._invalid_mask.values():
+                    mask.set_at_component(path[0].component, value)
 
-        return [
-            [PathComponent(name),
-             PathComponent(np.logical_and(
-                 boolean_mask_of_indices,
-                 self._invalid_mask[name]
-             ))]
-            for name in self._invalid_mask.dtype.names
-        ]
+    def _create_paths_for_invalid_indices(self, names_to_invalid_indices: Dict[str, np.ndarray]) \
+            -> List[List[PathComponent]]:
+        return [[PathComponent(name), PathComponent(self._invalid_mask[name].create_component_at_indices(indices))]
+                for name, indices in names_to_invalid_indices.items() if len(indices) > 0]
 
     def _get_uncached_paths_at_path_component(self,
                                               path_component):
         if path_component.referencing_field_in_field_array(type(self._value)):
-            paths = [[PathComponent(path_component.component),
-                      PathComponent(np.array(self._invalid_mask[path_component.component]))]]
+            names_to_invalid_indices = {name: self._invalid_mask[name].get_invalid_indices()
+                                        for name in self._get_referenced_names(path_component)}
         else:
-            paths = self._create_paths_for_indices(path_component.component)
+            with self._raise_on_invalid_indexing([path_component]):
+                names_to_invalid_indices = {
+                    name: mask.get_invalid_indices_at_component(path_component.component)
+                    for name, mask in self._invalid_mask.items()}
 
-        return self._filter_empty_paths(paths)
+        return self._create_paths_for_invalid_indices(names_to_invalid_indices)
 
     def _is_completely_invalid(self):
-        return all(np.all(self._invalid_mask[name]) for name in self._invalid_mask.dtype.names)
+        return all(mask.is_all_invalid() for mask in self._invalid_mask.values())
@@ -1,9 +1,10 @@
 from abc import ABC
+from contextlib import contextmanager
 from typing import List
 
 import numpy as np
 
-from pyquibbler.path import PathComponent
+from pyquibbler.path import PathComponent, Path, FailedToDeepAssignException
 from pyquibbler.cache.shallow.shallow_cache import ShallowCache
 
 
@@ -26,8 +27,15 @@ class NdIndexableCache(ShallowCache, ABC):
             self._invalid_mask = mask
 
     @staticmethod
-    def _filter_empty_paths(paths):
-        return list(filter(lambda p: np.any(p[-1].component), paths))
+    @contextmanager
+    def _raise_on_invalid_indexing(path: Path):
+        """
+        Raise indexing errors of the invalid mask as deep_set does.
+        """
+        try:
+            yield
+        except (IndexError, TypeError) as e:
+            raise FailedToDeepAssignException(path=path, exception=e)
 
     def _get_all_uncached_paths(self) -> List[List[PathComponent]]:
         return self._get_uncached_paths_at_path_component(PathComponent(True))
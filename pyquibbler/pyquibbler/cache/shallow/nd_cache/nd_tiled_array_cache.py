@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import List, Tuple, Optional, Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from pyquibbler.path import PathComponent, Path, SpecialComponent
+from pyquibbler.utilities.general_utils import create_bool_mask_with_true_at_indices, Shape
+from pyquibbler.cache.shallow.nd_cache.nd_unstructured_array_cache import NdUnstructuredArrayCache
+from pyquibbler.cache.shallow.nd_cache.invalid_mask import InvalidMask
+
+
+class NdTiledArrayCache(NdUnstructuredArrayCache):
+    """
+    A cache for a large unstructured ndarray, whose validity is tracked per tile, rather than per element.
+
+    The leading axes of the array are split into tiles of `tile_shape` (tiles at the end of each axis may be
+    smaller); trailing axes not covered by `tile_shape` are whole in each tile.
+    A tile is valid only once all its elements are set valid; setting any of its elements invalid invalidates
+    the whole tile. The uncached paths are therefore whole tiles, which bounds the work of each request to the
+    tiles it references, and keeps the size of the invalid mask at the number of tiles.
+    """
+
+    def __init__(self, value, invalid_mask, tile_shape: Shape):
+        super(NdTiledArrayCache, self).__init__(value, invalid_mask)
+        self._tile_shape = tuple(tile_shape)
+
+    @property
+    def tile_shape(self) -> Shape:
+        return self._tile_shape
+
+    @classmethod
+    def supports_result_with_tile_shape(cls, result, tile_shape: Optional[Shape]) -> bool:
+        """
+        Is the result an unstructured array which spans more than one tile of the given shape?
+        """
+        return tile_shape is not None \
+            and cls.supports_result(result) \
+            and result.size > 0 \
+            and result.ndim >= len(tile_shape) \
+            and any(length > tile_length for length, tile_length in zip(result.shape, tile_shape))
+
+    @classmethod
+    def create_invalid_cache_from_result(cls, result, tile_shape: Shape):
+        tile_grid_shape = cls._get_tile_grid_shape(result.shape, tile_shape)
+        return cls(result, invalid_mask=InvalidMask(tile_grid_shape, True), tile_shape=tile_shape)
+
+    @staticmethod
+    def _get_tile_grid_shape(shape: Shape, tile_shape: Shape) -> Shape:
+        return tuple(-(-length // tile_length) for length, tile_length in zip(shape, tile_shape))
+
+    def _get_tile_starts(self, axis: int) -> NDArray[np.intp]:
+        return np.arange(0, self._value.shape[axis], self._tile_shape[axis])
+
+    def _set_valid_at_all_paths(self):
+        self._invalid_mask = InvalidMask(self._invalid_mask.shape, False)
+
+    def _get_indices_along_axes(self, component: Any) -> Optional[List[NDArray[np.intp]]]:
+        """
+        The indices referenced along each axis by a basic-indexing component (ints, slices, and an ellipsis),
+        or None for other components.
+        """
+        if component is SpecialComponent.ALL or component is True:
+            component = ()
+        if not isinstance(component, tuple):
+            component = (component,)
+        if not all(isinstance(item, (int, np.integer, slice)) and not isinstance(item, (bool, np.bool_))
+                   or item is Ellipsis for item in component) or component.count(Ellipsis) > 1:
+            return None
+        shape = self._value.shape
+        if len(component) - component.count(Ellipsis) > len(shape):
+            raise IndexError(f'too many indices for array: array is {len(shape)}-dimensional')
+        if Ellipsis in component:
+            ellipsis_index = component.index(Ellipsis)
+            num_expanded_axes = len(shape) - len(component) + 1
+            component = component[:ellipsis_index] + (slice(None),) * num_expanded_axes \
+                + component[ellipsis_index + 1:]
+        component = component + (slice(None),) * (len(shape) - len(component))
+        return [np.atleast_1d(np.arange(length)[item]) for length, item in zip(shape, component)]
+
+    def _get_referenced_and_covered_tiles(self, component: Any) -> Tuple[NDArray[bool], NDArray[bool]]:
+        """
+        Boolean masks of the tile grid: the tiles with any element referenced by the component,
+        and the tiles with all elements referenced by the component.
+        """
+        num_tiled_axes = len(self._tile_shape)
+        indices_along_axes = self._get_indices_along_axes(component)
+        if indices_along_axes is not None:
+            # Basic indexing references the outer product of its indices along the axes, so we find the tiles
+            # along each axis separately.
+            referenced = np.array(True)
+            covered = np.array(all(len(indices) == length for indices, length
+                                   in zip(indices_along_axes[num_tiled_axes:], self._value.shape[num_tiled_axes:])))
+            for axis, indices in enumerate(indices_along_axes[:num_tiled_axes]):
+                is_referenced = np.zeros(self._value.shape[axis], dtype=np.bool_)
+                is_referenced[indices] = True
+                starts = self._get_tile_starts(axis)
+                referenced = np.multiply.outer(referenced, np.logical_or.reduceat(is_referenced, starts))
+                covered = np.multiply.outer(covered, np.logical_and.reduceat(is_referenced, starts))
+            return referenced, covered
+
+        mask = create_bool_mask_with_true_at_indices(self._value.shape, component)
+        trailing_axes = tuple(range(num_tiled_axes, mask.ndim))
+        referenced = np.any(mask, axis=trailing_axes)
+        covered = np.all(mask, axis=trailing_axes)
+        for axis in range(num_tiled_axes):
+            starts = self._get_tile_starts(axis)
+            referenced = np.logical_or.reduceat(referenced, starts, axis=axis)
+            covered = np.logical_and.reduceat(covered, starts, axis=axis)
+        return referenced, covered
+
+    def _set_invalid_mask_at_non_empty_path(self, path: Path, value: bool) -> None:
+        with self._raise_on_invalid_indexing(path[:1]):
+            referenced, covered = self._get_referenced_and_covered_tiles(path[0].component)
+        self._invalid_mask.set_at_component(referenced if value else covered, value)
+
+    def _get_all_uncached_paths(self) -> List[List[PathComponent]]:
+        return self._create_paths_for_invalid_tiles(self._invalid_mask.get_invalid_indices())
+
+    def _get_uncached_paths_at_path_component(self, path_component: PathComponent) -> List[List[PathComponent]]:
+        if self._invalid_mask.is_all_valid():
+            return []
+        with self._raise_on_invalid_indexing([path_component]):
+            referenced, _ = self._get_referenced_and_covered_tiles(path_component.component)
+        return self._create_paths_for_invalid_tiles(self._invalid_mask.get_invalid_indices_at_component(referenced))
+
+    def _create_paths_for_invalid_tiles(self, invalid_tiles: NDArray[np.intp]) -> List[List[PathComponent]]:
+        """
+        A single path referencing the given tiles: slices, if the tiles form a box in the tile grid,
+        otherwise a boolean mask of the array.
+        """
+        if len(invalid_tiles) == 0:
+            return []
+        tile_coordinates = np.unravel_index(invalid_tiles, self._invalid_mask.shape)
+        first_tiles = [np.min(coordinates) for coordinates in tile_coordinates]
+        last_tiles = [np.max(coordinates) for coordinates in tile_coordinates]
+        num_tiles_in_box = np.prod([last - first + 1 for first, last in zip(first_tiles, last_tiles)])
+        if num_tiles_in_box == len(invalid_tiles):
+            return [[PathComponent(tuple(
+                slice(int(first) * tile_length, (int(last) + 1) * tile_length)
+                for first, last, tile_length in zip(first_tiles, last_tiles, self._tile_shape)))]]
+
+        tiles = self._invalid_mask.create_bool_mask_at_indices(invalid_tiles)
+        for axis in range(len(self._tile_shape)):
+            tile_lengths = np.diff(self._get_tile_starts(axis), append=self._value.shape[axis])
+            tiles = np.repeat(tiles, tile_lengths, axis=axis)
+        mask = np.empty(self._value.shape, dtype=np.bool_)
+        mask[...] = tiles.reshape(tiles.shape + (1,) * (mask.ndim - tiles.ndim))
+        return [[PathComponent(mask)]]
@@ -2,14 +2,17 @@ from typing import List
 
 import numpy as np
 
-from pyquibbler.utilities.general_utils import create_bool_mask_with_true_at_indices
-from pyquibbler.path import PathComponent
+from pyquibbler.path import PathComponent, Path
 from pyquibbler.cache.shallow.nd_cache.nd_indexable_cache import NdIndexableCache
+from pyquibbler.cache.shallow.nd_cache.invalid_mask import InvalidMask
 
 
 class NdUnstructuredArrayCache(NdIndexableCache):
     """
-    A cache for an ndarray which is NOT structured (rec/field)
+    A cache for an ndarray which is NOT structured (rec/field).
+
+    The invalid elements are kept in an InvalidMask, so that getting the uncached paths takes O(size of the
+    referenced and invalid regions), rather than O(size of the array).
     """
 
     SUPPORTING_TYPES = (np.ndarray,)
@@ -20,18 +23,30 @@ class NdUnstructuredArrayCache(NdIndexableCache):
 
     @classmethod
     def create_invalid_cache_from_result(cls, result):
-        mask = np.full(result.shape, True, dtype=np.bool_)
-        return cls(result, invalid_mask=mask)
+        return cls(result, invalid_mask=InvalidMask(result.shape, True))
+
+    def get_nbytes(self) -> int:
+        return self._get_nbytes_of(self._value) + self._invalid_mask.nbytes
+
+    def _set_valid_at_all_paths(self):
+        self._invalid_mask = InvalidMask(self._value.shape, False)
+
+    def _set_invalid_mask_at_non_empty_path(self, path: Path, value: bool) -> None:
+        with self._raise_on_invalid_indexing(path[:1]):
+            self._invalid_mask.set_at_component(path[0].component, value)
 
     def _get_all_uncached_paths(self) -> List[List[PathComponent]]:
-        return self._get_uncached_paths_at_path_component(PathComponent(True))
+        return self._create_paths_for_invalid_indices(self._invalid_mask.get_invalid_indices())
 
     def _is_completely_invalid(self):
-        return np.all(self._invalid_mask)
+        return self._invalid_mask.is_all_invalid()
 
     def _get_uncached_paths_at_path_component(self, path_component: PathComponent) -> List[List[PathComponent]]:
-        boolean_mask_of_indices = create_bool_mask_with_true_at_indices(self._value.shape, path_component.component)
-
-        return self._filter_empty_paths([
-                    [PathComponent(np.logical_and(boolean_mask_of_indices, self._invalid_mask))]
-                ])
+        with self._raise_on_invalid_indexing([path_component]):
+            invalid_indices = self._invalid_mask.get_invalid_indices_at_component(path_component.component)
+        return self._create_paths_for_invalid_indices(invalid_indices)
+
+    def _create_paths_for_invalid_indices(self, invalid_indices: np.ndarray) -> List[List[PathComponent]]:
+        if len(invalid_indices) == 0:
+            return []
+        return [[PathComponent(self._invalid_mask.create_component_at_indices(invalid_indices))]]
@@ -26,6 +26,9 @@ class ShallowCache(Cache):
         super(ShallowCache, self).__init__(value)
         self._invalid_mask = invalid_mask
 
+    def get_nbytes(self) -> int:
+        return super(ShallowCache, self).get_nbytes() + self._get_nbytes_of(self._invalid_mask)
+
     @abstractmethod
     def _set_valid_at_all_paths(self):
         """
@@ -62,6 +65,15 @@ class ShallowCache(Cache):
             self._set_valid_at_all_paths()
             self._value = value
 
+    def set_valid_at_path(self, path: Path) -> None:
+        """
+        Set the given path as valid, without changing the value (which was already updated in-place).
+        """
+        if len(path) != 0:
+            self._set_invalid_mask_at_non_empty_path(path, False)
+        else:
+            self._set_valid_at_all_paths()
+
     def set_invalid_at_path(self, path: Path) -> None:
         self._set_invalid_mask_at_path(path, True)
 
@@ -38,6 +38,12 @@ GRAPHICS_DRIVEN_ASSIGNMENT_RESOLUTION = Mutable(1000)  # Number of pixels in mou
 
 WARN_ON_UNSUPPORTED_BACKEND = Flag(True)
 
+BLIT_WHILE_DRAGGING = Flag(False)  # Redraw only the dragged artists (on backends supporting blitting)
+
+# Quib artists with at least this number of points are picked using a grid index of their pixel coordinates.
+# None to always use the linear hit-testing of matplotlib.
+PIXEL_INDEX_MIN_NUM_POINTS = Mutable(1000)
+
 
 """ Override dialog """
 
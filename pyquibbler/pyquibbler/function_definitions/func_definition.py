@@ -5,6 +5,7 @@ from typing import Set, Type, List, Callable, Optional, Union, Tuple
 
 from pyquibbler.path_translation import BackwardsPathTranslator, ForwardsPathTranslator
 from pyquibbler.type_translation.translators import TypeTranslator
+from pyquibbler.shape_translation.translators import ShapeTranslator
 from pyquibbler.function_overriding.third_party_overriding.numpy.inverse_functions import InverseFunc
 
 from .func_call import FuncArgsKwargs
@@ -45,6 +46,7 @@ class FuncDefinition:
     quib_function_call_cls: Type[QuibFuncCall] = field(repr=False, default_factory=get_default_quib_func_call)
     kwargs_to_ignore_in_repr: Optional[Set[str]] = None
     result_type_or_type_translators: Union[Type, List[Type[TypeTranslator]]] = field(repr=False, default_factory=list)
+    result_shape_translators: List[Type[ShapeTranslator]] = field(repr=False, default_factory=list)
 
     def __hash__(self):
         return id(self)
@@ -116,6 +118,7 @@ def create_or_reuse_func_definition(base_func_definition: Optional[FuncDefinitio
                                     forwards_path_translators: List[Type[ForwardsPathTranslator]] = None,
                                     quib_function_call_cls: Type[QuibFuncCall] = None,
                                     result_type_or_type_translators: Union[Type, List[Type[TypeTranslator]]] = None,
+                                    result_shape_translators: List[Type[ShapeTranslator]] = None,
                                     func_definition_cls: Optional[Type[FuncDefinition]] = None,
                                     kwargs_to_ignore_in_repr: Optional[Set[str]] = None,
                                     **kwargs) -> FuncDefinition:
@@ -139,6 +142,7 @@ def create_or_reuse_func_definition(base_func_definition: Optional[FuncDefinitio
             quib_function_call_cls=quib_function_call_cls or bfd.quib_function_call_cls,
             pass_quibs=pass_quibs or bfd.pass_quibs,
             result_type_or_type_translators=result_type_or_type_translators or bfd.result_type_or_type_translators,
+            result_shape_translators=result_shape_translators or bfd.result_shape_translators,
             lazy=lazy or bfd.lazy,
             is_artist_setter=is_artist_setter or bfd.is_artist_setter,
             kwargs_to_ignore_in_repr=kwargs_to_ignore_in_repr or bfd.kwargs_to_ignore_in_repr,
@@ -164,6 +168,7 @@ def create_or_reuse_func_definition(base_func_definition: Optional[FuncDefinitio
             quib_function_call_cls=quib_function_call_cls,
             pass_quibs=pass_quibs,
             result_type_or_type_translators=result_type_or_type_translators or [],
+            result_shape_translators=result_shape_translators or [],
             lazy=lazy,
             is_artist_setter=is_artist_setter,
             kwargs_to_ignore_in_repr=kwargs_to_ignore_in_repr,
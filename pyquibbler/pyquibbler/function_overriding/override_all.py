@@ -12,7 +12,8 @@ from .exceptionhook import override_jupyterlab_excepthook
 from .function_override import FuncOverride
 from .is_initiated import is_quibbler_initialized, set_quibbler_initialized
 from .third_party_overriding.ipywidgets.overrides import override_ipywidgets_if_installed
-from .third_party_overriding.non_quib_overrides import override_axes_methods, switch_widgets_to_quib_supporting_widgets
+from .third_party_overriding.non_quib_overrides import override_axes_methods, \
+    switch_widgets_to_quib_supporting_widgets, override_artists_contains
 from .quib_overrides.operators.overrides import create_operator_overrides
 from .quib_overrides.quib_methods import create_quib_method_overrides
 from .third_party_overriding.numpy.overrides import create_numpy_overrides
@@ -111,6 +112,8 @@ def initialize_quibbler(draggable_plots: bool = True,
 
     override_axes_methods()
 
+    override_artists_contains()
+
     ipywidgets_installed = override_ipywidgets_if_installed()
 
     if not ipywidgets_installed and within_jupyterlab:
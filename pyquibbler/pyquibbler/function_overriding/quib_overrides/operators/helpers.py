@@ -43,6 +43,7 @@ def operator_override(func_name,
                       inverters: Optional[List] = None,
                       backwards_path_translators: Optional[List] = None,
                       forwards_path_translators: Optional[List] = None,
+                      result_shape_translators: Optional[List] = None,
                       is_reverse: bool = False,
                       ):
     if is_reverse:
@@ -54,6 +55,7 @@ def operator_override(func_name,
                              inverters=inverters,
                              backwards_path_translators=backwards_path_translators,
                              forwards_path_translators=forwards_path_translators,
+                             result_shape_translators=result_shape_translators,
                              )
 
 
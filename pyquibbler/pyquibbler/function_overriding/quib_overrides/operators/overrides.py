@@ -8,8 +8,11 @@ from pyquibbler.function_overriding.third_party_overriding.numpy.overrides impor
 from pyquibbler.inversion.inverters.getitem import GetItemInverter
 from pyquibbler.path_translation.translators.transpositional import \
     TranspositionalBackwardsPathTranslator, TranspositionalForwardsPathTranslator
+from pyquibbler.path_translation.translators.index_mapping import \
+    IndexMappingBackwardsPathTranslator, IndexMappingForwardsPathTranslator
 from pyquibbler.path_translation.translators.getitem import \
     GetItemBackwardsPathTranslator, GetItemForwardsPathTranslator
+from pyquibbler.shape_translation.translators import ProxyShapeTranslator
 
 
 def create_operator_overrides():
@@ -70,7 +73,10 @@ def create_operator_overrides():
         # Get item
         operator_override(
             '__getitem__', [0], inverters=[GetItemInverter],
-            backwards_path_translators=[GetItemBackwardsPathTranslator, TranspositionalBackwardsPathTranslator],
-            forwards_path_translators=[GetItemForwardsPathTranslator, TranspositionalForwardsPathTranslator]
+            backwards_path_translators=[GetItemBackwardsPathTranslator, IndexMappingBackwardsPathTranslator,
+                                        TranspositionalBackwardsPathTranslator],
+            forwards_path_translators=[GetItemForwardsPathTranslator, IndexMappingForwardsPathTranslator,
+                                       TranspositionalForwardsPathTranslator],
+            result_shape_translators=[ProxyShapeTranslator],
         )
     ]
@@ -10,13 +10,16 @@ from mpl_toolkits.mplot3d import Axes3D
 from typing import Any, Tuple, List, Optional
 from pyquibbler.function_definitions import SourceLocation
 from pyquibbler.quib.find_quibs import is_there_a_quib_in_object
+from pyquibbler.quib.quib import Quib
 from pyquibbler.utilities.general_utils import Args, Kwargs
+from pyquibbler.utilities.input_validation_utils import get_enum_by_str
 
 from pyquibbler.env import DRAGGABLE_PLOTS_BY_DEFAULT
 from pyquibbler.function_overriding.function_override import FuncOverride
 from pyquibbler.function_overriding.third_party_overriding.general_helpers import override_with_cls, override_class
 from pyquibbler.quib.graphics import artist_wrapper
 
+from pyquibbler.quib.graphics.decimation import DecimationMethod, DECIMATE_KWARG
 from pyquibbler.quib.graphics.event_handling import CanvasEventHandler
 from pyquibbler.quib.graphics.event_handling.plt_plot_parser import get_xdata_arg_indices_and_ydata_arg_indices
 from .func_definitions import FUNC_DEFINITION_GRAPHICS, FUNC_DEFINITION_GRAPHICS_AXES_SETTER
@@ -70,6 +73,29 @@ class PlotOverride(GraphicsOverride):
         return args, kwargs, quib_locations
 
 
+@dataclass
+class LinePlotOverride(PlotOverride):
+    """
+    An override of plt.plot, supporting decimation of lines with many points using `quibbler_decimate`
+    """
+
+    @staticmethod
+    def _modify_args_kwargs(args: Args, kwargs: Kwargs, quib_locations: List[SourceLocation]
+                            ) -> Tuple[Args, Kwargs, Optional[List[SourceLocation]]]:
+        decimate = kwargs.get(DECIMATE_KWARG)
+        if not isinstance(decimate, Quib):
+            get_enum_by_str(DecimationMethod, decimate, allow_none=True)
+        return PlotOverride._modify_args_kwargs(args, kwargs, quib_locations)
+
+    @staticmethod
+    def _call_wrapped_func(func, args: Args, kwargs: Kwargs) -> Any:
+        """
+        Decimation only applies to lines of quib data, which are re-decimated as the axes limits change.
+        """
+        kwargs.pop(DECIMATE_KWARG, None)
+        return func(*args, **kwargs)
+
+
 @dataclass
 class AxesSetOverride(GraphicsOverride):
 
@@ -129,6 +155,11 @@ plot_override = partial(override_with_cls, PlotOverride, Axes,
                         should_remove_arguments_equal_to_defaults=True,
                         kwargs_to_ignore_in_repr={'picker'})
 
+line_plot_override = partial(override_with_cls, LinePlotOverride, Axes,
+                             base_func_definition=FUNC_DEFINITION_GRAPHICS,
+                             should_remove_arguments_equal_to_defaults=True,
+                             kwargs_to_ignore_in_repr={'picker'})
+
 axes_setter_override = partial(override_with_cls, AxesSetOverride, Axes,
                                base_func_definition=FUNC_DEFINITION_GRAPHICS_AXES_SETTER,
                                should_remove_arguments_equal_to_defaults=True)
@@ -6,18 +6,21 @@ from matplotlib.axes import Axes
 from pyquibbler.function_overriding.third_party_overriding.general_helpers import override_not_implemented
 from pyquibbler.function_overriding.third_party_overriding.matplotlib.helpers import axes_override, \
     axes_setter_override, widget_override, axes_lim_override, plot_override, patches_override, axes3d_override, \
-    graphics_override_read_file
+    graphics_override_read_file, line_plot_override
 from pyquibbler.quib.func_calling.func_calls import RadioButtonsQuibFuncCall, SliderQuibFuncCall, \
     RangeSliderQuibFuncCall, RectangleSelectorQuibFuncCall,  CheckButtonsQuibFuncCall
 from pyquibbler.quib.func_calling.func_calls.known_graphics.plot_call import PlotQuibFuncCall
+from pyquibbler.quib.func_calling.func_calls.known_graphics.imshow_call import ImshowQuibFuncCall
 from pyquibbler.quib.func_calling.func_calls.known_graphics.widgets.textbox_call import TextBoxQuibFuncCall
 
 
 def create_graphics_overrides():
     return [
-        plot_override(
+        line_plot_override(
             'plot', quib_function_call_cls=PlotQuibFuncCall),
 
+        axes_override('imshow', quib_function_call_cls=ImshowQuibFuncCall),
+
         *(plot_override(func_name) for func_name in (
             'scatter',
             'axvline',
@@ -81,7 +84,7 @@ def create_graphics_overrides():
             'hist',
             'hist2d',
             'hlines',
-            'imshow',
+            # 'imshow',  # implemented with ImshowQuibFuncCall
             'legend',
             # 'locator_params',
             'loglog',
@@ -260,7 +263,7 @@ def create_graphics_overrides():
             'hist',
             'hist2d',
             'hlines',
-            'imshow',
+            # 'imshow',  # implemented with ImshowQuibFuncCall
             # 'in_axes',
             # 'indicate_inset',
             # 'indicate_inset_zoom',
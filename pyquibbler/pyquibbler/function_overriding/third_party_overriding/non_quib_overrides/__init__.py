@@ -1,2 +1,3 @@
 from .axes_overrides import override_axes_methods
+from .artist_overrides import override_artists_contains
 from .widgets_override import switch_widgets_to_quib_supporting_widgets
@@ -0,0 +1,28 @@
+import functools
+from typing import Callable
+
+from pyquibbler.quib.graphics import artist_wrapper
+from pyquibbler.quib.graphics.event_handling.spatial_index import get_hits_using_pixel_grid_index
+
+from .axes_overrides import wrap_method
+
+
+def _get_wrapper_for_contains(func: Callable):
+
+    @functools.wraps(func)
+    def _wrapper(self, mouseevent):
+        # Artists of quibs with many points are hit-tested using a grid index of their pixel coordinates:
+        if artist_wrapper.get_creating_quib(self) is not None:
+            ind = get_hits_using_pixel_grid_index(self, mouseevent)
+            if ind is not None:
+                return len(ind) > 0, dict(ind=ind)
+        return func(self, mouseevent)
+
+    return _wrapper
+
+
+def override_artists_contains():
+    from matplotlib.lines import Line2D
+    from matplotlib.collections import PathCollection
+    for cls in (Line2D, PathCollection):
+        wrap_method(cls, 'contains', _get_wrapper_for_contains)
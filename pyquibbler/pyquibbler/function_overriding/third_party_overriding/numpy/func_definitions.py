@@ -1,6 +1,7 @@
 from pyquibbler.function_overriding.third_party_overriding.numpy.inverse_functions import InverseFunc
 from pyquibbler.path_translation.translators import \
     TranspositionalBackwardsPathTranslator, TranspositionalForwardsPathTranslator, \
+    IndexMappingBackwardsPathTranslator, IndexMappingForwardsPathTranslator, \
     AxisAccumulationBackwardsPathTranslator, AxisAccumulationForwardsPathTranslator, \
     AxisReductionBackwardsPathTranslator, AxisReductionForwardsPathTranslator, \
     AxisAllToAllBackwardsPathTranslator, AxisAllToAllForwardsPathTranslator, \
@@ -16,8 +17,12 @@ from pyquibbler.inversion.inverters.elementwise_single_arg_no_shape import Unary
 from pyquibbler.path_translation.translators.elementwise import \
     UnaryElementwiseNoShapeBackwardsPathTranslator
 from pyquibbler.type_translation.translators import ElementwiseTypeTranslator
+from pyquibbler.shape_translation.translators import ElementwiseShapeTranslator, AxisReductionShapeTranslator, \
+    AxisAccumulationShapeTranslator, ProxyShapeTranslator
 
 from pyquibbler.function_definitions.func_definition import create_or_reuse_func_definition, ElementWiseFuncDefinition
+from pyquibbler.quib.func_calling.func_calls.axis_accumulation_call import AxisAccumulationQuibFuncCall
+from pyquibbler.quib.func_calling.func_calls.axis_reduction_call import AxisReductionQuibFuncCall
 
 """
 Basic func definitions
@@ -37,8 +42,9 @@ FUNC_DEFINITION_FILE_LOADING = create_or_reuse_func_definition(
 FUNC_DEFINITION_TRANSPOSITIONAL_ONE_TO_ONE = create_or_reuse_func_definition(
     raw_data_source_arguments=[0],
     inverters=[TranspositionalOneToOneInverter],
-    backwards_path_translators=[TranspositionalBackwardsPathTranslator],
-    forwards_path_translators=[TranspositionalForwardsPathTranslator])
+    backwards_path_translators=[IndexMappingBackwardsPathTranslator, TranspositionalBackwardsPathTranslator],
+    forwards_path_translators=[IndexMappingForwardsPathTranslator, TranspositionalForwardsPathTranslator],
+    result_shape_translators=[ProxyShapeTranslator])
 
 FUNC_DEFINITION_TRANSPOSITIONAL_ONE_TO_MANY = create_or_reuse_func_definition(
     base_func_definition=FUNC_DEFINITION_TRANSPOSITIONAL_ONE_TO_ONE,
@@ -47,12 +53,16 @@ FUNC_DEFINITION_TRANSPOSITIONAL_ONE_TO_MANY = create_or_reuse_func_definition(
 FUNC_DEFINITION_ACCUMULATION = create_or_reuse_func_definition(
     raw_data_source_arguments=[0],
     backwards_path_translators=[AxisAccumulationBackwardsPathTranslator],
-    forwards_path_translators=[AxisAccumulationForwardsPathTranslator])
+    forwards_path_translators=[AxisAccumulationForwardsPathTranslator],
+    result_shape_translators=[AxisAccumulationShapeTranslator],
+    quib_function_call_cls=AxisAccumulationQuibFuncCall)
 
 FUNC_DEFINITION_REDUCTION = create_or_reuse_func_definition(
     raw_data_source_arguments=[0],
     backwards_path_translators=[AxisReductionBackwardsPathTranslator],
-    forwards_path_translators=[AxisReductionForwardsPathTranslator])
+    forwards_path_translators=[AxisReductionForwardsPathTranslator],
+    result_shape_translators=[AxisReductionShapeTranslator],
+    quib_function_call_cls=AxisReductionQuibFuncCall)
 
 FUNC_DEFINITION_AXIS_ALL_TO_ALL = create_or_reuse_func_definition(
     raw_data_source_arguments=[0],
@@ -62,7 +72,8 @@ FUNC_DEFINITION_AXIS_ALL_TO_ALL = create_or_reuse_func_definition(
 FUNC_DEFINITION_SHAPE_ONLY = create_or_reuse_func_definition(
     raw_data_source_arguments=[0],
     backwards_path_translators=[ShapeOnlyBackwardsPathTranslator],
-    forwards_path_translators=[ShapeOnlyForwardsPathTranslator])
+    forwards_path_translators=[ShapeOnlyForwardsPathTranslator],
+    result_shape_translators=[ProxyShapeTranslator])
 
 FUNC_DEFINITION_UNARY_ELEMENTWISE = create_or_reuse_func_definition(
     raw_data_source_arguments=[0],
@@ -70,6 +81,7 @@ FUNC_DEFINITION_UNARY_ELEMENTWISE = create_or_reuse_func_definition(
                                 UnaryElementwiseBackwardsPathTranslator],
     forwards_path_translators=[UnaryElementwiseForwardsPathTranslator],
     result_type_or_type_translators=[ElementwiseTypeTranslator],
+    result_shape_translators=[ElementwiseShapeTranslator],
     inverters=[UnaryElementwiseNoShapeInverter, UnaryElementwiseInverter],
     func_definition_cls=ElementWiseFuncDefinition)
 
@@ -78,6 +90,7 @@ FUNC_DEFINITION_BINARY_ELEMENTWISE = create_or_reuse_func_definition(
     backwards_path_translators=[BinaryElementwiseBackwardsPathTranslator],
     forwards_path_translators=[BinaryElementwiseForwardsPathTranslator],
     result_type_or_type_translators=[ElementwiseTypeTranslator],
+    result_shape_translators=[ElementwiseShapeTranslator],
     inverters=[BinaryElementwiseInverter],
     func_definition_cls=ElementWiseFuncDefinition)
 
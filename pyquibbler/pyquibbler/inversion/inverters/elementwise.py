@@ -2,17 +2,17 @@ import numpy as np
 
 from abc import ABC
 
-from typing import Any, Type
+from typing import Any, Type, Optional, Dict, List
 
 from pyquibbler.utilities.missing_value import missing
-from pyquibbler.path import deep_get, Path
+from pyquibbler.path import deep_get, Path, PathComponent
 from pyquibbler.function_definitions import SourceLocation
 
 from pyquibbler.quib.pretty_converters.operators import REVERSE_BINARY_FUNCS_TO_OPERATORS
 from pyquibbler.function_overriding.third_party_overriding.numpy.inverse_functions import InverseFunc
 
 from pyquibbler.path_translation import ForwardsPathTranslator, BackwardsPathTranslator
-from pyquibbler.path_translation.types import Source
+from pyquibbler.path_translation.types import Source, Inversal
 from pyquibbler.path_translation.translators.elementwise import \
     UnaryElementwiseBackwardsPathTranslator, UnaryElementwiseForwardsPathTranslator, \
     BinaryElementwiseBackwardsPathTranslator, BinaryElementwiseForwardsPathTranslator
@@ -62,11 +62,62 @@ class BaseBinaryElementWiseInverter(BaseUnaryElementWiseInverter, ABC):
         return argument_to_invert_to, other_argument
 
 
-class BinaryElementwiseInverter(NumpyInverter, BaseBinaryElementWiseInverter):
+class ElementwiseNumpyInverter(NumpyInverter, ABC):
+    """
+    Inversion of elementwise functions.
+
+    When the sources to invert to are arguments of the function in their own right (not nested within lists)
+    and have the shape of the result, the path in each source is the path in the result. We then skip the
+    translation of the path through index-code arrays of the arguments, and invert all the assigned elements
+    in one vectorized call of the inverse function.
+    Bulk assignments through a chain of elementwise quibs thereby take a few array operations per quib.
+    """
+
+    def _is_inverting_to_source_location(self, source_location: SourceLocation) -> bool:
+        return True
+
+    def _get_sources_to_paths_if_same_shape(self) -> Optional[Dict[Source, Path]]:
+        """
+        Returns the path in each source (identical to the path in the result),
+        or None if the sources cannot be inverted directly.
+        """
+        if not isinstance(self._previous_result, np.ndarray) or np.ndim(self._previous_result) == 0:
+            return None
+
+        backwards_translator = self._create_backwards_translator()
+        result_bool_mask, _, remaining_path = backwards_translator.get_result_bool_mask_and_split_path()
+        if len(remaining_path) > 0 or backwards_translator.is_getting_element_out_of_array() \
+                or not np.any(result_bool_mask):
+            return None
+
+        sources_to_paths = {}
+        for source, source_location in self._get_data_sources_to_locations().items():
+            if not self._is_inverting_to_source_location(source_location):
+                continue
+            if len(source_location.path) > 0 or not isinstance(source.value, np.ndarray) \
+                    or np.shape(source.value) != np.shape(self._previous_result):
+                return None
+            sources_to_paths[source] = [PathComponent(result_bool_mask)]
+        return sources_to_paths
+
+    def get_inversals(self) -> List[Inversal]:
+        sources_to_paths = self._get_sources_to_paths_if_same_shape()
+        if sources_to_paths is None:
+            return super().get_inversals()
+
+        sources_to_paths_in_result = {source: list(path) for source, path in sources_to_paths.items()}
+        return self._create_inversals_from_source_paths(sources_to_paths, sources_to_paths_in_result)
+
+
+class BinaryElementwiseInverter(ElementwiseNumpyInverter, BaseBinaryElementWiseInverter):
     BACKWARDS_TRANSLATOR_TYPE: Type[BackwardsPathTranslator] = BinaryElementwiseBackwardsPathTranslator
     FORWARDS_TRANSLATOR_TYPE: Type[ForwardsPathTranslator] = BinaryElementwiseForwardsPathTranslator
     IS_ONE_TO_MANY_FUNC: bool = True  # because of broadcasting
 
+    def _is_inverting_to_source_location(self, source_location: SourceLocation) -> bool:
+        argument_to_invert_to, _ = self.get_indices_of_argument_to_invert_to_and_of_other_argument()
+        return source_location.argument.index == argument_to_invert_to
+
     def _invert_value(self, source: Source, source_location: SourceLocation, path_in_source: Path,
                       result_value: Any, path_in_result: Path) -> Any:
 
@@ -92,7 +143,7 @@ class BinaryElementwiseInverter(NumpyInverter, BaseBinaryElementWiseInverter):
         return inverse_func.inv_func(result_value, other_argument_value)
 
 
-class UnaryElementwiseInverter(NumpyInverter, BaseUnaryElementWiseInverter):
+class UnaryElementwiseInverter(ElementwiseNumpyInverter, BaseUnaryElementWiseInverter):
     BACKWARDS_TRANSLATOR_TYPE: Type[BackwardsPathTranslator] = UnaryElementwiseBackwardsPathTranslator
     FORWARDS_TRANSLATOR_TYPE: Type[ForwardsPathTranslator] = UnaryElementwiseForwardsPathTranslator
     IS_ONE_TO_MANY_FUNC: bool = False
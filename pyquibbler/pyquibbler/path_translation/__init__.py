@@ -1,3 +1,3 @@
 from .base_translators import BackwardsPathTranslator, ForwardsPathTranslator
 from .source_func_call import SourceFuncCall
-from .types import Source, NoMetadataSource, Inversal
+from .types import Source, NoMetadataSource, MetadataSource, Inversal
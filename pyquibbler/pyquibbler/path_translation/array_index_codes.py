@@ -5,7 +5,10 @@ import numpy as np
 from numpy.typing import NDArray
 
 
+# The widest dtype of index-code arrays. The index codes of the focal source are of the narrowest dtype that can
+# hold its linear indices (see get_index_type_for_size):
 INDEX_TYPE = np.int64
+NARROW_INDEX_TYPES = (np.int16, np.int32, np.int64)
 
 
 class IndexCode(INDEX_TYPE, Enum):
@@ -28,5 +31,34 @@ IndexCodeArray = NDArray[Union[INDEX_TYPE, IndexCode]]
 MAXIMAL_NON_CHOSEN_ELEMENTS = IndexCode.LIST_NOT_CONTAINING_CHOSEN_ELEMENTS
 
 
+MINIMAL_INDEX_CODE = min(IndexCode)
+
+
+def get_index_type_for_size(size: int) -> type:
+    """
+    The narrowest signed int type that can hold the linear indices of an array of the given size, together with
+    the (negative) index codes.
+    """
+    for index_type in NARROW_INDEX_TYPES:
+        if size - MINIMAL_INDEX_CODE <= np.iinfo(index_type).max:
+            return index_type
+    return INDEX_TYPE
+
+
+def create_uniform_index_code_array(shape, index_code: IndexCode) -> IndexCodeArray:
+    """
+    An index-code array with all elements coded by the given index code.
+    Returns a read-only broadcast view of a single element, rather than allocating the whole array.
+    """
+    return np.broadcast_to(np.array(index_code, dtype=get_index_type_for_size(0)), shape)
+
+
+def _is_uniform_array(obj: NDArray) -> bool:
+    return isinstance(obj, np.ndarray) and obj.ndim > 0 and obj.size > 0 and not any(obj.strides)
+
+
 def is_focal_element(obj: NDArray):
+    if _is_uniform_array(obj):
+        # keep broadcast index-code arrays as broadcast bool masks
+        return np.broadcast_to(obj.flat[0] > MAXIMAL_NON_CHOSEN_ELEMENTS, obj.shape)
     return obj > MAXIMAL_NON_CHOSEN_ELEMENTS
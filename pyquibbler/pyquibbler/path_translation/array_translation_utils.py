@@ -7,12 +7,13 @@ from functools import wraps
 from typing import Any, Union, Tuple, Optional
 
 from pyquibbler.function_definitions import SourceLocation
-from pyquibbler.path import Path, deep_set, split_path_at_end_of_object, deep_get
+from pyquibbler.path import Path, deep_set, split_path_at_end_of_object
 from pyquibbler.function_definitions.func_call import FuncCall, FuncArgsKwargs
 from pyquibbler.utilities.general_utils import get_shared_shape, is_same_shapes
 from pyquibbler.assignment.utils import is_scalar_np
 
-from .array_index_codes import INDEX_TYPE, IndexCode, is_focal_element, IndexCodeArray
+from .array_index_codes import INDEX_TYPE, IndexCode, is_focal_element, IndexCodeArray, \
+    get_index_type_for_size, create_uniform_index_code_array
 from .exceptions import PyQuibblerRaggedArrayException
 from .source_func_call import SourceFuncCall
 from .types import Source
@@ -20,6 +21,100 @@ from .types import Source
 ALLOW_RAGGED_ARRAYS = True
 
 
+@dataclass
+class _SourceIndexCodesConversion:
+    """
+    The state of the conversion of an arg to an IndexCodeArray (see convert_an_arg_to_array_of_source_index_codes).
+    """
+    focal_source: Optional[Source] = None
+    path_in_source: Optional[Path] = None
+
+    # Output:
+    path_in_source_array: Optional[Path] = None
+    path_in_source_element: Optional[Path] = None
+    is_extracting_element_out_of_source_array: Optional[bool] = None
+
+
+def _convert_obj_to_index_array(conversion: _SourceIndexCodesConversion, obj: Any,
+                                _remaining_path_to_source: Path = None) -> \
+        Tuple[Union[IndexCode, IndexCodeArray], Optional[Path]]:
+    """
+    convert obj to index array. returns the index array and the remaining path to the source.
+    """
+
+    is_focal_source = obj is conversion.focal_source
+    if isinstance(obj, Source):
+        # the index codes of array sources depend only on their shape:
+        obj = obj.get_value_or_array_proxy()
+
+    if is_focal_source:
+        if is_scalar_np(obj):
+            conversion.path_in_source_array, conversion.path_in_source_element = [], conversion.path_in_source
+            conversion.is_extracting_element_out_of_source_array = True
+            return IndexCode.FOCAL_SOURCE_SCALAR, _remaining_path_to_source
+
+        index_type = get_index_type_for_size(np.size(obj))
+        if conversion.path_in_source is None:
+            chosen_index_array = np.arange(np.size(obj), dtype=index_type).reshape(np.shape(obj))
+        else:
+            # we mark the chosen elements on a bool mask, sparing a full array of all the indices:
+            chosen_mask = np.zeros(np.shape(obj), dtype=bool)
+            conversion.path_in_source_array, conversion.path_in_source_element, referenced_part_of_source_array = \
+                split_path_at_end_of_object(chosen_mask, conversion.path_in_source)
+            conversion.is_extracting_element_out_of_source_array = is_scalar_np(referenced_part_of_source_array)
+            deep_set(chosen_mask, conversion.path_in_source_array, True, should_copy_objects_referenced=False)
+            chosen_index_array = np.full(np.shape(obj), IndexCode.NON_CHOSEN_ELEMENT, dtype=index_type)
+            chosen_index_array[chosen_mask] = np.flatnonzero(chosen_mask)
+        return chosen_index_array, _remaining_path_to_source
+        # index_coded_source_value = de_array_by_template(chosen_index_array, obj)
+        # return index_coded_source_value, _remaining_path_to_source
+
+    if is_scalar_np(obj):
+        if _remaining_path_to_source is None:
+            return IndexCode.SCALAR_NOT_CONTAINING_FOCAL_SOURCE, _remaining_path_to_source
+        conversion.path_in_source_array = []
+        conversion.path_in_source_element = conversion.path_in_source
+        return IndexCode.SCALAR_CONTAINING_FOCAL_SOURCE, _remaining_path_to_source
+
+    if isinstance(obj, np.ndarray):
+        return create_uniform_index_code_array(np.shape(obj), IndexCode.OTHERS_ELEMENT), _remaining_path_to_source
+
+    if len(obj) == 0:
+        return np.array(obj, dtype=INDEX_TYPE), _remaining_path_to_source
+
+    source_index = None if _remaining_path_to_source is None else _remaining_path_to_source[0].component
+    converted_sub_args = [None if source_index == sub_arg_index else
+                          _convert_obj_to_index_array(conversion, sub_arg)[0]
+                          for sub_arg_index, sub_arg in enumerate(obj)]
+    if _remaining_path_to_source is not None:
+        converted_sub_args[source_index], _remaining_path_to_source = \
+            _convert_obj_to_index_array(conversion, obj[source_index], _remaining_path_to_source[1:])
+
+    if not is_same_shapes(converted_sub_args):
+        # If the arrays are not same shape, their size will be squashed by numpy, yielding an object array
+        # containing the squashed arrays.  We simulate that by an array with elements coded as
+        # IndexCode.LIST_CONTAINING_CHOSEN_ELEMENTS, or IndexCode.LIST_NOT_CONTAINING_CHOSEN_ELEMENTS
+        if not ALLOW_RAGGED_ARRAYS:
+            raise PyQuibblerRaggedArrayException()
+
+        shared_shape = get_shared_shape(converted_sub_args)
+
+        for sub_arg_index, converted_sub_arg in enumerate(converted_sub_args):
+            if np.shape(converted_sub_arg) != shared_shape:
+                if np.any(is_focal_element(converted_sub_arg)):
+                    collapsed_sub_arg = create_uniform_index_code_array(
+                        shared_shape, IndexCode.LIST_CONTAINING_CHOSEN_ELEMENTS)
+                    if conversion.path_in_source is not None:
+                        conversion.path_in_source_array, conversion.path_in_source_element, _ = \
+                            split_path_at_end_of_object(collapsed_sub_arg, conversion.path_in_source)
+                else:
+                    collapsed_sub_arg = create_uniform_index_code_array(
+                        shared_shape, IndexCode.LIST_NOT_CONTAINING_CHOSEN_ELEMENTS)
+                converted_sub_args[sub_arg_index] = collapsed_sub_arg
+
+    return np.array(converted_sub_args), _remaining_path_to_source
+
+
 def convert_an_arg_to_array_of_source_index_codes(arg: Any,
                                                   focal_source: Optional[Source] = None,
                                                   path_to_source: Optional[Path] = None,
@@ -27,8 +122,10 @@ def convert_an_arg_to_array_of_source_index_codes(arg: Any,
                                                   ) \
         -> Tuple[IndexCodeArray, Optional[Path], Optional[Path], Optional[Path], Optional[bool]]:
     """
-    Convert a given arg to an IndexCodeArray, which is an array of INDEX_TYPE with values either matching
+    Convert a given arg to an IndexCodeArray, which is an array of signed ints with values either matching
     the linear indexing of focal_source, or specifying other elements according to IndexCode.
+    The index codes of the focal source are of the narrowest int type that can hold its linear indices, and arrays
+    not containing the focal source are represented by read-only broadcast views of a single index code.
 
     Parameters
     ----------
@@ -64,87 +161,11 @@ def convert_an_arg_to_array_of_source_index_codes(arg: Any,
         within an element of the source array.
     """
 
-    path_in_source_array: Optional[Path] = None
-    path_in_source_element: Optional[Path] = None
-    is_extracting_element_out_of_source_array: Optional[bool] = None
-
-    def _convert_obj_to_index_array(obj: Any, _remaining_path_to_source: Path = None) -> \
-            Tuple[Union[IndexCode, IndexCodeArray], Optional[Path]]:
-        """
-        convert obj to index array. returns the index array and the remaining path to the source.
-        """
-        nonlocal path_in_source_array, path_in_source_element, is_extracting_element_out_of_source_array
-
-        is_focal_source = obj is focal_source
-        if isinstance(obj, Source):
-            obj = obj.value
-
-        if is_focal_source:
-            if is_scalar_np(obj):
-                path_in_source_array, path_in_source_element = [], path_in_source
-                is_extracting_element_out_of_source_array = True
-                return IndexCode.FOCAL_SOURCE_SCALAR, _remaining_path_to_source
-
-            full_index_array = np.arange(np.size(obj), dtype=INDEX_TYPE).reshape(np.shape(obj))
-            if path_in_source is None:
-                chosen_index_array = full_index_array
-            else:
-                path_in_source_array, path_in_source_element, referenced_part_of_source_array = \
-                    split_path_at_end_of_object(full_index_array, path_in_source)
-                is_extracting_element_out_of_source_array = is_scalar_np(referenced_part_of_source_array)
-                chosen_index_array = np.full(np.shape(obj), IndexCode.NON_CHOSEN_ELEMENT)
-                deep_set(chosen_index_array, path_in_source_array, deep_get(full_index_array, path_in_source_array),
-                         should_copy_objects_referenced=False)
-            return chosen_index_array, _remaining_path_to_source
-            # index_coded_source_value = de_array_by_template(chosen_index_array, obj)
-            # return index_coded_source_value, _remaining_path_to_source
+    conversion = _SourceIndexCodesConversion(focal_source, path_in_source)
+    arg_index_array, remaining_path_to_source = _convert_obj_to_index_array(conversion, arg, path_to_source)
 
-        if is_scalar_np(obj):
-            if _remaining_path_to_source is None:
-                return IndexCode.SCALAR_NOT_CONTAINING_FOCAL_SOURCE, _remaining_path_to_source
-            path_in_source_array = []
-            path_in_source_element = path_in_source
-            return IndexCode.SCALAR_CONTAINING_FOCAL_SOURCE, _remaining_path_to_source
-
-        if isinstance(obj, np.ndarray):
-            return np.full(np.shape(obj), IndexCode.OTHERS_ELEMENT), _remaining_path_to_source
-
-        if len(obj) == 0:
-            return np.array(obj, dtype=INDEX_TYPE), _remaining_path_to_source
-
-        source_index = None if _remaining_path_to_source is None else _remaining_path_to_source[0].component
-        converted_sub_args = [None if source_index == sub_arg_index else
-                              _convert_obj_to_index_array(sub_arg)[0] for sub_arg_index, sub_arg in enumerate(obj)]
-        if _remaining_path_to_source is not None:
-            converted_sub_args[source_index], _remaining_path_to_source = \
-                _convert_obj_to_index_array(obj[source_index], _remaining_path_to_source[1:])
-
-        if not is_same_shapes(converted_sub_args):
-            # If the arrays are not same shape, their size will be squashed by numpy, yielding an object array
-            # containing the squashed arrays.  We simulate that by an array with elements coded as
-            # IndexCode.LIST_CONTAINING_CHOSEN_ELEMENTS, or IndexCode.LIST_NOT_CONTAINING_CHOSEN_ELEMENTS
-            if not ALLOW_RAGGED_ARRAYS:
-                raise PyQuibblerRaggedArrayException()
-
-            shared_shape = get_shared_shape(converted_sub_args)
-
-            for sub_arg_index, converted_sub_arg in enumerate(converted_sub_args):
-                if np.shape(converted_sub_arg) != shared_shape:
-                    if np.any(is_focal_element(converted_sub_arg)):
-                        collapsed_sub_arg = np.full(shared_shape, IndexCode.LIST_CONTAINING_CHOSEN_ELEMENTS)
-                        if path_in_source is not None:
-                            path_in_source_array, path_in_source_element, _ = \
-                                split_path_at_end_of_object(collapsed_sub_arg, path_in_source)
-                    else:
-                        collapsed_sub_arg = np.full(shared_shape, IndexCode.LIST_NOT_CONTAINING_CHOSEN_ELEMENTS)
-                    converted_sub_args[sub_arg_index] = collapsed_sub_arg
-
-        return np.array(converted_sub_args), _remaining_path_to_source
-
-    arg_index_array, remaining_path_to_source = _convert_obj_to_index_array(arg, path_to_source)
-
-    return arg_index_array, remaining_path_to_source, path_in_source_array, path_in_source_element, \
-        is_extracting_element_out_of_source_array
+    return arg_index_array, remaining_path_to_source, conversion.path_in_source_array, \
+        conversion.path_in_source_element, conversion.is_extracting_element_out_of_source_array
 
 
 def convert_args_before_run(func):
@@ -73,4 +73,4 @@ class ForwardsPathTranslator(ConditionalRunner):
         return self._forward_translate()
 
     def _get_source_type(self):
-        return type(self._source.value)
+        return self._source.type_
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from .types import Source, NoMetadataSource
+import numpy as np
+
+from pyquibbler.path import Paths, SpecialComponent, FailedToDeepAssignException
+from pyquibbler.utilities.general_utils import Shape
+
+from .types import Source, NoMetadataSource, MetadataSource
 from .source_func_call import SourceFuncCall
 
 from typing import TYPE_CHECKING, Optional, Tuple, Dict
@@ -10,6 +15,47 @@ if TYPE_CHECKING:
     from pyquibbler.quib.quib import Quib
 
 
+def _raise_if_override_paths_do_not_match_shape(paths: Paths, shape: Shape):
+    """
+    Check the indices of the assignments into an array, without applying the assignments to its value.
+    Assignments into fields of a field array are not checked (the proxy has no fields).
+    """
+    proxy = np.broadcast_to(np.zeros((), dtype=bool), shape)
+    for path in paths:
+        component = path[0]
+        if component.is_attr or isinstance(component.component, SpecialComponent) \
+                or isinstance(component.component, str) \
+                or isinstance(component.component, list) and len(component.component) > 0 \
+                and isinstance(component.component[0], str):
+            continue
+        try:
+            proxy[component.component]
+        except (IndexError, TypeError) as e:
+            raise FailedToDeepAssignException(path=path, exception=e)
+
+
+def create_metadata_source(quib: Quib) -> Source:
+    """
+    Create a source carrying the shape, type and dtype of the value of a quib whose function was already called,
+    deferring the retrieval of the value itself until (and unless) a translator accesses it.
+    """
+    handler = quib.handler
+    quib_function_call = handler.quib_function_call
+    type_ = quib_function_call.get_type()
+    shape = quib_function_call.get_shape()
+    if handler.is_overridden:
+        paths = handler.overrider.get_paths()
+        if not issubclass(type_, np.ndarray) or any(len(path) == 0 for path in paths):
+            # assignments to the whole value, or to elements of non-arrays, can change the shape and type
+            return Source(quib.get_value_valid_at_path(None))
+        _raise_if_override_paths_do_not_match_shape(paths, shape)
+
+    return MetadataSource(get_value=lambda: quib.get_value_valid_at_path(None),
+                          type_=type_,
+                          shape=shape,
+                          dtype=quib_function_call.result_dtype)
+
+
 def get_func_call_for_translation(func_call: QuibFuncCall, with_meta_data: Optional[bool] = None
                                   ) -> Tuple[SourceFuncCall, Dict[Source, Quib]]:
     """
@@ -22,16 +68,17 @@ def get_func_call_for_translation(func_call: QuibFuncCall, with_meta_data: Optio
         All data sources will be NoMetadataSource
 
     with_meta_data = None:
-        Use Source if metadata is available, otherwise use NoMetadataSource
+        Use MetadataSource if metadata is available, otherwise use NoMetadataSource
 
 
     """
     data_sources_to_quibs = {}
 
     def _transform_data_quib(quib: Quib):
-        if with_meta_data is True \
-                or with_meta_data is None and quib.handler.quib_function_call.result_shape is not None:
+        if with_meta_data is True:
             source = Source(quib.get_value_valid_at_path(None))
+        elif with_meta_data is None and quib.handler.quib_function_call.result_shape is not None:
+            source = create_metadata_source(quib)
         else:
             source = NoMetadataSource()
         data_sources_to_quibs[source] = quib
@@ -0,0 +1,377 @@
+import operator
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Callable, Tuple, Union
+
+import numpy as np
+from numpy.lib.array_utils import normalize_axis_tuple, normalize_axis_index
+from numpy.typing import NDArray
+
+from pyquibbler.function_definitions.func_call import FuncArgsKwargs
+from pyquibbler.path import Path, SpecialComponent
+from pyquibbler.utilities.general_utils import Shape, Args, Kwargs
+from pyquibbler.utilities.get_original_func import get_original_func
+
+
+# Indices of array elements, as an int array of shape (ndim, number of elements):
+Indices = NDArray[np.intp]
+
+
+def _is_integer_index(index) -> bool:
+    return isinstance(index, (int, np.integer)) and not isinstance(index, (bool, np.bool_))
+
+
+def get_indices_of_true_elements(mask: NDArray[bool]) -> Indices:
+    if mask.ndim == 0:
+        return np.zeros((0, int(mask)), dtype=np.intp)
+    return np.array(np.nonzero(mask), dtype=np.intp).reshape((mask.ndim, -1))
+
+
+def get_indices_of_referenced_elements(shape: Shape, path_in_array: Path) -> Optional[Indices]:
+    """
+    Return the indices of the array elements referenced by the path, if it references them by basic indexing
+    (like [PathComponent((2, slice(1, 8, 3)))]), without creating a mask of the array. Returns None otherwise.
+    """
+    if len(path_in_array) != 1:
+        return None
+    component = path_in_array[0].component
+    if component is SpecialComponent.ALL:
+        component = ()
+    try:
+        mapping = _get_basic_indexing_mapping(tuple(shape), component)
+    except (ValueError, IndexError):
+        # out of bounds indices
+        return None
+    if mapping is None:
+        return None
+    result_shape = mapping.result_shape
+    if len(result_shape) == 0:
+        return mapping.backwards(np.zeros((0, 1), dtype=np.intp))
+    return mapping.backwards(np.indices(result_shape, dtype=np.intp).reshape((len(result_shape), -1)))
+
+
+def create_bool_mask_with_true_at_index_array(shape: Shape, indices: Indices) -> NDArray[bool]:
+    mask = np.zeros(shape, dtype=bool)
+    mask[tuple(indices)] = True
+    return mask
+
+
+class IndexMapping(ABC):
+    """
+    The mapping between the indices of elements in the result of a transpositional function and the indices of
+    the elements of its data argument that they are copied from.
+    Unlike index-code arrays, mapping the indices of a few elements does not require arrays the size of the data.
+    """
+
+    def __init__(self, source_shape: Shape):
+        self.source_shape = source_shape
+
+    @property
+    @abstractmethod
+    def result_shape(self) -> Shape:
+        pass
+
+    @abstractmethod
+    def backwards(self, result_indices: Indices) -> Indices:
+        """
+        Return the indices of the source elements that the given result elements are copied from.
+        """
+        pass
+
+    @abstractmethod
+    def forwards(self, source_indices: Indices) -> Indices:
+        """
+        Return the indices of the result elements that the given source elements are copied to.
+        """
+        pass
+
+
+class AxesPermutationIndexMapping(IndexMapping):
+    """
+    Axis i of the result is axis axes[i] of the source (like np.transpose).
+    """
+
+    def __init__(self, source_shape: Shape, axes: Tuple[int, ...]):
+        super().__init__(source_shape)
+        self.axes = axes
+
+    @property
+    def result_shape(self) -> Shape:
+        return tuple(self.source_shape[axis] for axis in self.axes)
+
+    def backwards(self, result_indices: Indices) -> Indices:
+        source_indices = np.empty_like(result_indices)
+        source_indices[list(self.axes)] = result_indices
+        return source_indices
+
+    def forwards(self, source_indices: Indices) -> Indices:
+        return source_indices[list(self.axes)]
+
+
+class FlipIndexMapping(IndexMapping):
+    """
+    The source, with the order of the elements along the given axes reversed (like np.flip).
+    """
+
+    def __init__(self, source_shape: Shape, axes: Tuple[int, ...]):
+        super().__init__(source_shape)
+        self.axes = axes
+
+    @property
+    def result_shape(self) -> Shape:
+        return self.source_shape
+
+    def _flip(self, indices: Indices) -> Indices:
+        indices = indices.copy()
+        for axis in self.axes:
+            indices[axis] = self.source_shape[axis] - 1 - indices[axis]
+        return indices
+
+    def backwards(self, result_indices: Indices) -> Indices:
+        return self._flip(result_indices)
+
+    def forwards(self, source_indices: Indices) -> Indices:
+        return self._flip(source_indices)
+
+
+class ReshapeIndexMapping(IndexMapping):
+    """
+    The elements of the source, in the given order, placed in an array of a different shape (like np.reshape).
+    """
+
+    def __init__(self, source_shape: Shape, result_shape: Shape, order: str):
+        super().__init__(source_shape)
+        self._result_shape = result_shape
+        self.order = order
+
+    @property
+    def result_shape(self) -> Shape:
+        return self._result_shape
+
+    def _convert_indices(self, indices: Indices, from_shape: Shape, to_shape: Shape) -> Indices:
+        if len(from_shape) == 0:
+            linear_indices = np.zeros(indices.shape[1], dtype=np.intp)
+        else:
+            linear_indices = np.ravel_multi_index(tuple(indices), from_shape, order=self.order)
+        if len(to_shape) == 0:
+            return np.zeros((0, indices.shape[1]), dtype=np.intp)
+        return np.array(np.unravel_index(linear_indices, to_shape, order=self.order), dtype=np.intp) \
+            .reshape((len(to_shape), -1))
+
+    def backwards(self, result_indices: Indices) -> Indices:
+        return self._convert_indices(result_indices, self.result_shape, self.source_shape)
+
+    def forwards(self, source_indices: Indices) -> Indices:
+        return self._convert_indices(source_indices, self.source_shape, self.result_shape)
+
+
+class BasicIndexingIndexMapping(IndexMapping):
+    """
+    Basic indexing of the source with ints, slices, np.newaxis and Ellipsis (like a[2, 1:10:3, None]).
+    """
+
+    def __init__(self, source_shape: Shape, item: tuple):
+        super().__init__(source_shape)
+        # for each source axis: an int, or the (start, step, length) of a slice.
+        # for each result axis: the source axis it slices, or None for a new axis.
+        self.source_axes_indexing: List[Union[int, Tuple[int, int, int]]] = []
+        self.result_axes_to_source_axes: List[Optional[int]] = []
+        for component in item:
+            if component is None:
+                self.result_axes_to_source_axes.append(None)
+                continue
+            source_axis = len(self.source_axes_indexing)
+            size = source_shape[source_axis]
+            if isinstance(component, slice):
+                start, stop, step = component.indices(size)
+                self.source_axes_indexing.append((start, step, len(range(start, stop, step))))
+                self.result_axes_to_source_axes.append(source_axis)
+            else:
+                self.source_axes_indexing.append(normalize_axis_index(component, size))
+
+    @property
+    def result_shape(self) -> Shape:
+        return tuple(1 if source_axis is None else self.source_axes_indexing[source_axis][2]
+                     for source_axis in self.result_axes_to_source_axes)
+
+    def backwards(self, result_indices: Indices) -> Indices:
+        source_indices = np.empty((len(self.source_shape), result_indices.shape[1]), dtype=np.intp)
+        for source_axis, indexing in enumerate(self.source_axes_indexing):
+            if not isinstance(indexing, tuple):
+                source_indices[source_axis] = indexing
+        for result_axis, source_axis in enumerate(self.result_axes_to_source_axes):
+            if source_axis is not None:
+                start, step, _ = self.source_axes_indexing[source_axis]
+                source_indices[source_axis] = start + step * result_indices[result_axis]
+        return source_indices
+
+    def forwards(self, source_indices: Indices) -> Indices:
+        is_indexed = np.ones(source_indices.shape[1], dtype=bool)
+        positions_in_slices = {}
+        for source_axis, indexing in enumerate(self.source_axes_indexing):
+            if isinstance(indexing, tuple):
+                start, step, length = indexing
+                position, remainder = np.divmod(source_indices[source_axis] - start, step)
+                is_indexed &= (remainder == 0) & (position >= 0) & (position < length)
+                positions_in_slices[source_axis] = position
+            else:
+                is_indexed &= source_indices[source_axis] == indexing
+        result_indices = np.zeros((len(self.result_axes_to_source_axes), np.sum(is_indexed)), dtype=np.intp)
+        for result_axis, source_axis in enumerate(self.result_axes_to_source_axes):
+            if source_axis is not None:
+                result_indices[result_axis] = positions_in_slices[source_axis][is_indexed]
+        return result_indices
+
+
+class ComposedIndexMapping(IndexMapping):
+    """
+    Index mappings applied one after the other.
+    """
+
+    def __init__(self, source_shape: Shape, mappings: List[IndexMapping]):
+        super().__init__(source_shape)
+        self.mappings = mappings
+
+    @property
+    def result_shape(self) -> Shape:
+        return self.mappings[-1].result_shape if self.mappings else self.source_shape
+
+    def backwards(self, result_indices: Indices) -> Indices:
+        for mapping in reversed(self.mappings):
+            result_indices = mapping.backwards(result_indices)
+        return result_indices
+
+    def forwards(self, source_indices: Indices) -> Indices:
+        for mapping in self.mappings:
+            source_indices = mapping.forwards(source_indices)
+        return source_indices
+
+
+"""
+Creating index mappings from func calls
+"""
+
+
+def _get_moveaxis_axes(ndim: int, source, destination) -> Tuple[int, ...]:
+    # as in np.moveaxis:
+    source = normalize_axis_tuple(source, ndim)
+    destination = normalize_axis_tuple(destination, ndim)
+    axes = [axis for axis in range(ndim) if axis not in source]
+    for destination_axis, source_axis in sorted(zip(destination, source)):
+        axes.insert(destination_axis, source_axis)
+    return tuple(axes)
+
+
+def _get_swapaxes_axes(ndim: int, axis1: int, axis2: int) -> Tuple[int, ...]:
+    axes = list(range(ndim))
+    axis1, axis2 = normalize_axis_index(axis1, ndim), normalize_axis_index(axis2, ndim)
+    axes[axis1], axes[axis2] = axes[axis2], axes[axis1]
+    return tuple(axes)
+
+
+def _get_rot90_mapping(source_shape: Shape, k: int = 1, axes=(0, 1)) -> IndexMapping:
+    # as in np.rot90:
+    ndim = len(source_shape)
+    axes = normalize_axis_tuple(axes, ndim)
+    k %= 4
+    if k == 0:
+        return ComposedIndexMapping(source_shape, [])
+    if k == 2:
+        return FlipIndexMapping(source_shape, axes)
+    permutation = AxesPermutationIndexMapping(source_shape, _get_swapaxes_axes(ndim, *axes))
+    if k == 1:
+        return ComposedIndexMapping(source_shape, [
+            FlipIndexMapping(source_shape, (axes[1], )),
+            permutation,
+        ])
+    return ComposedIndexMapping(source_shape, [
+        permutation,
+        FlipIndexMapping(permutation.result_shape, (axes[1], )),
+    ])
+
+
+def _get_basic_indexing_mapping(source_shape: Shape, item) -> Optional[IndexMapping]:
+    item = item if isinstance(item, tuple) else (item, )
+    if not all(component is None or component is Ellipsis or isinstance(component, slice)
+               or _is_integer_index(component) for component in item):
+        # advanced indexing, or field access
+        return None
+    if any(isinstance(component, slice) and any(isinstance(bound, np.ndarray) for bound in
+                                                (component.start, component.stop, component.step))
+           for component in item):
+        return None
+    num_indexed_axes = sum(component is not None and component is not Ellipsis for component in item)
+    num_ellipsis = sum(component is Ellipsis for component in item)
+    if num_indexed_axes > len(source_shape) or num_ellipsis > 1:
+        return None
+    if num_ellipsis == 0:
+        item = item + (Ellipsis, )
+    ellipsis_index = next(index for index, component in enumerate(item) if component is Ellipsis)
+    item = item[:ellipsis_index] + (slice(None), ) * (len(source_shape) - num_indexed_axes) + item[ellipsis_index + 1:]
+    return BasicIndexingIndexMapping(source_shape, item)
+
+
+def _get_reshape_mapping(source_shape: Shape, result_shape: Shape, order: str = 'C') -> Optional[IndexMapping]:
+    if order not in ('C', 'F'):
+        return None
+    return ReshapeIndexMapping(source_shape, result_shape, order)
+
+
+# For each function: a function getting the source shape, the result shape and the args (by name, without the
+# data argument), and returning the index mapping (or None, if the call is not supported)
+FUNCS_TO_INDEX_MAPPING_CREATORS: Dict[Callable, Callable[..., Optional[IndexMapping]]] = {
+    **{get_original_func(func): creator for func, creator in (
+        (np.transpose,
+         lambda source_shape, result_shape, axes=None:
+         AxesPermutationIndexMapping(source_shape, tuple(range(len(source_shape)))[::-1] if axes is None
+                                     else normalize_axis_tuple(axes, len(source_shape), allow_duplicate=False))),
+        (np.swapaxes,
+         lambda source_shape, result_shape, axis1, axis2:
+         AxesPermutationIndexMapping(source_shape, _get_swapaxes_axes(len(source_shape), axis1, axis2))),
+        (np.moveaxis,
+         lambda source_shape, result_shape, source, destination:
+         AxesPermutationIndexMapping(source_shape, _get_moveaxis_axes(len(source_shape), source, destination))),
+        (np.flip,
+         lambda source_shape, result_shape, axis=None:
+         FlipIndexMapping(source_shape, tuple(range(len(source_shape))) if axis is None
+                          else normalize_axis_tuple(axis, len(source_shape)))),
+        (np.fliplr,
+         lambda source_shape, result_shape: FlipIndexMapping(source_shape, (1, ))),
+        (np.flipud,
+         lambda source_shape, result_shape: FlipIndexMapping(source_shape, (0, ))),
+        (np.rot90,
+         lambda source_shape, result_shape, k=1, axes=(0, 1): _get_rot90_mapping(source_shape, k, axes)),
+        (np.reshape,
+         lambda source_shape, result_shape, shape=None, order='C', newshape=None, copy=None:
+         _get_reshape_mapping(source_shape, result_shape, order)),
+        (np.ravel,
+         lambda source_shape, result_shape, order='C': _get_reshape_mapping(source_shape, result_shape, order)),
+        (np.squeeze,
+         lambda source_shape, result_shape, axis=None: _get_reshape_mapping(source_shape, result_shape)),
+        (np.expand_dims,
+         lambda source_shape, result_shape, axis: _get_reshape_mapping(source_shape, result_shape)),
+    )},
+    operator.getitem:
+        lambda source_shape, result_shape, b: _get_basic_indexing_mapping(source_shape, b),
+}
+
+
+def create_index_mapping(func: Callable, args: Args, kwargs: Kwargs,
+                         source_shape: Shape, result_shape: Shape) -> Optional[IndexMapping]:
+    """
+    Create the index mapping of a call of a transpositional function, whose data argument is the first argument.
+    Returns None if the function, or its specific call, is not supported.
+    """
+    creator = FUNCS_TO_INDEX_MAPPING_CREATORS.get(func)
+    if creator is None or len(source_shape) == 0 or len(args) == 0:
+        return None
+    arg_values_by_name = dict(FuncArgsKwargs(func, args, kwargs).get_arg_values_by_keyword(include_defaults=False))
+    if len(arg_values_by_name) == 0:
+        return None
+    arg_values_by_name.pop(next(iter(arg_values_by_name)))
+    try:
+        mapping = creator(source_shape, result_shape, **arg_values_by_name)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if mapping is None or mapping.result_shape != tuple(result_shape):
+        return None
+    return mapping
@@ -1,4 +1,5 @@
 from .transpositional import TranspositionalForwardsPathTranslator, TranspositionalBackwardsPathTranslator
+from .index_mapping import IndexMappingBackwardsPathTranslator, IndexMappingForwardsPathTranslator
 from .getitem import GetItemBackwardsPathTranslator, GetItemForwardsPathTranslator
 from .axis_reduction import AxisReductionForwardsPathTranslator, AxisReductionBackwardsPathTranslator
 from .axis_accumulation import \
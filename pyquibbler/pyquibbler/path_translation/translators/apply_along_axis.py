@@ -32,7 +32,7 @@ class ApplyAlongAxisForwardsPathTranslator(NumpyForwardsPathTranslator):
         boolean_mask = data_argument_to_mask_converter.get_masked_data_arguments()[0]
         args_dict = self._get_translation_related_arg_dict()
         axis = args_dict.pop('axis')
-        dims_to_expand = self._get_expanded_dims(axis, np.shape(self._source.value))
+        dims_to_expand = self._get_expanded_dims(axis, self._source.shape)
         applied = np.any(boolean_mask, axis)
         expanded = np.expand_dims(applied, dims_to_expand)
         broadcast = np.broadcast_to(expanded, self._shape)
@@ -1,11 +1,12 @@
 from abc import ABC
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
 
 import numbers
 import numpy as np
 from numpy.typing import NDArray
 
-from pyquibbler.path import Path
+from pyquibbler.path import Path, Paths, PathComponent, split_path_at_end_of_object, deep_set
+from pyquibbler.assignment.utils import is_scalar_np
 from pyquibbler.utilities.general_utils import unbroadcast_or_broadcast_bool_mask
 from pyquibbler.utilities.multiple_instance_runner import ConditionalRunner
 
@@ -86,7 +87,37 @@ class BinaryElementwiseBackwardsPathTranslator(ElementwisePathTranslator, NumpyB
 
 # FORWARD:
 
-class UnaryElementwiseForwardsPathTranslator(ElementwisePathTranslator, NumpyForwardsPathTranslator):
+class ElementwiseForwardsPathTranslator(ElementwisePathTranslator, NumpyForwardsPathTranslator, ABC):
+    """
+    If the source is an argument in its own right (not nested within a list) and has the shape of the result,
+    the result is affected exactly at the path in the source. We then translate directly, without converting
+    the arguments to index-code arrays.
+    """
+
+    def _get_path_in_result_if_same_shape(self) -> Optional[Paths]:
+        if len(self._source_location.path) > 0 or self._shape is None \
+                or not issubclass(self._source.type_, np.ndarray) or self._source.shape != self._shape:
+            return None
+
+        result_mask = np.zeros(self._shape, dtype=bool)
+        path_in_array, remaining_path, referenced_part_of_array = \
+            split_path_at_end_of_object(result_mask, self._path)
+        if len(remaining_path) > 0 or is_scalar_np(referenced_part_of_array):
+            return None
+
+        deep_set(result_mask, path_in_array, True, should_copy_objects_referenced=False)
+        if not np.any(result_mask):
+            return []
+        return [[PathComponent(result_mask)]]
+
+    def _forward_translate(self) -> Paths:
+        paths = self._get_path_in_result_if_same_shape()
+        if paths is None:
+            return super()._forward_translate()
+        return paths
+
+
+class UnaryElementwiseForwardsPathTranslator(ElementwiseForwardsPathTranslator):
     ADD_OUT_OF_ARRAY_COMPONENT = True
 
     def forward_translate_masked_data_arguments_to_result_mask(self,
@@ -99,7 +130,7 @@ class UnaryElementwiseForwardsPathTranslator(ElementwisePathTranslator, NumpyFor
         return masked_data_arguments[0]
 
 
-class BinaryElementwiseForwardsPathTranslator(ElementwisePathTranslator, NumpyForwardsPathTranslator):
+class BinaryElementwiseForwardsPathTranslator(ElementwiseForwardsPathTranslator):
     ADD_OUT_OF_ARRAY_COMPONENT = True
 
     def forward_translate_masked_data_arguments_to_result_mask(self,
@@ -36,6 +36,8 @@ class BaseGetItemTranslator(ConditionalRunner):
         return PathComponent(self._getitem_component)
 
     def _get_type_of_referenced_value(self) -> Type:
+        if isinstance(self._referenced_object, Source):
+            return self._referenced_object.type_
         return type(self._referenced_value)
 
     def _getitem_of_a_field_in_array(self) -> bool:
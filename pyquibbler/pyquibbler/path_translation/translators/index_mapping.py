@@ -0,0 +1,140 @@
+from typing import Optional, Tuple, Any
+
+import numpy as np
+
+from pyquibbler.function_definitions import SourceLocation
+from pyquibbler.function_definitions.types import PositionalArgument
+from pyquibbler.path import Path, Paths, PathComponent, SpecialComponent, split_path_at_end_of_object, deep_set
+from pyquibbler.utilities.numpy_original_functions import np_zeros, np_full
+from pyquibbler.assignment.utils import is_scalar_np
+from pyquibbler.utilities.general_utils import Shape
+
+from ..index_mapping import IndexMapping, Indices, FUNCS_TO_INDEX_MAPPING_CREATORS, create_index_mapping, \
+    get_indices_of_referenced_elements, get_indices_of_true_elements, create_bool_mask_with_true_at_index_array
+from ..types import Source, NoMetadataSource
+from .numpy import calculate_result_bool_mask_before_run
+from .transpositional import TranspositionalBackwardsPathTranslator, TranspositionalForwardsPathTranslator
+
+
+class IndexMappingPathTranslator:
+    """
+    Translates paths of transpositional functions whose data argument is an array, by mapping the indices of the
+    referenced elements (using an IndexMapping), rather than by applying the function to arrays of index codes of
+    the size of the data argument.
+    Supports basic indexing (ints, slices, np.newaxis, Ellipsis), axis permutations, flips and reshapes.
+    """
+
+    _index_mapping: Optional[IndexMapping] = None
+
+    @staticmethod
+    def _split_path_at_end_of_array(shape: Shape, path: Path) -> Tuple[Path, Path, Any]:
+        # we split the path on a broadcast view, sparing an array of the given shape:
+        return split_path_at_end_of_object(np.broadcast_to(np.False_, shape), path)
+
+    @staticmethod
+    def _get_indices_of_referenced_elements(shape: Shape, path_in_array: Path) -> Indices:
+        """
+        Return the indices of the elements referenced by the path in an array of the given shape.
+        A bool mask of the array is only created for paths that are not basic indexing, a bool mask of the array,
+        or an array of indices per axis.
+        """
+        component = path_in_array[0].component if len(path_in_array) == 1 else None
+        if isinstance(component, np.ndarray) and component.dtype == np.bool_ and component.shape == tuple(shape):
+            return get_indices_of_true_elements(component)
+        if isinstance(component, tuple) and len(component) == len(shape) \
+                and all(isinstance(indices, np.ndarray) and indices.dtype.kind in 'iu' and indices.ndim == 1
+                        and indices.shape == component[0].shape for indices in component):
+            return np.array(component, dtype=np.intp) % np.array(shape, dtype=np.intp)[:, np.newaxis]
+        indices = get_indices_of_referenced_elements(shape, path_in_array)
+        if indices is None:
+            mask = np_zeros(shape, dtype=bool)
+            deep_set(mask, path_in_array, True, should_copy_objects_referenced=False)
+            indices = get_indices_of_true_elements(mask)
+        return indices
+
+    def _is_array_source(self, source: Source, location: SourceLocation) -> bool:
+        if isinstance(source, NoMetadataSource) \
+                or location.argument != PositionalArgument(0) or len(location.path) > 0:
+            return False
+        return issubclass(source.type_, np.ndarray) and not issubclass(source.type_, np.matrix) \
+            and len(source.shape) > 0 and not source.dtype.hasobject and source.dtype.names is None
+
+    def _get_index_mapping(self, source: Source) -> Optional[IndexMapping]:
+        if self._index_mapping is None and self._shape is not None and len(self._shape) > 0 \
+                and self._func_call.func in FUNCS_TO_INDEX_MAPPING_CREATORS:
+            # the data argument itself is not needed, only its shape:
+            args, kwargs = self._func_call.transform_sources_in_args_kwargs(lambda s: s, lambda s: s.value)
+            self._index_mapping = create_index_mapping(self._func_call.func, args, kwargs,
+                                                       source.shape, tuple(self._shape))
+        return self._index_mapping
+
+
+class IndexMappingBackwardsPathTranslator(TranspositionalBackwardsPathTranslator, IndexMappingPathTranslator):
+    """
+    Backward translate basic indexing and transpositions (like a[2:8:2], np.transpose, np.reshape) by mapping the
+    indices of the referenced elements of the result to the indices of the source.
+    Other calls are translated by the TranspositionalBackwardsPathTranslator.
+    """
+
+    _result_indices: Optional[Indices] = None
+
+    def can_try(self) -> bool:
+        data_sources = self._func_call.get_data_sources()
+        if len(data_sources) != 1:
+            return False
+        source, location = data_sources[0], self._func_call.data_source_locations[0]
+        return self._is_array_source(source, location) and self._get_index_mapping(source) is not None
+
+    def _calculate_result_bool_mask_and_split_path(self):
+        # the bool mask of the result is only created if requested (see get_result_bool_mask_and_split_path)
+        self._path_in_array, self._remaining_path, referenced_part_of_result = \
+            self._split_path_at_end_of_array(self._shape, self._path)
+        self._result_indices = self._get_indices_of_referenced_elements(self._shape, self._path_in_array)
+        self._is_getting_element_out_of_array = is_scalar_np(referenced_part_of_result)
+
+    @calculate_result_bool_mask_before_run
+    def get_result_bool_mask_and_split_path(self):
+        if self._result_bool_mask is None:
+            self._result_bool_mask = create_bool_mask_with_true_at_index_array(self._shape, self._result_indices)
+        return self._result_bool_mask, self._path_in_array, self._remaining_path
+
+    def _get_source_path(self, source: Source, location: SourceLocation) -> Optional[Path]:
+        result_indices = self._result_indices
+        if result_indices.shape[1] == 0:
+            # Source not part of result
+            return None
+
+        source_indices = self._get_index_mapping(source).backwards(result_indices)
+        if source_indices.shape[1] == 1 and self._is_getting_element_out_of_array:
+            return [PathComponent(tuple(source_indices[:, 0]))]
+        return [PathComponent(create_bool_mask_with_true_at_index_array(source.shape, source_indices))]
+
+
+class IndexMappingForwardsPathTranslator(TranspositionalForwardsPathTranslator, IndexMappingPathTranslator):
+    """
+    Forward translate basic indexing and transpositions (like a[2:8:2], np.transpose, np.reshape) by mapping the
+    indices of the referenced elements of the source to the indices of the result.
+    Other calls are translated by the TranspositionalForwardsPathTranslator.
+    """
+
+    def can_try(self) -> bool:
+        return self._is_array_source(self._source, self._source_location) \
+            and self._get_index_mapping(self._source) is not None
+
+    def _forward_translate(self) -> Paths:
+        path_in_source_array, path_in_source_element, referenced_part_of_source_array = \
+            self._split_path_at_end_of_array(self._source.shape, self._path)
+        if len(path_in_source_array) == 1 and path_in_source_array[0].component is SpecialComponent.ALL:
+            # each element of the result is copied from an element of the source
+            result_mask = np_full(self._shape, True)
+        else:
+            source_indices = self._get_indices_of_referenced_elements(self._source.shape, path_in_source_array)
+            result_indices = self._get_index_mapping(self._source).forwards(source_indices)
+            if result_indices.shape[1] == 0:
+                return []
+            result_mask = create_bool_mask_with_true_at_index_array(self._shape, result_indices)
+
+        within_target_array_path = [PathComponent(result_mask)]
+        if is_scalar_np(referenced_part_of_source_array):
+            within_target_array_path += [PathComponent(SpecialComponent.OUT_OF_ARRAY)]
+        return [within_target_array_path + path_in_source_element]
@@ -40,7 +40,7 @@ def calculate_result_bool_mask_before_run(func):
 
     @functools.wraps(func)
     def wrapper(self, *args, **kwargs):
-        if self._result_bool_mask is None:
+        if self._path_in_array is None:
             self._calculate_result_bool_mask_and_split_path()
         return func(self, *args, **kwargs)
 
@@ -104,8 +104,8 @@ class NumpyBackwardsPathTranslator(BackwardsPathTranslator):
             # The entire source is needed as one element of the array (uni-source)
             return []
 
-        mask = create_bool_mask_with_true_at_indices((np.size(source.value),), source_indices)
-        mask = mask.reshape(np.shape(source.value))
+        mask = create_bool_mask_with_true_at_indices((np.prod(source.shape, dtype=int),), source_indices)
+        mask = mask.reshape(source.shape)
         if np.array_equal(mask, np.array(True)):
             source_path = []
         else:
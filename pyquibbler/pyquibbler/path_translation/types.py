@@ -1,9 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Optional, Type
 
 import numpy as np
 
+from pyquibbler.utilities.general_utils import Shape
+
 from .exceptions import FailedToTranslateException
 
 
@@ -14,6 +16,28 @@ class Source:
     def __hash__(self):
         return hash(id(self))
 
+    @property
+    def type_(self) -> Type:
+        return type(self.value)
+
+    @property
+    def shape(self) -> Shape:
+        return np.shape(self.value)
+
+    @property
+    def dtype(self) -> Optional[np.dtype]:
+        return getattr(self.value, 'dtype', None)
+
+    def get_value_or_array_proxy(self) -> Any:
+        """
+        For array sources, return a zero-stride proxy array of the shape of the source (all the elements share a
+        single byte of memory). Otherwise, return the value.
+        Used by translators that only need the shape of array sources.
+        """
+        if issubclass(self.type_, np.ndarray):
+            return np.broadcast_to(np.zeros((), dtype=bool), self.shape)
+        return self.value
+
 
 class NoMetadataSource(Source):
 
@@ -34,6 +58,43 @@ class NoMetadataSource(Source):
         return f"<{self.__class__.__name__}>"
 
 
+class MetadataSource(Source):
+    """
+    A source whose type, shape and (if known) dtype are given, and whose value is only retrieved (once) if
+    accessed. Translators which only need the metadata of their sources can thereby translate without calculating
+    or copying the values of the sources.
+    """
+
+    def __init__(self, get_value: Callable[[], Any], type_: Type, shape: Shape, dtype: Optional[np.dtype] = None):
+        object.__setattr__(self, '_get_value', get_value)
+        object.__setattr__(self, '_type', type_)
+        object.__setattr__(self, '_shape', shape)
+        object.__setattr__(self, '_dtype', dtype)
+
+    @property
+    def value(self):
+        if '_value' not in self.__dict__:
+            object.__setattr__(self, '_value', self._get_value())
+        return self.__dict__['_value']
+
+    @property
+    def type_(self) -> Type:
+        return self._type
+
+    @property
+    def shape(self) -> Shape:
+        return self._shape
+
+    @property
+    def dtype(self) -> Optional[np.dtype]:
+        if self._dtype is None and issubclass(self._type, np.ndarray):
+            return self.value.dtype
+        return self._dtype
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self._type.__name__}{self._shape}>"
+
+
 @dataclass
 class Inversal:
     assignment: Any
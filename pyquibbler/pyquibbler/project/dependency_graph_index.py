@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Set, Iterable, Callable, Tuple, Optional, FrozenSet
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from pyquibbler.quib.quib import Quib
+
+
+def _get_closure(quib: Quib, get_neighbours: Callable[[Quib], Iterable[Quib]],
+                 get_memoized_closure: Callable[[Quib], Optional[FrozenSet[Quib]]] = lambda _: None) -> Set[Quib]:
+    """
+    Return all the quibs reachable from the given quib, visiting each quib (and each link) only once.
+    The exploration does not continue past quibs whose own closure is already memoized.
+    """
+    closure = set()
+    quibs_to_visit = [quib]
+    while quibs_to_visit:
+        for neighbour in get_neighbours(quibs_to_visit.pop()):
+            if neighbour not in closure:
+                closure.add(neighbour)
+                memoized_closure = get_memoized_closure(neighbour)
+                if memoized_closure is None:
+                    quibs_to_visit.append(neighbour)
+                else:
+                    closure |= memoized_closure
+    return closure
+
+
+def _get_parents(quib: Quib) -> Iterable[Quib]:
+    return quib.handler.parents
+
+
+def _get_children(quib: Quib) -> Iterable[Quib]:
+    return quib.handler.get_children()
+
+
+class DependencyGraphIndex:
+    """
+    Answers ancestor and descendant queries of the quib dependency graph from memoized closures.
+
+    The links themselves are kept by the quibs: the parents of a quib are the sources of its function call, and
+    its children are registered upon ``connect_to_parents`` and unregistered upon ``disconnect_from_parents``.
+    Closures are calculated in linear time (each quib is visited once, even when reachable through many paths),
+    and are memoized until the graph is edited:
+
+    The ancestors of a quib are fixed once the quib is created (they are determined by its arguments), so their
+    closure is memoized, as a frozenset, for the life of the quib. The closure of a new quib is assembled from the
+    memoized closures of its parents, so that checking whether a quib is upstream of a freshly created quib (like
+    the proxies of a function with ``pass_quibs=True``) does not re-explore the network.
+
+    The descendants of a quib change whenever a quib is connected or disconnected downstream. Memoized descendant
+    closures are therefore invalidated upon each such edit. They are kept as weak sets, so quibs that are deleted
+    also disappear from the closures of their ancestors.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: int = 0
+        self._quibs_to_ancestors: weakref.WeakKeyDictionary[Quib, FrozenSet[Quib]] = weakref.WeakKeyDictionary()
+        self._quibs_to_descendants: weakref.WeakKeyDictionary[Quib, Tuple[int, weakref.WeakSet[Quib]]] = \
+            weakref.WeakKeyDictionary()
+
+    @property
+    def version(self) -> int:
+        """
+        Incremented upon each edit of the graph.
+        """
+        return self._version
+
+    def on_graph_edit(self):
+        """
+        Called whenever a quib is connected to, or disconnected from, its parents.
+        """
+        with self._lock:
+            self._version += 1
+
+    def _get_memoized_ancestors(self, quib: Quib) -> FrozenSet[Quib]:
+        ancestors = self._quibs_to_ancestors.get(quib)
+        if ancestors is None:
+            ancestors = frozenset(_get_closure(quib, _get_parents, self._quibs_to_ancestors.get))
+            with self._lock:
+                self._quibs_to_ancestors[quib] = ancestors
+        return ancestors
+
+    def get_ancestors(self, quib: Quib) -> Set[Quib]:
+        """
+        Return the set of all quibs upstream of the given quib.
+        """
+        return set(self._get_memoized_ancestors(quib))
+
+    def is_ancestor(self, ancestor: Quib, quib: Quib) -> bool:
+        """
+        Whether `ancestor` is upstream of `quib` (in constant time, once the ancestors of `quib` are memoized).
+        """
+        return ancestor in self._get_memoized_ancestors(quib)
+
+    def get_descendants(self, quib: Quib) -> Set[Quib]:
+        """
+        Return the set of all quibs downstream of the given quib.
+        """
+        with self._lock:
+            version, descendants = self._quibs_to_descendants.get(quib, (None, None))
+            current_version = self._version
+        if version != current_version:
+            descendants = weakref.WeakSet(_get_closure(quib, _get_children))
+            with self._lock:
+                if self._version == current_version:
+                    self._quibs_to_descendants[quib] = (current_version, descendants)
+        return set(descendants)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Optional, List
+
+from pyquibbler.debug_utils import logger
+from pyquibbler.quib.graphics.redraw import fignum_exists
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from pyquibbler.quib.quib import Quib
+
+
+def is_quib_prefetchable(quib: Quib) -> bool:
+    """
+    Only quibs that are known not to create graphics can be calculated outside the main thread.
+    """
+    return quib.is_graphics is False and not quib.is_graphics_quib
+
+
+def is_graphics_quib_visible(quib: Quib) -> bool:
+    """
+    A graphics quib is considered visible if it was never drawn (it is about to be drawn),
+    or if any of its artists are in an open figure.
+    """
+    if quib.handler.quib_function_call.graphics_collections is None:
+        return True
+    figures = quib.handler.get_figures()
+    return len(figures) == 0 or any(figure is not None and fignum_exists(figure.number) for figure in figures)
+
+
+class PrefetchScheduler:
+    """
+    Calculates, in a background thread, the non-graphics parents of graphics quibs, so that when the graphics quibs
+    are redrawn they find their upstream caches already valid.
+
+    Calculations in the background thread use the standard get_value mechanism (with its own, per-thread,
+    get-value context and quib guards). The caches of the calculated quibs are protected by their cache lock.
+    """
+
+    IDLE_SECONDS_BEFORE_THREAD_EXIT = 1.
+
+    def __init__(self):
+        self._pending_quibs: weakref.WeakSet[Quib] = weakref.WeakSet()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._is_calculating = False
+
+    def add_graphics_quib(self, quib: Quib):
+        """
+        Schedule prefetching of the parents of the given graphics quib.
+        """
+        with self._condition:
+            self._pending_quibs.add(quib)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name='quibbler-prefetch', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all scheduled quibs were prefetched. Returns False if timed-out.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending_quibs and not self._is_calculating, timeout)
+
+    def _pop_pending_quib(self) -> Optional[Quib]:
+        with self._condition:
+            self._is_calculating = False
+            self._condition.notify_all()
+            if not self._condition.wait_for(lambda: self._pending_quibs, self.IDLE_SECONDS_BEFORE_THREAD_EXIT):
+                self._thread = None
+                return None
+            self._is_calculating = True
+            return self._pending_quibs.pop()
+
+    def _work(self):
+        while True:
+            graphics_quib = self._pop_pending_quib()
+            if graphics_quib is None:
+                return
+            for quib in self._get_quibs_to_prefetch(graphics_quib):
+                self._prefetch_quib(quib)
+            del graphics_quib
+
+    @staticmethod
+    def _get_quibs_to_prefetch(graphics_quib: Quib) -> List[Quib]:
+        if not is_graphics_quib_visible(graphics_quib):
+            return []
+        return [parent for parent in graphics_quib.get_parents() if is_quib_prefetchable(parent)]
+
+    @staticmethod
+    def _prefetch_quib(quib: Quib):
+        try:
+            quib.get_value()
+        except Exception as e:
+            # The exception will be raised again, in the main thread, when the graphics quib is redrawn
+            logger.info(f"Failed to prefetch {quib}:\n{e}")
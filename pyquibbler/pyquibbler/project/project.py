@@ -4,14 +4,17 @@ import weakref
 
 from pathlib import Path
 import sys
-from typing import Optional, Set, List, Callable, Union, Mapping
+from typing import Optional, Set, List, Callable, Union, Mapping, Dict, Tuple
 
-from pyquibbler.utilities.input_validation_utils import get_enum_by_str, validate_user_input
+from pyquibbler.utilities.input_validation_utils import get_enum_by_str, validate_user_input, \
+    InvalidArgumentValueException
 from pyquibbler.utilities.file_path import PathWithHyperLink
 from pyquibbler.quib.graphics import GraphicsUpdateType, aggregate_redraw_mode
 from pyquibbler.file_syncing.types import SaveFormat, ResponseToFileNotDefined
 
 from .actions import AssignmentAction, AddAssignmentAction, RemoveAssignmentAction
+from .prefetch import PrefetchScheduler
+from .dependency_graph_index import DependencyGraphIndex
 from .exceptions import NoProjectDirectoryException, NothingToUndoException, NothingToRedoException
 
 from typing import TYPE_CHECKING
@@ -42,7 +45,16 @@ class Project:
         self._graphics_update: GraphicsUpdateType = self.DEFAULT_GRAPHICS_UPDATE
         self._path_change_callbacks: List[Callable] = []
         self._undo_redo_callbacks: List[Callable] = []
+        self._graph_change_callbacks: List[Callable] = []
         self.autoload_upon_first_get_value = True
+        self._prefetch: bool = False
+        self._prefetch_scheduler: PrefetchScheduler = PrefetchScheduler()
+        self._parallel_evaluation: bool = False
+        self._fuse_elementwise_chains: bool = False
+        self._out_of_core_evaluation: bool = False
+        self._cache_tile_shape: Optional[Tuple[int, ...]] = None
+        self._viewport_evaluation: bool = False
+        self.dependency_graph_index: DependencyGraphIndex = DependencyGraphIndex()
 
     @classmethod
     def get_or_create(cls, directory: Optional[Path, str] = None):
@@ -102,6 +114,23 @@ class Project:
         """
         self._undo_redo_callbacks.append(callback)
 
+    def add_graph_change_callback(self, callback: Callable):
+        """
+        Add a callback to be called when the quib dependency graph changes.
+
+        Parameters
+        ----------
+        callback : Callable
+            A callable that takes a single argument (the quib that was connected to, or disconnected from, its
+            parents). This callback will be called whenever a new quib is connected to its parents, and whenever
+            a quib is disconnected from its parents.
+
+        See Also
+        --------
+        remove_graph_change_callback, ~pyquibbler.quib_network.dependency_graph
+        """
+        self._graph_change_callbacks.append(callback)
+
     def remove_path_change_callback(self, callback: Callable):
         """
         Remove a previously registered path change callback.
@@ -132,6 +161,21 @@ class Project:
         """
         self._undo_redo_callbacks.remove(callback)
 
+    def remove_graph_change_callback(self, callback: Callable):
+        """
+        Remove a previously registered graph change callback.
+
+        Parameters
+        ----------
+        callback : Callable
+            The callback function to remove.
+
+        See Also
+        --------
+        add_graph_change_callback
+        """
+        self._graph_change_callbacks.remove(callback)
+
     def _on_path_change(self):
         for callback in self._path_change_callbacks:
             callback(self._directory)
@@ -140,6 +184,11 @@ class Project:
         for callback in self._undo_redo_callbacks:
             callback()
 
+    def _on_graph_change(self, quib: Quib):
+        self.dependency_graph_index.on_graph_edit()
+        for callback in list(self._graph_change_callbacks):
+            callback(quib)
+
     """
     quibs
     """
@@ -227,6 +276,34 @@ class Project:
             if quib.graphics_update == GraphicsUpdateType.CENTRAL:
                 quib.get_value()
 
+    def get_profile(self) -> Dict[str, list]:
+        """
+        Get the profiling statistics of all quibs in the project.
+
+        Returns a table, as a dict of columns, with a row for each quib that was evaluated, or that holds a cache.
+        Rows are sorted by total evaluation time, slowest first.
+        The table is DataFrame-ready: ``pandas.DataFrame(project.get_profile())``.
+
+        Returns
+        -------
+        dict of str to list
+            The ``'quib'`` column lists the quibs; the other columns are the fields of their `QuibStats`.
+
+        See Also
+        --------
+        Quib.stats
+        """
+        from pyquibbler.quib.func_calling.quib_stats import QuibStats
+        quibs_and_stats = [(quib, quib.stats) for quib in self.quibs]
+        quibs_and_stats = [(quib, stats) for quib, stats in quibs_and_stats
+                           if stats.num_evaluations > 0 or stats.cached_bytes > 0]
+        quibs_and_stats.sort(key=lambda quib_and_stats: quib_and_stats[1].total_evaluation_time, reverse=True)
+
+        profile = {'quib': [quib for quib, _ in quibs_and_stats]}
+        for field_name in QuibStats.get_field_names():
+            profile[field_name] = [getattr(stats, field_name) for _, stats in quibs_and_stats]
+        return profile
+
     """
     graphics
     """
@@ -246,6 +323,10 @@ class Project:
         ``'drop'``: Update only at the end of dragging of upstream quibs (at mouse 'drop'),
         or upon programmatic assignments to upstream quibs.
 
+        ``'background'``: Update continuously as upstream quibs are being dragged, calculating the new
+        values in the background. The last graphics are shown until the new values are ready,
+        and outdated values are never drawn.
+
         ``'central'``:  Do not automatically update graphics upon upstream changes.
         Only update upon explicit request for the quibs `get_value()`, or upon the
         central redraw command: `refresh_graphics()`.
@@ -266,6 +347,208 @@ class Project:
     def graphics_update(self, graphics_update: Union[str, GraphicsUpdateType]):
         self._graphics_update = get_enum_by_str(GraphicsUpdateType, graphics_update)
 
+    @property
+    def prefetch(self) -> bool:
+        """
+        bool: Indicates whether to calculate upstream values of graphics quibs in a background thread.
+
+        When ``prefetch=True``, upon creation or invalidation of graphics quibs, their non-graphics parents are
+        calculated in a background thread, ahead of the redraw.
+        The redraw, which always occurs in the main thread, then finds the upstream caches already valid.
+
+        Only quibs whose functions are known not to create graphics (``is_graphics=False``) are prefetched.
+
+        See Also
+        --------
+        wait_for_prefetch
+        Quib.is_graphics, Quib.cache_mode
+        """
+        return self._prefetch
+
+    @prefetch.setter
+    @validate_user_input(prefetch=bool)
+    def prefetch(self, prefetch: bool):
+        self._prefetch = prefetch
+
+    def schedule_prefetch(self, quib: Quib):
+        """
+        Schedule background calculation of the parents of the given graphics quib (if prefetch is on).
+        """
+        if self._prefetch:
+            self._prefetch_scheduler.add_graphics_quib(quib)
+
+    def wait_for_prefetch(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all scheduled background calculations are done.
+
+        Parameters
+        ----------
+        timeout : float or None, default None
+            Maximal time to wait, in seconds. `None` for waiting indefinitely.
+
+        Returns
+        -------
+        bool
+            `False` if timed-out, otherwise `True`.
+
+        See Also
+        --------
+        prefetch
+        """
+        return self._prefetch_scheduler.wait_until_idle(timeout)
+
+    """
+    evaluation
+    """
+
+    @property
+    def parallel_evaluation(self) -> bool:
+        """
+        bool: Indicates whether to calculate independent parents of a quib concurrently.
+
+        When ``parallel_evaluation=True``, before running the function of a quib, its parent quibs that need
+        calculation are calculated concurrently, in a thread pool.
+        This accelerates functions with several expensive, independent upstream branches
+        (like ``np.concatenate([a, b, c])``, where each of ``a``, ``b``, ``c`` is a heavy pipeline),
+        provided the heavy lifting of these branches releases the GIL (as most numpy functions do).
+
+        Shared upstream quibs are calculated only once. Graphics quibs, and quibs that may create graphics,
+        are always calculated in the thread requesting them.
+
+        See Also
+        --------
+        prefetch
+        Quib.get_value, Quib.is_graphics
+        """
+        return self._parallel_evaluation
+
+    @parallel_evaluation.setter
+    @validate_user_input(parallel_evaluation=bool)
+    def parallel_evaluation(self, parallel_evaluation: bool):
+        self._parallel_evaluation = parallel_evaluation
+
+    @property
+    def fuse_elementwise_chains(self) -> bool:
+        """
+        bool: Indicates whether to evaluate chains of elementwise quibs as one fused computation.
+
+        When ``fuse_elementwise_chains=True``, intermediate elementwise quibs of an expression
+        (like ``a * 2`` and ``b ** 2`` in ``c = a * 2 + b ** 2 - 1``) are evaluated as part of the evaluation of
+        the quib they feed, rather than each allocating and caching its own full array:
+        the result of each ufunc of the chain is written in-place into an intermediate array of the chain.
+        Only the quib at the end of the chain is cached.
+
+        An intermediate quib is fused into its child only if it is unnamed (``assigned_name=None``),
+        not overridden, not cached, and has no other children. Assignments and path translation work across the
+        fused chain as usual.
+
+        See Also
+        --------
+        parallel_evaluation
+        Quib.cache_mode, Quib.assigned_name
+        """
+        return self._fuse_elementwise_chains
+
+    @fuse_elementwise_chains.setter
+    @validate_user_input(fuse_elementwise_chains=bool)
+    def fuse_elementwise_chains(self, fuse_elementwise_chains: bool):
+        self._fuse_elementwise_chains = fuse_elementwise_chains
+
+    @property
+    def out_of_core_evaluation(self) -> bool:
+        """
+        bool: Indicates whether to evaluate quibs of memory-mapped arrays in chunks.
+
+        When ``out_of_core_evaluation=True``, elementwise and axis-reduction quibs whose data arguments are
+        memory-mapped arrays (like those returned by ``np.load(path, mmap_mode='r')``) process their arguments in
+        chunks along the leading axis, rather than as whole arrays that may not fit in memory.
+        The results of elementwise functions, and of reductions that keep the leading axis, are written into
+        memory-mapped arrays (backed by temporary files), which are cached as is. Their children are therefore also
+        evaluated in chunks.
+        Reductions along the leading axis combine the reductions of the chunks (for ``sum``, ``prod``, ``min``,
+        ``max``, ``all``, ``any`` and their ``nan`` variants).
+
+        See Also
+        --------
+        fuse_elementwise_chains
+        Quib.cache_mode
+        """
+        return self._out_of_core_evaluation
+
+    @out_of_core_evaluation.setter
+    @validate_user_input(out_of_core_evaluation=bool)
+    def out_of_core_evaluation(self, out_of_core_evaluation: bool):
+        self._out_of_core_evaluation = out_of_core_evaluation
+
+    @property
+    def viewport_evaluation(self) -> bool:
+        """
+        bool: Indicates whether to calculate the data of images and lines only within the visible axes limits.
+
+        When ``viewport_evaluation=True``, graphics quibs of ``imshow`` and ``plot`` request their data quibs only
+        within the current limits of their axes, and at the resolution of the axes pixels:
+
+        * ``imshow`` requests the visible rows and columns of the image, strided to at most one element per pixel,
+          and shows them with a correspondingly adjusted extent.
+        * ``plot`` requests the y-data of lines within the visible x-range (for lines with non-decreasing x-data),
+          and lines with more than twice as many points as the axes width in pixels are decimated to the minimum
+          and maximum points within each pixel column. Dragging decimated points assigns to the corresponding
+          data elements.
+
+        Upon changes of the axes limits (like pan and zoom), the graphics quibs are re-evaluated for the new viewport.
+        Axes with auto-scaling on show the data in full.
+
+        Individual lines can also be decimated, regardless of ``viewport_evaluation``, by specifying the decimation
+        method in the ``plot`` call: ``plot(..., quibbler_decimate='minmax')``, or ``quibbler_decimate='lttb'`` for
+        Largest-Triangle-Three-Buckets decimation. Decimated lines keep about twice as many points as the axes width
+        in pixels.
+
+        See Also
+        --------
+        cache_tile_shape
+        Quib.get_value_valid_at_path
+        """
+        return self._viewport_evaluation
+
+    @viewport_evaluation.setter
+    @validate_user_input(viewport_evaluation=bool)
+    def viewport_evaluation(self, viewport_evaluation: bool):
+        self._viewport_evaluation = viewport_evaluation
+
+    @property
+    def cache_tile_shape(self) -> Optional[Tuple[int, ...]]:
+        """
+        tuple of int or None: The shape of the tiles by which the validity of large cached arrays is tracked.
+
+        When ``cache_tile_shape`` is set (like ``(256, 256)`` for images), the cached arrays of function quibs that
+        span more than one tile are split into tiles along their leading axes (trailing axes are whole in each tile),
+        and their validity is tracked per tile rather than per element:
+        requesting part of the array recalculates, and invalidating part of it invalidates, the whole tiles it
+        touches.
+        This bounds the calculation of each request (like the visible region of an image) to the tiles it
+        references, and keeps the bookkeeping of the cache proportional to the number of tiles.
+
+        `None` (default) tracks validity per element.
+
+        The tile shape applies to caches created after it is set.
+
+        See Also
+        --------
+        Quib.cache_mode, Quib.cache_status
+        """
+        return self._cache_tile_shape
+
+    @cache_tile_shape.setter
+    @validate_user_input(cache_tile_shape=(type(None), tuple))
+    def cache_tile_shape(self, cache_tile_shape: Optional[Tuple[int, ...]]):
+        if cache_tile_shape is not None \
+                and not all(isinstance(length, int) and length > 0 for length in cache_tile_shape):
+            raise InvalidArgumentValueException(
+                var_name='cache_tile_shape',
+                message='a tuple of positive integers, or None.',
+            )
+        self._cache_tile_shape = cache_tile_shape
+
     """
     save/load
     """
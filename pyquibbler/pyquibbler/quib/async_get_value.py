@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Any, Callable
+
+from pyquibbler.cache import CacheStatus
+from pyquibbler.debug_utils import logger
+from pyquibbler.quib.graphics.main_thread import is_main_thread, call_in_main_thread, run_pending_main_thread_calls
+from pyquibbler.quib.graphics.redraw import redraw_figures, skip_canvas_draws
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from pyquibbler.quib.quib import Quib
+
+
+MAIN_THREAD_POLLING_SECONDS = 0.01
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    The executor calculating non-graphics quibs in the background (created on first use)
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(thread_name_prefix='quibbler-get-value')
+        return _EXECUTOR
+
+
+class QuibValueFuture(concurrent.futures.Future):
+    """
+    A future of a quib value.
+
+    The future stays pending until the value is fully calculated, so that an upstream invalidation can cancel it
+    even in mid-calculation (the calculation itself completes, but its outdated result is not delivered).
+
+    Waiting for the result in the main thread keeps running the calls that background threads queue for the main
+    thread (like evaluating graphics quibs), so waiting for a graphics quib does not deadlock.
+    """
+
+    def _wait_in_main_thread(self, timeout: Optional[float]) -> Optional[float]:
+        if not is_main_thread():
+            return timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done():
+            run_pending_main_thread_calls()
+            polling = MAIN_THREAD_POLLING_SECONDS
+            if deadline is not None:
+                polling = min(polling, deadline - time.monotonic())
+                if polling <= 0:
+                    break
+            concurrent.futures.wait([self], timeout=polling)
+        run_pending_main_thread_calls()
+        return 0
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return super().result(timeout=self._wait_in_main_thread(timeout))
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        return super().exception(timeout=self._wait_in_main_thread(timeout))
+
+
+def _is_calculated_in_background(quib: Quib) -> bool:
+    """
+    Only quibs that are known not to create graphics can be calculated outside the main thread.
+    """
+    return quib.is_graphics is False
+
+
+def _set_future_outcome(future: QuibValueFuture, value: Any = None, exception: Optional[BaseException] = None,
+                        before_setting_result: Optional[Callable[[], None]] = None):
+    """
+    Set the result (or exception) of the future, unless it was cancelled.
+    """
+    if not future.set_running_or_notify_cancel():
+        return
+    if exception is None:
+        if before_setting_result is not None:
+            before_setting_result()
+        future.set_result(value)
+    else:
+        future.set_exception(exception)
+
+
+def _call_when_all_done(futures: List[concurrent.futures.Future], func: Callable[[], None]):
+    """
+    Call func once all the futures are done (in the thread completing the last of them), without blocking.
+    """
+    if len(futures) == 0:
+        func()
+        return
+
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def _on_done(_):
+        with lock:
+            remaining[0] -= 1
+            is_last = remaining[0] == 0
+        if is_last:
+            func()
+
+    for future in futures:
+        future.add_done_callback(_on_done)
+
+
+def _calculate_in_background(quib: Quib, future: QuibValueFuture, loop: Optional[asyncio.AbstractEventLoop]):
+    if future.cancelled():
+        return
+    try:
+        value = quib.get_value()
+    except Exception as e:
+        _set_future_outcome(future, exception=e)
+        return
+
+    def _call_callbacks():
+        for callback in quib.handler.callbacks:
+            callback(value)
+
+    def _queue_callbacks():
+        if quib.handler.callbacks:
+            call_in_main_thread(_call_callbacks, loop)
+
+    # callbacks are queued before the result is set, so they are called by a main thread waiting for the result
+    _set_future_outcome(future, value, before_setting_result=_queue_callbacks)
+
+
+def _calculate_in_main_thread(quib: Quib, future: QuibValueFuture):
+    if future.cancelled():
+        return
+    try:
+        with skip_canvas_draws():
+            value = quib.handler.reevaluate_graphic_quib()
+    except Exception as e:
+        _set_future_outcome(future, exception=e)
+        return
+
+    redraw_figures({figure for figure in quib.handler.get_figures() if figure is not None})
+    _set_future_outcome(future, value)
+
+
+def _calculate_when_parents_are_done(quib: Quib, future: QuibValueFuture, loop: Optional[asyncio.AbstractEventLoop]):
+    if future.cancelled():
+        return
+    if _is_calculated_in_background(quib):
+        get_executor().submit(_calculate_in_background, quib, future, loop)
+    else:
+        call_in_main_thread(lambda: _calculate_in_main_thread(quib, future), loop)
+
+
+def get_value_future(quib: Quib, loop: Optional[asyncio.AbstractEventLoop] = None) -> QuibValueFuture:
+    """
+    Return a future of the value of the quib, calculating it in the background.
+
+    Non-graphics parents are calculated first, each as its own future, so that independent branches are calculated
+    concurrently. Pending futures are shared: requesting the value of a quib that is already being calculated
+    returns the same future.
+
+    Graphics quibs (and quibs that may create graphics) are evaluated in the main thread; results of quibs with
+    callbacks are delivered to the callbacks in the main thread.
+    """
+    handler = quib.handler
+    future = handler.value_future
+    if future is not None and not future.done():
+        return future
+
+    future = QuibValueFuture()
+    handler.value_future = future
+
+    if handler.is_iquib or quib.cache_status == CacheStatus.ALL_VALID:
+        parents = []
+    else:
+        parents = [parent for parent in quib.get_parents() if _is_calculated_in_background(parent)]
+    _calculate_when_parents_are_ready(quib, future, loop, parents)
+    return future
+
+
+def _calculate_when_parents_are_ready(quib: Quib, future: QuibValueFuture, loop: Optional[asyncio.AbstractEventLoop],
+                                      parents: List[Quib]):
+    parent_futures = [get_value_future(parent, loop) for parent in parents]
+
+    def _on_parents_done():
+        if future.cancelled():
+            return
+        # Parents invalidated while being calculated are requested again
+        cancelled_parents = [parent for parent, parent_future in zip(parents, parent_futures)
+                             if parent_future.cancelled()]
+        try:
+            if cancelled_parents:
+                _calculate_when_parents_are_ready(quib, future, loop, cancelled_parents)
+            else:
+                _calculate_when_parents_are_done(quib, future, loop)
+        except Exception as e:
+            logger.info(f"Failed to schedule the calculation of {quib}:\n{e}")
+            _set_future_outcome(future, exception=e)
+
+    # Failed parents do not prevent the calculation: their exceptions are raised again by get_value
+    _call_when_all_done(parent_futures, _on_parents_done)
+
+
+def cancel_value_future(quib: Quib):
+    """
+    Cancel the pending future of the quib value (called when the quib is invalidated).
+    """
+    handler = quib.handler
+    future = handler.value_future
+    if future is not None:
+        future.cancel()
+        handler.value_future = None
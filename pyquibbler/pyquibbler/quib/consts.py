@@ -1 +1,4 @@
 MAX_BYTES_PER_SECOND = 2 ** 30
+
+# The size of the chunks of memory-mapped arrays processed at a time in out-of-core evaluation
+OUT_OF_CORE_CHUNK_BYTES = 2 ** 26
@@ -106,5 +106,7 @@ def create_quib(func: Optional[Callable],
         lazy = GRAPHICS_LAZY if func_definition.is_graphics else LAZY
     if not lazy:
         quib.get_value()
+    elif func_definition.is_graphics:
+        project.schedule_prefetch(quib)
 
     return quib
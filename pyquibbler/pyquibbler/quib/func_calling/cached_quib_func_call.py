@@ -1,19 +1,25 @@
 from __future__ import annotations
 
 from contextlib import ExitStack
+from functools import partial
 from sys import getsizeof
 from time import perf_counter
+from weakref import ref
+
+import numpy as np
 
 # typing
-from typing import Optional, Dict, Any, Set, Callable, List, Union
-from pyquibbler.utilities.general_utils import Args, Kwargs
+from typing import Optional, Dict, Any, Set, Callable, List, Union, Tuple
+from pyquibbler.utilities.general_utils import Args, Kwargs, Shape
+from pyquibbler.utilities.numpy_original_functions import np_all
 from pyquibbler.quib.quib import Quib
 from .quib_func_call import QuibFuncCall
 
 # cache
 from pyquibbler.cache.cache_utils import truncate_path_to_match_shallow_caches, ensure_cache_matches_result, \
     get_cached_data_at_truncated_path_given_result_at_uncached_path
-from pyquibbler.cache import PathCannotHaveComponentsException, get_uncached_paths_matching_path
+from pyquibbler.cache import PathCannotHaveComponentsException, get_uncached_paths_matching_path, \
+    NdUnstructuredArrayCache, create_cache, get_bool_mask_of_component
 from .cache_mode import CacheMode
 
 # graphics
@@ -23,6 +29,12 @@ from pyquibbler.graphics.graphics_collection import GraphicsCollection
 from pyquibbler.quib import consts
 from pyquibbler.quib.external_call_failed_exception_handling import external_call_failed_exception_handling
 from pyquibbler.quib.quib_guard import QuibGuard
+from pyquibbler.project import Project
+from .parallel_evaluation import get_values_valid_at_paths
+from .fused_evaluation import FusedEvaluation, get_ufunc_and_args, can_write_result_into
+from .out_of_core_evaluation import evaluate_elementwise_in_chunks, is_memory_mapped_array, \
+    get_writable_memory_mapped_array
+from pyquibbler.function_definitions.func_definition import ElementWiseFuncDefinition
 
 # translation
 from pyquibbler.utilities.multiple_instance_runner import NoRunnerWorkedException
@@ -40,6 +52,15 @@ class CachedQuibFuncCall(QuibFuncCall):
 
     DEFAULT_CACHE_MODE = CacheMode.AUTO
 
+    # The array of a cache that was reset (upon a possible type change), kept for reuse until the next run:
+    _released_cached_array: Optional[np.ndarray] = None
+
+    # A weak reference to the view of the cached array that consumers got (see _get_value_to_hand_out):
+    _handed_out_view: Optional[ref] = None
+
+    # Whether the last call of _run_on_path wrote its result in-place into the (released) cached array:
+    _is_last_run_in_place: bool = False
+
     def _get_cache_behavior(self):
         if self.func_definition.is_random:
             return CacheMode.ON
@@ -60,7 +81,13 @@ class CachedQuibFuncCall(QuibFuncCall):
             f'self.cache_mode has unexpected value: "{cache_mode}"'
         return getsizeof(result) / elapsed_seconds < consts.MAX_BYTES_PER_SECOND
 
+    @staticmethod
+    def _get_cache_tile_shape() -> Optional[Shape]:
+        return Project.get_or_create().cache_tile_shape
+
     def _reset_cache(self):
+        if isinstance(self.cache, NdUnstructuredArrayCache):
+            self._released_cached_array = self.cache.get_value()
         self.cache = None
         self._caching = True if self._get_cache_behavior() == CacheMode.ON else False
 
@@ -72,6 +99,7 @@ class CachedQuibFuncCall(QuibFuncCall):
                          args: Args, kwargs: Kwargs, quibs_allowed_to_access: Set[Quib]):
 
         graphics_collection.set_color_cyclers_back_to_pre_run_index()
+        start_time = perf_counter()
         with ExitStack() as stack:
             if self.func_definition.is_graphics is not False:
                 stack.enter_context(graphics_collection.track_and_handle_new_graphics())
@@ -79,6 +107,7 @@ class CachedQuibFuncCall(QuibFuncCall):
             stack.enter_context(external_call_failed_exception_handling())
 
             res = func(*args, **kwargs)
+        self.stats.add_evaluation(perf_counter() - start_time)
 
         # We don't allow returning quibs as results from functions
         from pyquibbler.quib.quib import Quib
@@ -98,17 +127,32 @@ class CachedQuibFuncCall(QuibFuncCall):
         if not self.get_data_sources():
             return {}
 
+        if len(valid_path) == 0 and isinstance(self.func_definition, ElementWiseFuncDefinition) \
+                and self._should_fuse_elementwise_parents():
+            # the whole result of an elementwise function depends on all the elements of its sources.
+            # Translating without their shape and type spares evaluating fused parents on their own.
+            return {quib: [] for quib in self.get_data_sources()}
+
         try:
             # try without shape and type
             func_call, sources_to_quibs = get_func_call_for_translation(func_call=self, with_meta_data=False)
-            sources_to_paths = backwards_translate(
-                run_condition=BackwardsTranslationRunCondition.NO_SHAPE_AND_TYPE,
-                func_call=func_call,
-                path=valid_path,
-            )
+            start_time = perf_counter()
+            try:
+                sources_to_paths = backwards_translate(
+                    run_condition=BackwardsTranslationRunCondition.NO_SHAPE_AND_TYPE,
+                    func_call=func_call,
+                    path=valid_path,
+                )
+            finally:
+                self.stats.add_translation(perf_counter() - start_time)
         except NoRunnerWorkedException:
             # try with shape and type
+            if self._should_evaluate_sources_in_parallel():
+                # translating with shape and type requires the values of all the sources:
+                get_values_valid_at_paths([(quib, None) for quib in self.get_data_sources()]
+                                          + [(quib, []) for quib in self.get_parameter_sources()])
             func_call, sources_to_quibs = get_func_call_for_translation(func_call=self, with_meta_data=True)
+            start_time = perf_counter()
             try:
                 sources_to_paths = backwards_translate(
                     run_condition=BackwardsTranslationRunCondition.WITH_SHAPE_AND_TYPE,
@@ -121,6 +165,8 @@ class CachedQuibFuncCall(QuibFuncCall):
             except NoRunnerWorkedException:
                 # as a backup, request everything if cannot translate:
                 sources_to_paths = {source: [] for source in sources_to_quibs}
+            finally:
+                self.stats.add_translation(perf_counter() - start_time)
 
         quibs_to_paths = {}
         for source, quib in sources_to_quibs.items():
@@ -145,42 +191,143 @@ class CachedQuibFuncCall(QuibFuncCall):
                                                              transform_data_source_func=_proxify)
         return args, kwargs, quibs_allowed_to_access
 
+    def _get_reusable_cached_array(self) -> Optional[np.ndarray]:
+        """
+        Return the cached array (or the array of the cache that was just reset) if the function can write its result
+        into it in-place: the function must be an elementwise function and the array must be owned by the cache,
+        namely, it owns its data and no consumer still holds the view of it that we handed out.
+        """
+        if self._pass_quibs or not isinstance(self.func_definition, ElementWiseFuncDefinition):
+            return None
+        if self.cache is None:
+            array = self._released_cached_array
+        elif isinstance(self.cache, NdUnstructuredArrayCache):
+            array = self.cache.get_value()
+        else:
+            return None
+        if array is None or not array.flags.owndata or not array.flags.writeable:
+            return None
+        handed_out_view = None if self._handed_out_view is None else self._handed_out_view()
+        if handed_out_view is not None and handed_out_view.base is array:
+            return None
+        return array
+
+    @staticmethod
+    def _get_where_mask(valid_path: Optional[Path], shape: Shape) -> Union[None, bool, np.ndarray]:
+        """
+        Convert the path to a `where=` mask of the given shape (None if the path is not a whole-array mask, nor
+        index arrays referencing elements of the whole array).
+        """
+        if valid_path is None or len(valid_path) == 0:
+            return True
+        if len(valid_path) != 1:
+            return None
+        mask = get_bool_mask_of_component(valid_path[0].component, shape)
+        if mask is None:
+            return None
+        return True if np_all(mask) else mask
+
+    def _get_in_place_call(self, valid_path: Optional[Path], args: Args, kwargs: Kwargs) \
+            -> Optional[Tuple[Callable, Args, Kwargs]]:
+        """
+        Return a call of the ufunc of the function writing the result into the cached array, at the given path
+        (or None if the cached array cannot be reused).
+        """
+        array = self._get_reusable_cached_array()
+        if array is None:
+            return None
+        ufunc, ufunc_args = get_ufunc_and_args(self.func, args, kwargs)
+        where = self._get_where_mask(valid_path, array.shape)
+        if ufunc is None or where is None or not can_write_result_into(ufunc, ufunc_args, array):
+            return None
+        return partial(ufunc, out=array, where=where), ufunc_args, {}
+
+    def _get_out_of_core_call(self, args: Args, kwargs: Kwargs) -> Optional[Tuple[Callable, Args, Kwargs]]:
+        """
+        Return a call of the function processing memory-mapped arguments in chunks (or None if out-of-core
+        evaluation is off, or does not apply).
+        """
+        if not Project.get_or_create().out_of_core_evaluation \
+                or not isinstance(self.func_definition, ElementWiseFuncDefinition) \
+                or not any(isinstance(arg, np.memmap) for arg in args) \
+                or any(np.ndim(value) > 0 for value in kwargs.values()):
+            return None
+        return partial(evaluate_elementwise_in_chunks, self.func), args, kwargs
+
     def _run_on_path(self, valid_path: Path):
         graphics_collection: GraphicsCollection = self.graphics_collections[()]
 
+        func = self.func
+        fused_evaluation = None
+        self._is_last_run_in_place = False
         if self._pass_quibs:
             args, kwargs, quibs_allowed_to_access = self._proxify_args()
         else:
-            quibs_to_paths = {} if valid_path is None else self.backwards_translate_path(valid_path)
-            args, kwargs = self._get_args_and_kwargs_valid_at_quibs_to_paths(quibs_to_paths)
+            args, kwargs, fused_evaluation = self._get_args_and_kwargs_valid_at_path(valid_path)
             quibs_allowed_to_access = set()
 
-        return self._run_single_call(
-            func=self.func,
+            in_place_call = self._get_in_place_call(valid_path, args, kwargs)
+            out_of_core_call = None if in_place_call is not None else self._get_out_of_core_call(args, kwargs)
+            self._is_last_run_in_place = in_place_call is not None
+            if in_place_call is not None:
+                func, args, kwargs = in_place_call
+                fused_evaluation = None
+            elif out_of_core_call is not None:
+                func, args, kwargs = out_of_core_call
+                fused_evaluation = None
+            elif fused_evaluation is not None and isinstance(self.func_definition, ElementWiseFuncDefinition):
+                func = partial(fused_evaluation.call, self.func)
+            else:
+                fused_evaluation = None
+
+        result = self._run_single_call(
+            func=func,
             args=args,
             kwargs=kwargs,
             graphics_collection=graphics_collection,
             quibs_allowed_to_access=quibs_allowed_to_access
         )
 
+        if isinstance(result, np.ndarray):
+            self.stats.add_result_array(
+                is_in_place=self._is_last_run_in_place
+                or fused_evaluation is not None and fused_evaluation.is_last_call_in_place)
+        if Project.get_or_create().out_of_core_evaluation and is_memory_mapped_array(result):
+            # memory-mapped results are cached as is (see _run):
+            result = get_writable_memory_mapped_array(result)
+        return result
+
     def _run_on_uncached_paths_within_path(self, valid_paths: List[Union[None, Path]]):
         uncached_paths = []
         for valid_path in valid_paths:
             uncached_paths.extend(get_uncached_paths_matching_path(cache=self.cache, path=valid_path))
 
+        self.stats.add_cache_request(is_hit=len(uncached_paths) == 0 and self.cache is not None)
         if len(uncached_paths) == 0:
             if self.cache is None:
                 result = self._run_on_path(None)
-                self.cache = ensure_cache_matches_result(self.cache, result)
+                self.cache = ensure_cache_matches_result(self.cache, result, self._get_cache_tile_shape())
             return self.cache.get_value()
 
         result = None
 
         for uncached_path in uncached_paths:
+            # we release our reference to the cached array, so that it can be reused for the result:
+            result = None
             result = self._run_on_path(uncached_path)
 
+            if self._is_last_run_in_place:
+                # the result was written in-place into the cached array
+                if self.cache is None:
+                    self.cache = create_cache(result, self._get_cache_tile_shape())
+                    self._released_cached_array = None
+                truncated_path = truncate_path_to_match_shallow_caches(uncached_path, result)
+                if truncated_path is not None:
+                    self.cache.set_valid_at_path(truncated_path)
+                continue
+
             truncated_path = truncate_path_to_match_shallow_caches(uncached_path, result)
-            self.cache = ensure_cache_matches_result(self.cache, result)
+            self.cache = ensure_cache_matches_result(self.cache, result, self._get_cache_tile_shape())
 
             if truncated_path is not None:
                 with external_call_failed_exception_handling():
@@ -209,10 +356,26 @@ class CachedQuibFuncCall(QuibFuncCall):
 
         return result
 
+    def _get_args_and_kwargs_valid_at_path(self, valid_path: Optional[Path]) \
+            -> Tuple[Args, Kwargs, Optional[FusedEvaluation]]:
+        """
+        Prepare arguments to call self.func with - replace quibs with values needed for the result to be valid at
+        the given path. Returns also the fused evaluation of fusable parents (None if parents are not fused).
+        """
+        quibs_to_paths = {} if valid_path is None else self.backwards_translate_path(valid_path)
+        if self._should_fuse_elementwise_parents():
+            fused_evaluation = FusedEvaluation()
+            args, kwargs = fused_evaluation.get_args_and_kwargs(self, quibs_to_paths)
+            return args, kwargs, fused_evaluation
+        args, kwargs = self._get_args_and_kwargs_valid_at_quibs_to_paths(quibs_to_paths)
+        return args, kwargs, None
+
     def _get_args_and_kwargs_valid_at_quibs_to_paths(self, quibs_to_valid_paths: Dict[Quib, Optional[Path]]):
         """
         Prepare arguments to call self.func with - replace quibs with values valid at the given path
         """
+        if self._should_evaluate_sources_in_parallel():
+            return self._get_args_and_kwargs_valid_at_quibs_to_paths_evaluated_in_parallel(quibs_to_valid_paths)
 
         def _transform_data_source_quib(quib):
             # If the quib is a data source, and we didn't see it in the result, we don't need it to be valid at any
@@ -220,10 +383,12 @@ class CachedQuibFuncCall(QuibFuncCall):
             path = quibs_to_valid_paths.get(quib)
             return quib.get_value_valid_at_path(path)
 
+        parameter_source_paths = self.get_parameter_source_paths()
+
         def _transform_parameter_source_quib(quib):
             # This is a paramater quib- we always need a parameter quib to be completely valid regardless of where
-            # we need ourselves (this quib) to be valid
-            return quib.get_value_valid_at_path([])
+            # we need ourselves (this quib) to be valid (unless specified otherwise by get_parameter_source_paths)
+            return quib.get_value_valid_at_path(parameter_source_paths.get(quib, []))
 
         new_args, new_kwargs = self.transform_sources_in_args_kwargs(
             transform_data_source_func=_transform_data_source_quib,
@@ -232,6 +397,42 @@ class CachedQuibFuncCall(QuibFuncCall):
 
         return new_args, new_kwargs
 
+    def get_parameter_source_paths(self) -> Dict[Quib, Path]:
+        """
+        The paths at which specific parameter sources need to be valid.
+        Parameter sources which are not specified need to be completely valid.
+        """
+        return {}
+
+    def _should_fuse_elementwise_parents(self) -> bool:
+        return Project.get_or_create().fuse_elementwise_chains and not self._should_evaluate_sources_in_parallel()
+
+    @staticmethod
+    def _should_evaluate_sources_in_parallel() -> bool:
+        # quibs accessed within a quib guard must be calculated in the guarded thread
+        return Project.get_or_create().parallel_evaluation and not QuibGuard.is_within_quib_guard()
+
+    def _get_args_and_kwargs_valid_at_quibs_to_paths_evaluated_in_parallel(
+            self, quibs_to_valid_paths: Dict[Quib, Optional[Path]]):
+        """
+        Like _get_args_and_kwargs_valid_at_quibs_to_paths, but calculating the source quibs concurrently.
+        Sources are transformed in a deterministic order (data sources, then parameter sources), so we collect the
+        requested quibs and paths in a first pass and replace them with the calculated values, in the same order,
+        in a second pass.
+        """
+        quibs_and_paths = []
+        parameter_source_paths = self.get_parameter_source_paths()
+        self.transform_sources_in_args_kwargs(
+            transform_data_source_func=lambda quib: quibs_and_paths.append((quib, quibs_to_valid_paths.get(quib))),
+            transform_parameter_func=lambda quib: quibs_and_paths.append((quib, parameter_source_paths.get(quib, []))),
+        )
+        values = iter(get_values_valid_at_paths(quibs_and_paths))
+
+        return self.transform_sources_in_args_kwargs(
+            transform_data_source_func=lambda quib: next(values),
+            transform_parameter_func=lambda quib: next(values),
+        )
+
     def invalidate_cache_at_path(self, path: Path):
         if self.cache is not None:
             self.cache.set_invalid_at_path(path)
@@ -246,15 +447,33 @@ class CachedQuibFuncCall(QuibFuncCall):
 
         start_time = perf_counter()
 
-        result = self._run_on_uncached_paths_within_path(valid_paths)
+        try:
+            result = self._run_on_uncached_paths_within_path(valid_paths)
+        finally:
+            self._released_cached_array = None
 
         elapsed_seconds = perf_counter() - start_time
 
         if self._should_cache(result, elapsed_seconds):
             self._caching = True
-            self.cache.make_a_copy_if_value_is_a_view()
+            if not (Project.get_or_create().out_of_core_evaluation and is_memory_mapped_array(result)):
+                self.cache.make_a_copy_if_value_is_a_view()
 
         if not self._caching:
             self.cache = None
 
-        return result
+        return self._get_value_to_hand_out(result)
+
+    def _get_value_to_hand_out(self, result: Any) -> Any:
+        """
+        Return a view of the result, if it is the array of the cache, and keep a weak reference to it, so that we
+        know when the array is no longer held by consumers (see _get_reusable_cached_array).
+        All consumers share the same view, as long as it is alive.
+        """
+        if not isinstance(self.cache, NdUnstructuredArrayCache) or result is not self.cache.get_value():
+            return result
+        view = None if self._handed_out_view is None else self._handed_out_view()
+        if view is None or view.base is not result or view.shape != result.shape or view.dtype != result.dtype:
+            view = result.view()
+            self._handed_out_view = ref(view)
+        return view
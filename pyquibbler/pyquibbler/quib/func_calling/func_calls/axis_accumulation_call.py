@@ -0,0 +1,61 @@
+import numpy as np
+from numpy.lib.array_utils import normalize_axis_index
+
+from pyquibbler.function_definitions.func_call import FuncArgsKwargs
+from pyquibbler.utilities.general_utils import Args, Kwargs
+from pyquibbler.utilities.numpy_original_functions import np_any
+
+from .partial_recalculation_call import PartialRecalculationQuibFuncCall
+
+
+class AxisAccumulationQuibFuncCall(PartialRecalculationQuibFuncCall):
+    """
+    A func call of an accumulation along an axis, like np.cumsum(a, axis=0).
+
+    A change in an element of the data argument invalidates the result from this element onward, along the axis.
+    Rather than accumulating the whole axis again, the accumulation resumes at the first invalid index, seeded with
+    the cached accumulated value just before it. The seed replaces the last valid element, so the elements are
+    accumulated in the same order, and to the same values, as in a full calculation.
+    """
+
+    def _recalculate_into_cached_array(self, result_mask: np.ndarray, args: Args, kwargs: Kwargs) -> bool:
+        arg_values = dict(FuncArgsKwargs(self.func, args, kwargs).get_arg_values_by_keyword(include_defaults=False))
+        data = np.asarray(arg_values.pop(next(iter(arg_values))))
+        axis = arg_values.pop('axis', None)
+        if arg_values.pop('out', None) is not None:
+            return False
+        if axis is None:
+            data = data.reshape(-1)
+            axis = 0
+        try:
+            axis = normalize_axis_index(axis, data.ndim)
+        except (TypeError, ValueError):
+            return False
+
+        array = self.cache.get_value()
+        if array.shape != data.shape:
+            return False
+
+        # the first invalid index along the axis, in any of the accumulated lines. The seed must be valid, so we
+        # consider all the invalid elements of the cache, not only the requested ones:
+        invalid_mask = result_mask | self._get_invalid_mask_of_cache()
+        other_axes = tuple(dim for dim in range(data.ndim) if dim != axis)
+        start = int(np.argmax(np_any(invalid_mask, axis=other_axes)))
+        if start == 0:
+            return False
+
+        cached_lines = np.moveaxis(array, axis, 0)
+        seeded_lines = np.moveaxis(data, axis, 0)[start - 1:].astype(array.dtype)
+        seeded_lines[0] = cached_lines[start - 1]
+        kwargs = {'axis': 0, **arg_values}
+        if self._get_dtype_of_partial_call((seeded_lines, ), kwargs) != array.dtype:
+            return False
+        values = self._run_single_call(
+            func=self.func,
+            graphics_collection=self.graphics_collections[()],
+            args=(seeded_lines, ),
+            kwargs=kwargs,
+            quibs_allowed_to_access=set(),
+        )
+        cached_lines[start:] = values[1:]
+        return True
@@ -0,0 +1,73 @@
+from functools import partial
+from typing import Optional, Tuple, Callable
+
+import numpy as np
+from numpy.lib.array_utils import normalize_axis_tuple
+
+from pyquibbler.function_definitions.func_call import FuncArgsKwargs
+from pyquibbler.project import Project
+from pyquibbler.quib.func_calling.out_of_core_evaluation import evaluate_reduction_in_chunks, \
+    REDUCTIONS_TO_COMBINING_UFUNCS
+from pyquibbler.utilities.general_utils import Args, Kwargs
+
+from .partial_recalculation_call import PartialRecalculationQuibFuncCall
+
+
+class AxisReductionQuibFuncCall(PartialRecalculationQuibFuncCall):
+    """
+    A func call of a reduction along axes, like np.sum(a, axis=0).
+
+    When only some elements of the cached result are invalid (as when a single element of the data argument
+    changes), the function is called only on the sub-array feeding these elements, and the reduced values are
+    written into the cached array. Re-evaluation then takes O(N / M), rather than O(N), where N is the size of the
+    data argument and M is the size of the result.
+
+    With out-of-core evaluation, a memory-mapped data argument is reduced in chunks along its leading axis.
+    """
+
+    def _get_out_of_core_call(self, args: Args, kwargs: Kwargs) -> Optional[Tuple[Callable, Args, Kwargs]]:
+        if not Project.get_or_create().out_of_core_evaluation:
+            return None
+        arg_values = dict(FuncArgsKwargs(self.func, args, kwargs).get_arg_values_by_keyword(include_defaults=False))
+        data = arg_values.pop(next(iter(arg_values)))
+        if not isinstance(data, np.memmap) or any(np.ndim(value) > 0 for value in arg_values.values()):
+            return None
+        combining_ufunc = REDUCTIONS_TO_COMBINING_UFUNCS.get(self.func)
+        return partial(evaluate_reduction_in_chunks, self.func, combining_ufunc), (data, ), arg_values
+
+    def _recalculate_into_cached_array(self, result_mask: np.ndarray, args: Args, kwargs: Kwargs) -> bool:
+        arg_values = dict(FuncArgsKwargs(self.func, args, kwargs).get_arg_values_by_keyword(include_defaults=False))
+        data = np.asarray(arg_values.pop(next(iter(arg_values))))
+        axis = arg_values.pop('axis', None)
+        keepdims = arg_values.pop('keepdims', False)
+        if axis is None or arg_values.pop('where', True) is not True or arg_values.pop('out', None) is not None \
+                or any(np.ndim(value) > 0 for value in arg_values.values()):
+            # array kwargs (like the weights of np.average) are aligned with the whole data argument
+            return False
+        try:
+            axes = normalize_axis_tuple(axis, data.ndim)
+        except (TypeError, ValueError):
+            return False
+
+        array = self.cache.get_value()
+        if keepdims:
+            array = np.squeeze(array, axis=axes)
+            result_mask = np.squeeze(result_mask, axis=axes)
+        if array.shape != tuple(size for dim, size in enumerate(data.shape) if dim not in axes):
+            return False
+
+        # move the reduced axes to the end, so that each invalid result element is fed by a single row:
+        reduced_axes = tuple(range(-len(axes), 0))
+        sub_array = np.moveaxis(data, axes, reduced_axes)[result_mask]
+        kwargs = {'axis': reduced_axes if len(axes) > 1 else -1, **arg_values}
+        if self._get_dtype_of_partial_call((sub_array, ), kwargs) != array.dtype:
+            return False
+        values = self._run_single_call(
+            func=self.func,
+            graphics_collection=self.graphics_collections[()],
+            args=(sub_array, ),
+            kwargs=kwargs,
+            quibs_allowed_to_access=set(),
+        )
+        array[result_mask] = values
+        return True
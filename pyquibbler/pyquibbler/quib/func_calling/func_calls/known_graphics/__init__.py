@@ -1,3 +1,4 @@
 from .widgets import SliderQuibFuncCall, RangeSliderQuibFuncCall, RadioButtonsQuibFuncCall, \
     RectangleSelectorQuibFuncCall, CheckButtonsQuibFuncCall
 from .plot_call import PlotQuibFuncCall
+from .imshow_call import ImshowQuibFuncCall
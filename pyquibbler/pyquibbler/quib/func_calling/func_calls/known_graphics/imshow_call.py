@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Dict, Tuple, Union
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.axes import Axes
+
+from pyquibbler.path import Path, PathComponent
+from pyquibbler.quib.quib import Quib
+from pyquibbler.quib.graphics.viewport import get_axes_size_in_pixels, get_visible_index_range
+from pyquibbler.utilities.general_utils import Args, Kwargs
+
+from .viewport_call import ViewportGraphicsQuibFuncCall
+
+
+@dataclass(frozen=True)
+class ImageViewport:
+    component: Tuple[slice, slice]
+    extent: Tuple[float, float, float, float]
+
+
+class ImshowQuibFuncCall(ViewportGraphicsQuibFuncCall):
+    """
+    A func call of imshow, calculating the image only within the visible limits of the axes, and at most at the
+    resolution of the axes pixels (when `Project.viewport_evaluation` is on).
+    The image is then shown cropped and strided, with its extent adjusted accordingly.
+    """
+
+    def _get_image_arg_key(self) -> Union[int, str]:
+        return 'X' if 'X' in self.kwargs else 1
+
+    def _get_image_arg(self):
+        key = self._get_image_arg_key()
+        if isinstance(key, str):
+            return self.kwargs[key]
+        return self.args[key] if len(self.args) > key else None
+
+    def _calculate_viewport(self, ax: Axes) -> Optional[ImageViewport]:
+        image = self._get_image_arg()
+        if not isinstance(image, Quib):
+            return None
+        shape = image.get_shape()
+        if len(shape) < 2 or shape[0] == 0 or shape[1] == 0:
+            return None
+        num_rows, num_columns = shape[:2]
+
+        origin = self._get_arg_value(self.kwargs.get('origin')) or mpl.rcParams['image.origin']
+        extent = self._get_arg_value(self.kwargs.get('extent'))
+        if extent is None:
+            extent = (-0.5, num_columns - 0.5, num_rows - 0.5, -0.5) if origin == 'upper' \
+                else (-0.5, num_columns - 0.5, -0.5, num_rows - 0.5)
+        left, right, bottom, top = extent
+        # the data coordinates of the edges of the first row and the last row:
+        first_row_y, last_row_y = (top, bottom) if origin == 'upper' else (bottom, top)
+
+        first_column, stop_column = (0, num_columns) if ax.get_autoscalex_on() \
+            else get_visible_index_range(ax.get_xlim(), left, right, num_columns)
+        first_row, stop_row = (0, num_rows) if ax.get_autoscaley_on() \
+            else get_visible_index_range(ax.get_ylim(), first_row_y, last_row_y, num_rows)
+        width, height = get_axes_size_in_pixels(ax)
+        column_step = max(1, (stop_column - first_column) // width)
+        row_step = max(1, (stop_row - first_row) // height)
+        if (first_row, stop_row, row_step, first_column, stop_column, column_step) == \
+                (0, num_rows, 1, 0, num_columns, 1):
+            return None
+
+        # The strided image spans whole steps, possibly beyond the visible range:
+        column_width = (right - left) / num_columns
+        new_left = left + first_column * column_width
+        new_right = new_left + -(-(stop_column - first_column) // column_step) * column_step * column_width
+        row_height = (last_row_y - first_row_y) / num_rows
+        new_first_row_y = first_row_y + first_row * row_height
+        new_last_row_y = new_first_row_y + -(-(stop_row - first_row) // row_step) * row_step * row_height
+        new_extent = (new_left, new_right, new_last_row_y, new_first_row_y) if origin == 'upper' \
+            else (new_left, new_right, new_first_row_y, new_last_row_y)
+
+        return ImageViewport(
+            component=(slice(first_row, stop_row, row_step), slice(first_column, stop_column, column_step)),
+            extent=tuple(float(coordinate) for coordinate in new_extent),
+        )
+
+    def _get_parameter_source_paths_at_viewport(self) -> Dict[Quib, Path]:
+        return {self._get_image_arg(): [PathComponent(self._viewport.component)]}
+
+    def _apply_viewport_to_args_and_kwargs(self, args: Args, kwargs: Kwargs) -> Tuple[Args, Kwargs]:
+        key = self._get_image_arg_key()
+        kwargs = {**kwargs, 'extent': self._viewport.extent}
+        if isinstance(key, str):
+            kwargs[key] = np.asarray(kwargs[key])[self._viewport.component]
+        else:
+            args = tuple(args[:key]) + (np.asarray(args[key])[self._viewport.component],) + tuple(args[key + 1:])
+        return args, kwargs
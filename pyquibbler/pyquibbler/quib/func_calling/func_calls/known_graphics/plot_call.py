@@ -1,13 +1,140 @@
-from pyquibbler.path.path_component import Path
-from pyquibbler.quib.func_calling import CachedQuibFuncCall
+from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Optional, Tuple, Dict
 
-class PlotQuibFuncCall(CachedQuibFuncCall):
+import numpy as np
+from matplotlib.axes import Axes
+from numpy.typing import NDArray
+
+from pyquibbler.path.path_component import Path, PathComponent
+from pyquibbler.quib.quib import Quib
+from pyquibbler.quib.func_calling.fused_evaluation import FusedEvaluation
+from pyquibbler.quib.graphics.decimation import get_minmax_decimation_indices, get_lttb_decimation_indices, \
+    DecimationMethod, DECIMATE_KWARG
+from pyquibbler.quib.graphics.event_handling.plt_plot_parser import get_xdata_arg_indices_and_ydata_arg_indices, \
+    get_data_number_and_index_from_artist_index
+from pyquibbler.quib.graphics.viewport import get_axes_size_in_pixels, get_visible_index_range, \
+    get_visible_index_range_of_monotonic_data
+from pyquibbler.utilities.general_utils import Args, Kwargs
+from pyquibbler.utilities.input_validation_utils import get_enum_by_str
+from pyquibbler.utilities.numpy_original_functions import np_shape
+
+from .viewport_call import ViewportGraphicsQuibFuncCall
+
+
+@dataclass(frozen=True)
+class LineViewport:
+    num_bins: int
+    decimation: DecimationMethod
+
+    # For each x-y pair of the plot, the range of data indices to show (None for showing all the data):
+    index_ranges: Tuple[Optional[Tuple[int, int]], ...]
+
+
+class PlotQuibFuncCall(ViewportGraphicsQuibFuncCall):
+    """
+    A func call of plot.
+
+    When `Project.viewport_evaluation` is on, or when decimation is requested with `plot(..., quibbler_decimate=...)`,
+    the y-data of lines is only calculated within the visible x-limits of the axes (for lines with non-decreasing
+    x-data), and lines with more points than twice the axes width in pixels are decimated to about twice the axes
+    width (by default, to the minimum and maximum points within each pixel column).
+    The indices of the shown points are kept, to map picked points back to the data.
+    """
+
+    # For each decimated x-y pair, the data indices of the shown points:
+    _index_maps: Optional[Dict[int, NDArray[np.intp]]] = None
+
+    def _get_decimation_method(self) -> Optional[DecimationMethod]:
+        return get_enum_by_str(DecimationMethod, self._get_arg_value(self.kwargs.get(DECIMATE_KWARG)),
+                               allow_none=True)
+
+    def _is_viewport_evaluation_on(self) -> bool:
+        return super(PlotQuibFuncCall, self)._is_viewport_evaluation_on() or self._get_decimation_method() is not None
+
+    def _calculate_index_range(self, ax: Axes, x_arg, y_arg, num_bins: int) -> Optional[Tuple[int, int]]:
+        y_shape = y_arg.get_shape() if isinstance(y_arg, Quib) else np_shape(y_arg)
+        if len(y_shape) != 1:
+            return None
+        num_points = y_shape[0]
+        if x_arg is None:
+            index_range = (0, num_points) if ax.get_autoscalex_on() \
+                else get_visible_index_range(ax.get_xlim(), -0.5, num_points - 0.5, num_points)
+            # include the neighboring points, to which the line continues:
+            index_range = (max(index_range[0] - 1, 0), min(index_range[1] + 1, num_points))
+        else:
+            x = np.asarray(self._get_arg_value(x_arg))
+            if x.shape != (num_points,) or not np.issubdtype(x.dtype, np.number) or np.any(np.diff(x) < 0):
+                return None
+            index_range = (0, num_points) if ax.get_autoscalex_on() \
+                else get_visible_index_range_of_monotonic_data(ax.get_xlim(), x)
+        if index_range == (0, num_points) and num_points <= 2 * num_bins:
+            return None
+        return index_range
+
+    def _calculate_viewport(self, ax: Axes) -> Optional[LineViewport]:
+        x_arg_indices, y_arg_indices, _ = get_xdata_arg_indices_and_ydata_arg_indices(self.args)
+        num_bins, _ = get_axes_size_in_pixels(ax)
+        index_ranges = tuple(
+            self._calculate_index_range(ax, None if x_arg_index is None else self.args[x_arg_index],
+                                        self.args[y_arg_index], num_bins)
+            for x_arg_index, y_arg_index in zip(x_arg_indices, y_arg_indices))
+        if all(index_range is None for index_range in index_ranges):
+            return None
+        return LineViewport(num_bins=num_bins, decimation=self._get_decimation_method() or DecimationMethod.MINMAX,
+                            index_ranges=index_ranges)
+
+    def _get_parameter_source_paths_at_viewport(self) -> Dict[Quib, Path]:
+        _, y_arg_indices, _ = get_xdata_arg_indices_and_ydata_arg_indices(self.args)
+        return {self.args[y_arg_index]: [PathComponent(slice(*index_range))]
+                for y_arg_index, index_range in zip(y_arg_indices, self._viewport.index_ranges)
+                if index_range is not None and isinstance(self.args[y_arg_index], Quib)}
+
+    def _get_decimation_indices(self, x: Optional[np.ndarray], y: np.ndarray) -> NDArray[np.intp]:
+        if self._viewport.decimation is DecimationMethod.LTTB:
+            return get_lttb_decimation_indices(x, y, 2 * self._viewport.num_bins)
+        return get_minmax_decimation_indices(y, self._viewport.num_bins)
+
+    def _apply_viewport_to_args_and_kwargs(self, args: Args, kwargs: Kwargs) -> Tuple[Args, Kwargs]:
+        x_arg_indices, y_arg_indices, fmt_arg_indices = get_xdata_arg_indices_and_ydata_arg_indices(args)
+        new_args = [args[0]]
+        for data_number, (x_arg_index, y_arg_index, fmt_arg_index, index_range) in enumerate(
+                zip(x_arg_indices, y_arg_indices, fmt_arg_indices, self._viewport.index_ranges)):
+            if index_range is None:
+                new_args.extend(args[index] for index in (x_arg_index, y_arg_index) if index is not None)
+            else:
+                first, stop = index_range
+                x = None if x_arg_index is None else np.asarray(args[x_arg_index])
+                y = np.asarray(args[y_arg_index])
+                indices = first + self._get_decimation_indices(None if x is None else x[first:stop], y[first:stop])
+                self._index_maps[data_number] = indices
+                new_args.extend((indices if x is None else x[indices], y[indices]))
+            if fmt_arg_index is not None:
+                new_args.append(args[fmt_arg_index])
+        return tuple(new_args), kwargs
+
+    def _get_args_and_kwargs_valid_at_path(self, valid_path: Optional[Path]) \
+            -> Tuple[Args, Kwargs, Optional[FusedEvaluation]]:
+        args, kwargs, fused_evaluation = \
+            super(PlotQuibFuncCall, self)._get_args_and_kwargs_valid_at_path(valid_path)
+        kwargs = {key: value for key, value in kwargs.items() if key != DECIMATE_KWARG}
+        return args, kwargs, fused_evaluation
+
+    def get_index_map(self, data_number: int) -> Optional[NDArray[np.intp]]:
+        """
+        The data indices of the points shown for the given x-y pair (None if all the data is shown).
+        """
+        return None if self._index_maps is None else self._index_maps.get(data_number)
 
     def _run_on_path(self, valid_path: Path):
+        self._index_maps = {}
         res = super(PlotQuibFuncCall, self)._run_on_path(valid_path)
         graphics_collection = self.graphics_collections[()]
+        x_arg_indices, y_arg_indices, _ = get_xdata_arg_indices_and_ydata_arg_indices(self.args)
         for i, artist in enumerate(graphics_collection.artists):
             artist._index_in_plot = i
+            data_number, _ = get_data_number_and_index_from_artist_index(self.args, x_arg_indices, y_arg_indices, i)
+            artist._index_map_in_plot = self.get_index_map(data_number)
 
         return res
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Optional, Any, Dict, Tuple
+
+from matplotlib.axes import Axes
+
+from pyquibbler.path import Path
+from pyquibbler.project import Project
+from pyquibbler.quib.quib import Quib
+from pyquibbler.quib.func_calling import CachedQuibFuncCall
+from pyquibbler.quib.func_calling.fused_evaluation import FusedEvaluation
+from pyquibbler.quib.graphics.event_handling import CanvasEventHandler
+from pyquibbler.utilities.general_utils import Args, Kwargs
+
+
+class ViewportGraphicsQuibFuncCall(CachedQuibFuncCall):
+    """
+    A func call of a graphics function whose data arguments only need to be calculated within the visible limits of
+    its axes, at the resolution of the axes pixels (when `Project.viewport_evaluation` is on).
+
+    Before each run, the viewport is calculated from the axes limits and size. It determines the paths at which the
+    data arguments are requested, and how their values are cropped and downsampled before calling the function.
+    The viewport is re-calculated upon changes of the axes limits, and the quib is re-evaluated if it had changed.
+    """
+
+    _viewport: Optional[Any] = None
+    _is_calculating_viewport_graphics: bool = False
+
+    def _get_axes(self) -> Optional[Axes]:
+        ax = self.args[0] if len(self.args) > 0 else None
+        return ax if isinstance(ax, Axes) else None
+
+    @staticmethod
+    def _get_arg_value(arg: Any) -> Any:
+        return arg.get_value() if isinstance(arg, Quib) else arg
+
+    def _calculate_viewport(self, ax: Axes) -> Optional[Any]:
+        """
+        Calculate the viewport for the current limits and size of the axes (None if the data arguments are needed as
+        a whole). Viewports are compared to decide whether the quib should be re-evaluated.
+        """
+        return None
+
+    def _is_viewport_evaluation_on(self) -> bool:
+        return Project.get_or_create().viewport_evaluation
+
+    def _get_viewport(self) -> Optional[Any]:
+        ax = self._get_axes()
+        if not self._is_viewport_evaluation_on() or ax is None:
+            return None
+        return self._calculate_viewport(ax)
+
+    def _get_parameter_source_paths_at_viewport(self) -> Dict[Quib, Path]:
+        return {}
+
+    def _apply_viewport_to_args_and_kwargs(self, args: Args, kwargs: Kwargs) -> Tuple[Args, Kwargs]:
+        """
+        Crop and downsample the values of the data arguments according to the viewport.
+        """
+        return args, kwargs
+
+    def get_parameter_source_paths(self) -> Dict[Quib, Path]:
+        if self._viewport is None:
+            return {}
+        return self._get_parameter_source_paths_at_viewport()
+
+    def _get_args_and_kwargs_valid_at_path(self, valid_path: Optional[Path]) \
+            -> Tuple[Args, Kwargs, Optional[FusedEvaluation]]:
+        args, kwargs, fused_evaluation = \
+            super(ViewportGraphicsQuibFuncCall, self)._get_args_and_kwargs_valid_at_path(valid_path)
+        if self._viewport is not None:
+            args, kwargs = self._apply_viewport_to_args_and_kwargs(args, kwargs)
+        return args, kwargs, fused_evaluation
+
+    def _run_on_path(self, valid_path: Path):
+        # Getting the axes limits can apply pending autoscaling, which notifies of limits changes:
+        self._is_calculating_viewport_graphics = True
+        try:
+            self._viewport = self._get_viewport()
+            result = super(ViewportGraphicsQuibFuncCall, self)._run_on_path(valid_path)
+        finally:
+            self._is_calculating_viewport_graphics = False
+
+        ax = self._get_axes()
+        if self._is_viewport_evaluation_on() and ax is not None and ax.figure.canvas.manager is not None:
+            CanvasEventHandler.get_or_create_initialized_event_handler(ax.figure.canvas).track_axes_limits(ax)
+        return result
+
+    def is_viewport_changed(self) -> bool:
+        """
+        Was the viewport changed (by changes of the axes limits or size) since the last run?
+        Changes that occur while running the function (like autoscaling of the axes) are ignored.
+        """
+        if self._is_calculating_viewport_graphics:
+            return False
+        return self._get_viewport() != self._viewport
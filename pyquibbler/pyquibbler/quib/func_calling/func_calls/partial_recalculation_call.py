@@ -0,0 +1,81 @@
+from typing import Optional
+
+import numpy as np
+
+from pyquibbler.cache import NdUnstructuredArrayCache, get_bool_mask_of_component
+from pyquibbler.path import Path
+from pyquibbler.quib.func_calling import CachedQuibFuncCall
+from pyquibbler.utilities.general_utils import Args, Kwargs
+from pyquibbler.utilities.numpy_original_functions import np_all
+
+
+class PartialRecalculationQuibFuncCall(CachedQuibFuncCall):
+    """
+    A func call that, when only some elements of its cached array are invalid, can recalculate just these
+    elements, writing them in-place into the cached array.
+    """
+
+    def _get_partially_invalid_result_mask(self, valid_path: Optional[Path]) -> Optional[np.ndarray]:
+        """
+        Return the bool mask of the result elements to calculate, if the result is cached and the path is a mask
+        (or index arrays) of some, but not all, of its elements (None otherwise).
+        """
+        if self._pass_quibs or valid_path is None or len(valid_path) != 1 \
+                or not isinstance(self.cache, NdUnstructuredArrayCache):
+            return None
+        array = self.cache.get_value()
+        mask = get_bool_mask_of_component(valid_path[0].component, array.shape)
+        if mask is None or np_all(mask) or not array.flags.writeable:
+            return None
+        return mask
+
+    def _get_invalid_mask_of_cache(self) -> np.ndarray:
+        """
+        Return the bool mask of all the invalid elements of the cached array (not only the requested ones).
+        """
+        mask = np.zeros(self.cache.get_value().shape, dtype=np.bool_)
+        for path in self.cache.get_uncached_paths([]):
+            mask[path[0].component] = True
+        return mask
+
+    def _get_dtype_of_partial_call(self, args: Args, kwargs: Kwargs) -> Optional[np.dtype]:
+        """
+        Return the dtype of the result of calling the function on the given arguments, found by calling it on
+        zero-length leading slices of them, so that a partial recalculation yielding values of the wrong dtype is
+        rejected before evaluating the function (None if the function fails on zero-length arguments).
+        """
+        try:
+            return np.asarray(self.func(*(arg[:0] for arg in args), **kwargs)).dtype
+        except Exception:
+            return None
+
+    def _recalculate_into_cached_array(self, result_mask: np.ndarray, args: Args, kwargs: Kwargs) -> bool:
+        """
+        Calculate the elements of the result at the True elements of the result mask, writing them into the
+        cached array.
+        Returns False, without writing, if the call does not allow partial recalculation.
+        """
+        return False
+
+    def _run_on_path(self, valid_path: Optional[Path]):
+        result_mask = self._get_partially_invalid_result_mask(valid_path)
+        if result_mask is None:
+            return super()._run_on_path(valid_path)
+
+        args, kwargs, _ = self._get_args_and_kwargs_valid_at_path(valid_path)
+        self._is_last_run_in_place = self._recalculate_into_cached_array(result_mask, args, kwargs)
+        if not self._is_last_run_in_place:
+            func, args, kwargs = self._get_out_of_core_call(args, kwargs) or (self.func, args, kwargs)
+            result = self._run_single_call(
+                func=func,
+                graphics_collection=self.graphics_collections[()],
+                args=args,
+                kwargs=kwargs,
+                quibs_allowed_to_access=set(),
+            )
+            if isinstance(result, np.ndarray):
+                self.stats.add_result_array(is_in_place=False)
+            return result
+
+        self.stats.add_result_array(is_in_place=True)
+        return self.cache.get_value()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import operator
+from time import perf_counter
+
+import numpy as np
+
+from typing import Optional, Dict, Any, Callable, List, Tuple
+from pyquibbler.utilities.general_utils import Args, Kwargs
+from pyquibbler.utilities.operators_with_reverse import REVERSE_OPERATOR_NAMES_TO_FUNCS
+from pyquibbler.function_definitions.func_definition import ElementWiseFuncDefinition
+from pyquibbler.path import Path
+from pyquibbler.quib.external_call_failed_exception_handling import external_call_failed_exception_handling
+
+from .cache_mode import CacheMode
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from pyquibbler.quib.quib import Quib
+
+
+# Operators whose application to arrays is a call to a ufunc: (ufunc, is_reversed)
+OPERATORS_TO_UFUNCS: Dict[Callable, Tuple[np.ufunc, bool]] = {
+    **{getattr(operator, name): (ufunc, False) for name, ufunc in (
+        ('add', np.add),
+        ('sub', np.subtract),
+        ('mul', np.multiply),
+        ('truediv', np.true_divide),
+        ('floordiv', np.floor_divide),
+        ('mod', np.remainder),
+        ('pow', np.power),
+        ('lt', np.less),
+        ('le', np.less_equal),
+        ('gt', np.greater),
+        ('ge', np.greater_equal),
+        ('ne', np.not_equal),
+        ('neg', np.negative),
+        ('pos', np.positive),
+        ('abs', np.absolute),
+        ('invert', np.invert),
+    )},
+    **{REVERSE_OPERATOR_NAMES_TO_FUNCS[f'__r{name}__']: (ufunc, True) for name, ufunc in (
+        ('add', np.add),
+        ('sub', np.subtract),
+        ('mul', np.multiply),
+        ('truediv', np.true_divide),
+        ('floordiv', np.floor_divide),
+        ('mod', np.remainder),
+        ('pow', np.power),
+    )},
+}
+
+
+def get_ufunc_and_args(func: Callable, args: Args, kwargs: Kwargs) -> Tuple[Optional[np.ufunc], Args]:
+    """
+    Return the ufunc that the given elementwise func applies to arrays, with its args in ufunc order
+    (None, if func does not call a ufunc, or not on arrays, or is called with kwargs).
+    """
+    if kwargs:
+        return None, args
+    if isinstance(func, np.ufunc):
+        return func, args
+    ufunc, is_reversed = OPERATORS_TO_UFUNCS.get(func, (None, False))
+    if ufunc is None or not any(isinstance(arg, np.ndarray) for arg in args):
+        # operators on non-array objects (like lists) are not ufunc calls
+        return None, args
+    return ufunc, args[::-1] if is_reversed else args
+
+
+def _get_dtype_for_resolution(arg: Any):
+    if isinstance(arg, (np.ndarray, np.generic)):
+        return arg.dtype
+    if type(arg) in (bool, int, float, complex):
+        # python scalars are weakly typed:
+        return type(arg) if type(arg) is not bool else np.dtype(bool)
+    return None
+
+
+def can_write_result_into(ufunc: np.ufunc, args: Args, buffer: np.ndarray) -> bool:
+    """
+    Whether the result of calling the ufunc on the given args has the shape and dtype of the given buffer.
+    """
+    if ufunc.nout != 1 or len(args) != ufunc.nin:
+        return False
+    dtypes = tuple(_get_dtype_for_resolution(arg) for arg in args)
+    if any(dtype is None for dtype in dtypes):
+        return False
+    try:
+        result_dtype = ufunc.resolve_dtypes(dtypes + (None, ))[-1]
+        result_shape = np.broadcast_shapes(*(np.shape(arg) for arg in args))
+    except (TypeError, ValueError):
+        return False
+    return buffer.dtype == result_dtype and buffer.shape == result_shape
+
+
+def call_elementwise_func(func: Callable, args: Args, kwargs: Kwargs,
+                          temporaries: List[np.ndarray]) -> Tuple[Any, bool]:
+    """
+    Call an elementwise func, writing the result in-place into one of its temporary array arguments, if possible.
+
+    Returns the result, and whether it is a temporary array (an array that the fused evaluation owns, and can
+    therefore overwrite).
+    """
+    ufunc, ufunc_args = get_ufunc_and_args(func, args, kwargs)
+    if ufunc is None:
+        return func(*args, **kwargs), False
+
+    buffer = next((arg for arg in ufunc_args if any(arg is temporary for temporary in temporaries)
+                   and can_write_result_into(ufunc, ufunc_args, arg)), None)
+    if buffer is None:
+        result = ufunc(*ufunc_args)
+    else:
+        result = ufunc(*ufunc_args, out=buffer)
+    return result, isinstance(result, np.ndarray)
+
+
+def is_fusable_into_child(quib: Quib) -> bool:
+    """
+    Whether the quib is an intermediate step of an elementwise chain, which can be evaluated as part of the
+    evaluation of its single child, without caching its own value.
+    """
+    handler = quib.handler
+    func_definition = handler.func_definition
+    func_call = handler.quib_function_call
+    return isinstance(func_definition, ElementWiseFuncDefinition) \
+        and func_definition.is_graphics is False \
+        and not func_definition.is_random \
+        and not func_definition.pass_quibs \
+        and quib.assigned_name is None \
+        and not handler.is_overridden \
+        and func_call.cache is None \
+        and func_call.cache_mode is not CacheMode.ON \
+        and len(handler.get_children()) == 1
+
+
+class FusedEvaluation:
+    """
+    Evaluates a quib together with the elementwise chains feeding it, as one computation.
+
+    Parents that are fusable into their child are not asked for their value. Instead, their function is called
+    directly on the values of their own parents (recursively), and the resulting arrays are used as temporaries:
+    each subsequent ufunc of the chain writes its result in-place (using ``out=``) into a temporary argument of the
+    same shape and dtype, rather than allocating a new array.
+
+    Only the non-fusable quibs at the boundaries of the chain (and the quib itself) are evaluated, and cached,
+    as usual. Paths are translated backwards through each step of the chain, so only the needed elements of the
+    boundary quibs are calculated.
+    """
+
+    def __init__(self):
+        self._quibs_to_values: Dict[Quib, Any] = {}
+        self.temporaries: List[np.ndarray] = []
+        self.is_last_call_in_place: bool = False
+
+    def get_value_valid_at_path(self, quib: Quib, path: Optional[Path]) -> Any:
+        if not is_fusable_into_child(quib):
+            return quib.get_value_valid_at_path(path)
+
+        # a fusable quib has a single child, which needs it valid at a single path:
+        if quib not in self._quibs_to_values:
+            self._quibs_to_values[quib] = self._evaluate(quib, path)
+        return self._quibs_to_values[quib]
+
+    def get_args_and_kwargs(self, func_call, quibs_to_valid_paths: Dict[Quib, Optional[Path]]) -> Tuple[Args, Kwargs]:
+        parameter_source_paths = func_call.get_parameter_source_paths()
+        return func_call.transform_sources_in_args_kwargs(
+            transform_data_source_func=lambda quib: self.get_value_valid_at_path(quib, quibs_to_valid_paths.get(quib)),
+            transform_parameter_func=lambda quib: quib.get_value_valid_at_path(parameter_source_paths.get(quib, [])),
+        )
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call an elementwise func, reusing the temporaries of the fused evaluation.
+        """
+        result, is_temporary = call_elementwise_func(func, args, kwargs, self.temporaries)
+        self.is_last_call_in_place = any(result is temporary for temporary in self.temporaries)
+        if is_temporary and not self.is_last_call_in_place:
+            self.temporaries.append(result)
+        return result
+
+    def _evaluate(self, quib: Quib, path: Optional[Path]) -> Any:
+        func_call = quib.handler.quib_function_call
+        quibs_to_paths = {} if path is None else func_call.backwards_translate_path(path)
+        args, kwargs = self.get_args_and_kwargs(func_call, quibs_to_paths)
+
+        start_time = perf_counter()
+        with external_call_failed_exception_handling():
+            result = self.call(func_call.func, *args, **kwargs)
+        func_call.stats.add_evaluation(perf_counter() - start_time)
+        if isinstance(result, np.ndarray):
+            func_call.stats.add_result_array(is_in_place=self.is_last_call_in_place)
+        func_call._update_shape_and_type_from_result(result)
+        return result
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import mmap
+import tempfile
+
+import numpy as np
+from numpy.lib.array_utils import normalize_axis_tuple
+
+from typing import Any, Callable, Dict, Optional
+from pyquibbler.utilities.general_utils import Shape
+from pyquibbler.utilities.get_original_func import get_original_func
+from pyquibbler.quib import consts
+
+
+# Reductions whose results over chunks of the data are combined, elementwise, by a ufunc:
+REDUCTIONS_TO_COMBINING_UFUNCS: Dict[Callable, np.ufunc] = {
+    get_original_func(reduction): ufunc for reduction, ufunc in (
+        (np.sum, np.add),
+        (np.nansum, np.add),
+        (np.prod, np.multiply),
+        (np.nanprod, np.multiply),
+        (np.min, np.minimum),
+        (np.amin, np.minimum),
+        (np.nanmin, np.fmin),
+        (np.max, np.maximum),
+        (np.amax, np.maximum),
+        (np.nanmax, np.fmax),
+        (np.all, np.logical_and),
+        (np.any, np.logical_or),
+    )
+}
+
+
+def is_memory_mapped_array(obj: Any) -> bool:
+    """
+    Whether obj is an array mapped to a file (rather than a view of such an array).
+    """
+    return isinstance(obj, np.memmap) and isinstance(obj.base, mmap.mmap)
+
+
+def get_writable_memory_mapped_array(array: np.memmap) -> np.memmap:
+    """
+    Return the memory-mapped array, or, if it is read-only, a copy-on-write mapping of its file (so that the cache
+    can update it: written pages are kept in memory, and the file is not changed).
+    """
+    if array.flags.writeable or array.filename is None:
+        return array
+    return np.memmap(array.filename, dtype=array.dtype, mode='c', shape=array.shape, offset=array.offset,
+                     order='F' if array.flags.f_contiguous and not array.flags.c_contiguous else 'C')
+
+
+def create_memory_mapped_array(shape: Shape, dtype: np.dtype) -> np.ndarray:
+    """
+    Create an array mapped to an anonymous temporary file, which is deleted when the array is released.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.hasobject or np.prod(shape) == 0:
+        return np.empty(shape, dtype=dtype)
+    with tempfile.TemporaryFile() as file:
+        return np.memmap(file, dtype=dtype, mode='w+', shape=shape)
+
+
+def _get_chunk_length(shape: Shape, itemsize: int) -> int:
+    """
+    The number of elements along the leading axis making a chunk of OUT_OF_CORE_CHUNK_BYTES.
+    """
+    return max(1, consts.OUT_OF_CORE_CHUNK_BYTES // max(1, int(np.prod(shape[1:])) * itemsize))
+
+
+def evaluate_elementwise_in_chunks(func: Callable, *args, **kwargs) -> Any:
+    """
+    Call an elementwise func in chunks along the leading axis of the result, writing the results into a
+    memory-mapped array, so that only a single chunk of the arguments and of the result is in memory at a time.
+    Arguments that are broadcast along the leading axis are passed whole to each call.
+    """
+    args = tuple(arg if isinstance(arg, np.ndarray) or np.ndim(arg) == 0 else np.asarray(arg) for arg in args)
+    shape = np.broadcast_shapes(*(np.shape(arg) for arg in args))
+    if len(shape) == 0 or shape[0] == 0:
+        return func(*args, **kwargs)
+
+    itemsize = max(arg.itemsize for arg in args if isinstance(arg, np.ndarray))
+    chunk_length = _get_chunk_length(shape, itemsize)
+    result = None
+    for start in range(0, shape[0], chunk_length):
+        chunk = slice(start, start + chunk_length)
+        chunk_result = np.asarray(func(*(arg if np.ndim(arg) < len(shape) or np.shape(arg)[0] == 1 else arg[chunk]
+                                         for arg in args), **kwargs))
+        if result is None:
+            result = create_memory_mapped_array(shape, chunk_result.dtype)
+        result[chunk] = chunk_result
+    return result
+
+
+def evaluate_reduction_in_chunks(func: Callable, combining_ufunc: Optional[np.ufunc], data: np.ndarray,
+                                 axis=None, keepdims: bool = False, **kwargs) -> Any:
+    """
+    Call a reduction func in chunks along the leading axis of the data.
+
+    When the leading axis is not reduced, each chunk of the data is reduced into its own chunk of a memory-mapped
+    result. When it is reduced, the reductions of the chunks are combined with the given ufunc (like np.add for
+    np.sum). Reductions that cannot be combined are called on the whole data.
+    """
+    if data.ndim == 0 or data.shape[0] == 0:
+        return func(data, axis=axis, keepdims=keepdims, **kwargs)
+    axes = tuple(range(data.ndim)) if axis is None else normalize_axis_tuple(axis, data.ndim)
+    is_leading_axis_reduced = 0 in axes
+    if is_leading_axis_reduced and (combining_ufunc is None or set(kwargs) - {'dtype'}):
+        # kwargs like `initial` and `where` do not apply to the combination of the chunks
+        return func(data, axis=axis, keepdims=keepdims, **kwargs)
+
+    chunk_length = _get_chunk_length(data.shape, data.itemsize)
+    result = None
+    for start in range(0, data.shape[0], chunk_length):
+        chunk = slice(start, start + chunk_length)
+        if is_leading_axis_reduced:
+            chunk_result = func(data[chunk], axis=axes, keepdims=True, **kwargs)
+            result = chunk_result if result is None else combining_ufunc(result, chunk_result)
+        else:
+            chunk_result = np.asarray(func(data[chunk], axis=axis, keepdims=keepdims, **kwargs))
+            if result is None:
+                shape = (data.shape[0], ) + chunk_result.shape[1:]
+                result = create_memory_mapped_array(shape, chunk_result.dtype)
+            result[chunk] = chunk_result
+
+    if is_leading_axis_reduced and not keepdims:
+        result = np.squeeze(result, axis=axes)
+        if result.ndim == 0:
+            result = result[()]
+    return result
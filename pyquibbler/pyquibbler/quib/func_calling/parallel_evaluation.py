@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional, List, Any, Callable, Tuple
+
+from pyquibbler.cache import CacheStatus
+from pyquibbler.path import Path
+from pyquibbler.quib.async_get_value import get_executor
+from pyquibbler.quib.get_value_context_manager import get_value_context, get_value_context_pass_quibs
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from pyquibbler.quib.quib import Quib
+
+
+@dataclass
+class _Outcome:
+    value: Any = None
+    exception: Optional[BaseException] = None
+
+    def get(self) -> Any:
+        if self.exception is not None:
+            raise self.exception
+        return self.value
+
+
+def _run_to_outcome(task: Callable[[], Any]) -> _Outcome:
+    try:
+        return _Outcome(value=task())
+    except Exception as e:
+        return _Outcome(exception=e)
+
+
+def is_worth_evaluating_in_parallel(quib: Quib) -> bool:
+    """
+    Only quibs known not to create graphics can be calculated outside the main thread,
+    and there is nothing to gain from calculating quibs with a fully valid cache.
+    """
+    return quib.is_graphics is False and quib.cache_status != CacheStatus.ALL_VALID
+
+
+def run_tasks_concurrently(tasks: List[Callable[[], Any]]) -> List[_Outcome]:
+    """
+    Run the tasks concurrently: all tasks but the first are submitted to the executor, the first is run in the
+    calling thread.
+
+    Tasks that no worker has started by the time the calling thread needs them are run by the calling thread itself.
+    A thread waiting for its tasks thereby never waits for a free worker, so nested parallel evaluations
+    (tasks that themselves run tasks concurrently) cannot starve the executor.
+    """
+    futures: List[Future] = [get_executor().submit(_run_to_outcome, task) for task in tasks[1:]]
+    outcomes = [_run_to_outcome(tasks[0])]
+    for future, task in zip(futures, tasks[1:]):
+        outcomes.append(_run_to_outcome(task) if future.cancel() else future.result())
+    return outcomes
+
+
+def get_values_valid_at_paths(quibs_and_paths: List[Tuple[Quib, Optional[Path]]]) -> List[Any]:
+    """
+    Get the values of the given quibs, valid at their respective paths.
+
+    Quibs worth calculating in parallel are calculated concurrently; the rest are calculated in the calling thread.
+    Shared upstream quibs are calculated once: the cache lock of each quib serializes its calculation, and threads
+    requesting it while it is being calculated wait, and then find its cache valid.
+
+    If any of the calculations fails, the exception of the first failing quib (in order) is raised,
+    as it would have been when calculating the quibs one after the other.
+    """
+    pass_quibs = get_value_context_pass_quibs()
+
+    def _get_value_valid_at_path(quib: Quib, path: Optional[Path]) -> Any:
+        # worker threads calculate within the get-value context of the calling thread:
+        with nullcontext() if pass_quibs is None else get_value_context(pass_quibs):
+            return quib.get_value_valid_at_path(path)
+
+    parallel_indices = [index for index, (quib, _) in enumerate(quibs_and_paths)
+                        if is_worth_evaluating_in_parallel(quib)]
+    parallel_outcomes = {}
+    if len(parallel_indices) > 1:
+        tasks = [partial(_get_value_valid_at_path, *quibs_and_paths[index]) for index in parallel_indices]
+        parallel_outcomes = dict(zip(parallel_indices, run_tasks_concurrently(tasks)))
+
+    values = []
+    for index, (quib, path) in enumerate(quibs_and_paths):
+        outcome = parallel_outcomes.get(index)
+        values.append(quib.get_value_valid_at_path(path) if outcome is None else outcome.get())
+    return values
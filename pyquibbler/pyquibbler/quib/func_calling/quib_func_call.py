@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import numpy as np
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 # types:
 from typing import Optional, Type, Dict, Callable, Any, List, Union
@@ -21,8 +21,15 @@ from pyquibbler.cache import Cache
 from pyquibbler.path import Path
 from pyquibbler.type_translation.run_conditions import TypeTranslateRunCondition
 from pyquibbler.type_translation.translate import translate_type
+from pyquibbler.shape_translation.translate import translate_shape
 from pyquibbler.utilities.multiple_instance_runner import NoRunnerWorkedException
 
+# threading
+from pyquibbler.utilities.deferring_lock import DeferringRLock
+
+# profiling
+from .quib_stats import QuibStats
+
 from .utils import create_array_from_func, get_shape_from_result
 
 
@@ -40,7 +47,11 @@ class QuibFuncCall(FuncCall):
     _caching: bool = False
     result_type: Optional[Type] = None
     result_shape: Optional[Shape] = None
+    inferred_result_shape: Optional[Shape] = None
+    result_dtype: Optional[np.dtype] = None
     cache_mode: CacheMode = None
+    cache_lock: DeferringRLock = field(default_factory=DeferringRLock)
+    stats: QuibStats = field(default_factory=QuibStats)
 
     SOURCE_OBJECT_TYPE = Quib
 
@@ -109,19 +120,36 @@ class QuibFuncCall(FuncCall):
                                                       func_definition=self.func_definition,
                                                       data_arguments_types=self._get_data_argument_types())
                 except NoRunnerWorkedException:
-                    # we must call teh function to update the type:
-                    self.run([None])
+                    if self._infer_shape():
+                        # shape translators only translate calls returning arrays
+                        self.result_type = np.ndarray
+                    else:
+                        # we must call teh function to update the type:
+                        self.run([None])
 
     def get_shape(self) -> Shape:
         """
         Get the shape of the result value.
         """
-        if self.result_shape is None:
+        if self.result_shape is None and self.inferred_result_shape is None:
             self._calculate_shape()
-        return self.result_shape
+        return self.result_shape if self.result_shape is not None else self.inferred_result_shape
+
+    def _infer_shape(self) -> bool:
+        """
+        Try getting the shape of the result from the shapes of the arguments, without calling the function.
+        result_shape remains None, as the function was not evaluated.
+        """
+        if self.inferred_result_shape is None and self.func_definition.result_shape_translators:
+            try:
+                self.inferred_result_shape = translate_shape(func_call=self)
+            except NoRunnerWorkedException:
+                pass
+        return self.inferred_result_shape is not None
 
     def _calculate_shape(self):
-        self.run([None])  # this will update the shape
+        if not self._infer_shape():
+            self.run([None])  # this will update the shape
 
     def get_ndim(self) -> int:
         """
@@ -132,6 +160,7 @@ class QuibFuncCall(FuncCall):
     def _update_shape_and_type_from_result(self, result):
         self.result_type = type(result)
         self.result_shape = get_shape_from_result(result)
+        self.result_dtype = result.dtype if isinstance(result, np.ndarray) else None
 
     @property
     def created_graphics(self) -> bool:
@@ -146,6 +175,8 @@ class QuibFuncCall(FuncCall):
         self.method_cache.clear()
         self.result_type = None
         self.result_shape = None
+        self.inferred_result_shape = None
+        self.result_dtype = None
 
     def invalidate_cache_at_path(self, path: Path):
         pass
@@ -153,12 +184,21 @@ class QuibFuncCall(FuncCall):
     def get_result_metadata(self) -> Dict:
         return {}
 
+    def get_stats(self) -> QuibStats:
+        """
+        Get a snapshot of the profiling statistics, including the current size of the cache.
+        """
+        return replace(self.stats, cached_bytes=0 if self.cache is None else self.cache.get_nbytes())
+
     def _run(self, valid_paths: List[Union[None, Path]]) -> Any:
         pass
 
     def run(self, valid_paths: List[Union[None, Path]]) -> Any:
-        result = self._run(valid_paths)
-        self._update_shape_and_type_from_result(result)
+        # Invalidations arriving from other threads while we run are deferred by the lock and applied
+        # once we are done, so that they are not overwritten by our (possibly outdated) result.
+        with self.cache_lock:
+            result = self._run(valid_paths)
+            self._update_shape_and_type_from_result(result)
         return result
 
 
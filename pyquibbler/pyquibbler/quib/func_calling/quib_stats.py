@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Optional
+
+
+@dataclass
+class QuibStats:
+    """
+    Profiling statistics of a quib.
+
+    The statistics are collected at all times (with low overhead) and are accumulated from the creation of the quib,
+    or from the last reset of its function call.
+
+    See Also
+    --------
+    Quib.stats, Project.get_profile
+    """
+
+    num_evaluations: int = 0
+    "Number of times the function of the quib was called."
+
+    total_evaluation_time: float = 0.
+    "Total time (sec) spent in calls to the function of the quib."
+
+    last_evaluation_time: Optional[float] = None
+    "Time (sec) of the last call to the function of the quib (None if never called)."
+
+    translation_time: float = 0.
+    "Total time (sec) spent translating paths between the quib and its sources."
+
+    override_time: float = 0.
+    "Total time (sec) spent applying overrides to the value of the quib."
+
+    cache_hits: int = 0
+    "Number of value requests that were served entirely from the cache."
+
+    cache_misses: int = 0
+    "Number of value requests that required calling the function of the quib."
+
+    cached_bytes: int = 0
+    "Current size (bytes) of the cache of the quib."
+
+    num_array_allocations: int = 0
+    "Number of evaluations that allocated a new array for their result."
+
+    num_in_place_evaluations: int = 0
+    "Number of evaluations that wrote their array result in-place, into an existing array."
+
+    @property
+    def cache_hit_rate(self) -> Optional[float]:
+        """
+        The fraction of value requests served entirely from the cache (None if the value was never requested).
+        """
+        num_requests = self.cache_hits + self.cache_misses
+        return None if num_requests == 0 else self.cache_hits / num_requests
+
+    def add_evaluation(self, elapsed_seconds: float):
+        self.num_evaluations += 1
+        self.total_evaluation_time += elapsed_seconds
+        self.last_evaluation_time = elapsed_seconds
+
+    def add_translation(self, elapsed_seconds: float):
+        self.translation_time += elapsed_seconds
+
+    def add_override(self, elapsed_seconds: float):
+        self.override_time += elapsed_seconds
+
+    def add_result_array(self, is_in_place: bool):
+        if is_in_place:
+            self.num_in_place_evaluations += 1
+        else:
+            self.num_array_allocations += 1
+
+    def add_cache_request(self, is_hit: bool):
+        if is_hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    @classmethod
+    def get_field_names(cls):
+        return [field.name for field in fields(cls)]
+
+    def __str__(self):
+        hit_rate = self.cache_hit_rate
+        hit_rate_str = '' if hit_rate is None else f', {hit_rate:.0%} cache hits'
+        return f'{self.num_evaluations} evaluations ({self.total_evaluation_time * 1000:.3g} ms)' \
+               f'{hit_rate_str}, {self.cached_bytes} bytes cached'
@@ -1,22 +1,31 @@
+import threading
 from contextlib import contextmanager
 from typing import Optional
 
-GET_VALUE_CONTEXT_PASS_QUIBS: Optional[bool] = None
+
+class _GetValueContext(threading.local):
+    """
+    The get-value context is kept per thread, so that quibs evaluated in background threads
+    do not interfere with the context of the main thread (and vice versa).
+    """
+    pass_quibs: Optional[bool] = None
+
+
+GET_VALUE_CONTEXT = _GetValueContext()
 
 
 def reset_all_get_value_context():
     """
     Reset all global variables to their initial state
     """
-    global GET_VALUE_CONTEXT_PASS_QUIBS
-    GET_VALUE_CONTEXT_PASS_QUIBS = None
+    GET_VALUE_CONTEXT.pass_quibs = None
 
 
 def is_reset_all_get_value_context() -> bool:
     """
     Check if all the global variables are in their initial state
     """
-    return GET_VALUE_CONTEXT_PASS_QUIBS is None
+    return GET_VALUE_CONTEXT.pass_quibs is None
 
 
 @contextmanager
@@ -25,20 +34,19 @@ def get_value_context(pass_quibs: bool = False):
     Change IS_WITHIN_GET_VALUE_CONTEXT while in the process of running get_value.
     This has to be a static method as the IS_WITHIN_GET_VALUE_CONTEXT is a global state for all quib types
     """
-    global GET_VALUE_CONTEXT_PASS_QUIBS
-    if GET_VALUE_CONTEXT_PASS_QUIBS is not None:
+    if GET_VALUE_CONTEXT.pass_quibs is not None:
         yield
     else:
-        GET_VALUE_CONTEXT_PASS_QUIBS = pass_quibs
+        GET_VALUE_CONTEXT.pass_quibs = pass_quibs
         try:
             yield
         finally:
-            GET_VALUE_CONTEXT_PASS_QUIBS = None
+            GET_VALUE_CONTEXT.pass_quibs = None
 
 
 def is_within_get_value_context() -> bool:
-    return GET_VALUE_CONTEXT_PASS_QUIBS is not None
+    return GET_VALUE_CONTEXT.pass_quibs is not None
 
 
 def get_value_context_pass_quibs() -> Optional[bool]:
-    return GET_VALUE_CONTEXT_PASS_QUIBS
+    return GET_VALUE_CONTEXT.pass_quibs
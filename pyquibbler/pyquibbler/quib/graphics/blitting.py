@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import weakref
+from typing import List, Iterable, Optional, Tuple
+
+from matplotlib.artist import Artist
+from matplotlib.backend_bases import FigureCanvasBase
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from pyquibbler.quib.quib import Quib
+
+
+class DragBlitter:
+    """
+    Redraws only the artists of the graphics quibs affected by a drag, blitting them over a cached background.
+
+    Upon start, the artists are marked animated, so that full draws of the canvas leave them out, and the background
+    is captured after each full draw. Each redraw then restores the background and draws just the animated artists.
+    Artists re-created by re-evaluation of their graphics quibs are marked animated as they are drawn.
+
+    If the view limits of any of the axes change (for example, by autoscaling), the background is outdated, and the
+    canvas is fully drawn again.
+    """
+
+    def __init__(self, canvas: FigureCanvasBase, graphics_quibs: Iterable[Quib]):
+        self.canvas = canvas
+        self._graphics_quibs: weakref.WeakSet[Quib] = weakref.WeakSet(graphics_quibs)
+        self._background = None
+        self._view_limits: Optional[Tuple] = None
+        self._draw_event_id: Optional[int] = None
+
+    def _get_artists(self) -> List[Artist]:
+        figure = self.canvas.figure
+        return [artist for quib in self._graphics_quibs for artist in quib.handler.get_artists()
+                if artist.figure is figure]
+
+    def _get_view_limits(self) -> Tuple:
+        return tuple(tuple(axes.viewLim.bounds) for axes in self.canvas.figure.axes)
+
+    def _draw_animated_artists(self, artists: List[Artist]):
+        figure = self.canvas.figure
+        for artist in artists:
+            artist.set_animated(True)
+            figure.draw_artist(artist)
+
+    def _on_draw(self, _event=None):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._view_limits = self._get_view_limits()
+        self._draw_animated_artists(self._get_artists())
+
+    def start(self):
+        for artist in self._get_artists():
+            artist.set_animated(True)
+        self._draw_event_id = self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.draw()
+
+    def blit(self):
+        if self._background is None or self._get_view_limits() != self._view_limits:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_animated_artists(self._get_artists())
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def stop(self):
+        if self._draw_event_id is not None:
+            self.canvas.mpl_disconnect(self._draw_event_id)
+            self._draw_event_id = None
+        for artist in self._get_artists():
+            artist.set_animated(False)
+        self.canvas.draw_idle()
+
+
+CANVASES_TO_DRAG_BLITTERS: weakref.WeakKeyDictionary[FigureCanvasBase, DragBlitter] = weakref.WeakKeyDictionary()
+
+
+def get_drag_blitter(canvas: FigureCanvasBase) -> Optional[DragBlitter]:
+    return CANVASES_TO_DRAG_BLITTERS.get(canvas)
+
+
+def start_drag_blitting(canvas: FigureCanvasBase, graphics_quibs: Iterable[Quib]):
+    """
+    Start blitting the artists of the given graphics quibs upon redraws of the canvas
+    (if the canvas supports blitting).
+    """
+    stop_drag_blitting(canvas)
+    if not canvas.supports_blit:
+        return
+    blitter = DragBlitter(canvas, graphics_quibs)
+    CANVASES_TO_DRAG_BLITTERS[canvas] = blitter
+    blitter.start()
+
+
+def stop_drag_blitting(canvas: FigureCanvasBase):
+    """
+    Stop blitting, and fully draw the canvas.
+    """
+    blitter = CANVASES_TO_DRAG_BLITTERS.pop(canvas, None)
+    if blitter is not None:
+        blitter.stop()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray, ArrayLike
+
+from pyquibbler.utilities.basic_types import StrEnum
+
+
+DECIMATE_KWARG = 'quibbler_decimate'
+
+
+class DecimationMethod(StrEnum):
+    """
+    Methods for decimating the data of lines with more points than the pixels of their axes.
+
+    See Also
+    --------
+    Project.viewport_evaluation
+    """
+
+    MINMAX = 'minmax'
+    "Keep the minimum and the maximum points within each pixel column (``'minmax'``)."
+
+    LTTB = 'lttb'
+    "Keep the points preserving the visual shape of the line, by Largest-Triangle-Three-Buckets (``'lttb'``)."
+
+
+def get_minmax_decimation_indices(y: ArrayLike, num_bins: int) -> NDArray[np.intp]:
+    """
+    Return the sorted indices of the minimum and the maximum of `y` within each of `num_bins` consecutive bins,
+    together with the indices of its first and last elements.
+
+    Plotting the elements at these indices draws the same envelope as plotting all the elements, when each bin is
+    narrower than a pixel.
+    """
+    y = np.asarray(y)
+    num_points = len(y)
+    if num_points <= 2 * num_bins:
+        return np.arange(num_points)
+
+    bin_size = -(-num_points // num_bins)
+    num_full_bins = -(-num_points // bin_size)
+    # We pad the last bin with its last element, so that its minimum and maximum remain the same:
+    padded_y = np.empty(num_full_bins * bin_size, dtype=y.dtype)
+    padded_y[:num_points] = y
+    padded_y[num_points:] = y[-1]
+    binned_y = padded_y.reshape((num_full_bins, bin_size))
+    bin_starts = np.arange(0, num_points, bin_size)
+    indices = np.concatenate([
+        [0, num_points - 1],
+        bin_starts + np.argmin(binned_y, axis=1),
+        bin_starts + np.argmax(binned_y, axis=1),
+    ])
+    return np.unique(np.minimum(indices, num_points - 1))
+
+
+def get_lttb_decimation_indices(x: Optional[ArrayLike], y: ArrayLike, num_points_out: int) -> NDArray[np.intp]:
+    """
+    Return the sorted indices of `num_points_out` points of the line (`x`, `y`), chosen by the
+    Largest-Triangle-Three-Buckets algorithm: the first and last points are kept, and the other points are divided
+    into consecutive buckets, from each of which we keep the point forming the largest triangle with the point kept
+    from the previous bucket and the average of the points of the next bucket.
+
+    `x` can be None, for a line whose x-values are its indices.
+    """
+    y = np.asarray(y, dtype=float)
+    num_points = len(y)
+    if num_points <= num_points_out or num_points_out < 3:
+        return np.arange(num_points)
+    x = np.arange(num_points, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # The boundaries of the buckets of the inner points, followed by a last bucket of the last point:
+    bucket_edges = np.append(np.linspace(1, num_points - 1, num_points_out - 1).astype(np.intp), num_points)
+    indices = np.empty(num_points_out, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = num_points - 1
+    for bucket in range(num_points_out - 2):
+        start, stop, next_stop = bucket_edges[bucket:bucket + 3]
+        next_x = np.mean(x[stop:next_stop])
+        next_y = np.mean(y[stop:next_stop])
+        previous_x = x[indices[bucket]]
+        previous_y = y[indices[bucket]]
+        double_areas = np.abs((previous_x - next_x) * (y[start:stop] - previous_y)
+                              - (previous_x - x[start:stop]) * (next_y - previous_y))
+        indices[bucket + 1] = start + np.argmax(double_areas)
+    return indices
@@ -3,19 +3,21 @@ from __future__ import annotations
 import weakref
 from contextlib import contextmanager
 from threading import Lock
-from typing import Optional, Tuple, Callable, Union
+from typing import Optional, Tuple, Callable, Union, Set
 
 from matplotlib.artist import Artist
 from matplotlib.backend_bases import MouseEvent, PickEvent, MouseButton, FigureCanvasBase
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
+from pyquibbler.assignment import OverrideGroup
 from pyquibbler.debug_utils.timer import timeit
-from pyquibbler.env import END_DRAG_IMMEDIATELY
+from pyquibbler.env import END_DRAG_IMMEDIATELY, BLIT_WHILE_DRAGGING
 from .enhance_pick_event import EnhancedPickEventWithFuncArgsKwargs
 
 from .. import artist_wrapper
 from ..artist_wrapper import clear_all_quibs
+from ..blitting import start_drag_blitting, stop_drag_blitting
 from ..redraw import end_dragging, start_dragging
 from ..event_handling import graphics_inverse_assigner
 from ..graphics_assignment_mode import graphics_assignment_mode
@@ -65,6 +67,8 @@ class CanvasEventHandler:
         self._assignment_lock = Lock()
         self._handler_ids = []
         self._original_destroy = None
+        self._axes_with_tracked_limits: weakref.WeakSet[Axes] = weakref.WeakSet()
+        self._blitted_quibs: Optional[weakref.WeakSet[Quib]] = None
 
         self.EVENT_HANDLERS = {
             'button_press_event': self._handle_button_press,
@@ -90,6 +94,8 @@ class CanvasEventHandler:
 
     def _handle_button_release(self, _mouse_event: MouseEvent):
         end_dragging(id(self))
+        stop_drag_blitting(self.canvas)
+        self._blitted_quibs = None
         self.enhanced_pick_event = None
 
     def _handle_pick_event(self, pick_event: PickEvent):
@@ -99,6 +105,29 @@ class CanvasEventHandler:
             if not self._call_object_rightclick_callback_if_exists(pick_event.artist, pick_event.mouseevent):
                 self._inverse_from_mouse_event(pick_event.mouseevent)
 
+    @staticmethod
+    def _get_graphics_quibs_affected_by_override_group(override_group: OverrideGroup) -> Set[Quib]:
+        """
+        The graphics quibs downstream of the quibs that the override group assigns to
+        (the targets of the inverse assignment of the drag).
+        """
+        quibs = set()
+        for quib_change in override_group:
+            quibs.add(quib_change.quib)
+            quibs |= quib_change.quib.project.dependency_graph_index.get_descendants(quib_change.quib)
+        return {quib for quib in quibs if quib.is_graphics_quib}
+
+    def _blit_graphics_quibs_affected_by_override_group(self, override_group: OverrideGroup):
+        """
+        Start blitting the graphics quibs affected by the drag, once we know which quibs it assigns to
+        (re-starting if a later motion assigns to other quibs).
+        """
+        quibs = self._get_graphics_quibs_affected_by_override_group(override_group)
+        if self._blitted_quibs is not None and quibs <= self._blitted_quibs:
+            return
+        self._blitted_quibs = weakref.WeakSet(quibs | set(self._blitted_quibs or ()))
+        start_drag_blitting(self.canvas, self._blitted_quibs)
+
     def _inverse_assign_graphics(self, mouse_event: MouseEvent):
         """
         Reverse any relevant quibs in artists creation args
@@ -112,7 +141,9 @@ class CanvasEventHandler:
         with timeit("motion_notify", "motion notify"), graphics_assignment_mode(mouse_event.inaxes):
             graphics_inverse_assigner.inverse_assign_drawing_func(
                 mouse_event=mouse_event,
-                enhanced_pick_event=enhanced_pick_event)
+                enhanced_pick_event=enhanced_pick_event,
+                on_override_group=self._blit_graphics_quibs_affected_by_override_group
+                if BLIT_WHILE_DRAGGING and enhanced_pick_event.button is not MouseButton.RIGHT else None)
 
     def _inverse_assign_axis_limits(self,
                                     drawing_func: Callable,
@@ -186,6 +217,27 @@ class CanvasEventHandler:
         self._delete_all_graphics_quibs()
         self.CANVASES_TO_TRACKERS.pop(self.canvas, None)
 
+    def track_axes_limits(self, ax: Axes):
+        """
+        Re-evaluate the viewport-dependent graphics quibs of the axes upon changes of its limits
+        (by drag_pan, zoom, or set_xlim, set_ylim).
+        """
+        if ax in self._axes_with_tracked_limits:
+            return
+        self._axes_with_tracked_limits.add(ax)
+        ax.callbacks.connect('xlim_changed', self._handle_axes_limits_change)
+        ax.callbacks.connect('ylim_changed', self._handle_axes_limits_change)
+
+    @staticmethod
+    def _handle_axes_limits_change(ax: Axes):
+        from pyquibbler.quib.func_calling.func_calls.known_graphics.viewport_call import ViewportGraphicsQuibFuncCall
+        quibs = {artist_wrapper.get_creating_quib(artist) for artist in ax.get_children()}
+        for quib in quibs:
+            if quib is not None \
+                    and isinstance(quib.handler.quib_function_call, ViewportGraphicsQuibFuncCall) \
+                    and quib.handler.quib_function_call.is_viewport_changed():
+                quib.handler.invalidate_self([])
+
     def handle_axes_drag_pan(self, ax: Axes, drawing_func: Callable, lim: Tuple[float, float]):
         """
         This method is called by the overridden set_xlim, set_ylim
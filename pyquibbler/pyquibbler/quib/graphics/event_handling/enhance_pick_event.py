@@ -13,6 +13,7 @@ from pyquibbler.function_definitions import FuncArgsKwargs
 from pyquibbler.quib.types import PointArray
 from pyquibbler.quib.graphics import artist_wrapper
 
+from .spatial_index import get_up_to_date_pixel_grid_index
 from .utils import get_closest_point_on_line
 
 
@@ -39,7 +40,12 @@ def _return_closest_point(pick_event: PickEvent, xy_data):
     Pick the closest point to the mouse
     """
     inds = pick_event.ind
-    distances = _get_mouse_distance_to_points(pick_event.artist.axes, pick_event.mouseevent, xy_data[inds, :])
+    pixel_grid_index = get_up_to_date_pixel_grid_index(pick_event.artist)
+    if pixel_grid_index is None:
+        distances = _get_mouse_distance_to_points(pick_event.artist.axes, pick_event.mouseevent, xy_data[inds, :])
+    else:
+        # The pixel coordinates of the points are already known from hit-testing the pick:
+        distances = pixel_grid_index.get_distances(inds, pick_event.mouseevent.x, pick_event.mouseevent.y)
     ind = inds[np.argmin(distances)]
     return [ind], xy_data, False
 
@@ -1,5 +1,5 @@
 import warnings
-from typing import Callable, List, Any, Tuple
+from typing import Callable, List, Any, Tuple, Optional
 from matplotlib.backend_bases import MouseEvent, PickEvent
 
 from pyquibbler.assignment import AssignmentToQuib, OverrideGroup
@@ -27,9 +27,11 @@ def graphics_inverse_assigner(graphics_func_names_to_handle: List[str]):
 
 def inverse_assign_drawing_func(enhanced_pick_event: EnhancedPickEventWithFuncArgsKwargs,
                                 mouse_event: MouseEvent,
+                                on_override_group: Optional[Callable[[OverrideGroup], None]] = None,
                                 ):
     """
-    Reverse a graphics function quib, assigning to all it's arguments values based on pick event and mouse event
+    Reverse a graphics function quib, assigning to all it's arguments values based on pick event and mouse event.
+    `on_override_group` is called with the override group before it is applied.
     """
     assert enhanced_pick_event is not None
     func_args_kwargs = enhanced_pick_event.func_args_kwargs
@@ -46,6 +48,8 @@ def inverse_assign_drawing_func(enhanced_pick_event: EnhancedPickEventWithFuncAr
     except AssignmentCancelledByUserException:
         pass
     else:
+        if on_override_group is not None:
+            on_override_group(override_group)
         override_group.apply()
 
 
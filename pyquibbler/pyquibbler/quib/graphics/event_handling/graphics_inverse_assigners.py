@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from dataclasses import replace
+
 from matplotlib.backend_bases import MouseEvent
 from pyquibbler.assignment import OverrideGroup
 from .enhance_pick_event import EnhancedPickEventWithFuncArgsKwargs
@@ -21,6 +23,10 @@ def get_override_group_for_axes_plot(enhanced_pick_event: EnhancedPickEventWithF
     artist_index = enhanced_pick_event.artist._index_in_plot
     data_number, data_index = \
         get_data_number_and_index_from_artist_index(args, x_arg_indices, y_arg_indices, artist_index)
+    index_map = getattr(enhanced_pick_event.artist, '_index_map_in_plot', None)
+    if index_map is not None:
+        # The line shows decimated data. We map the picked points to the data indices:
+        enhanced_pick_event = replace(enhanced_pick_event, ind=index_map[enhanced_pick_event.ind])
     x_arg_index = x_arg_indices[data_number]
     y_arg_index = y_arg_indices[data_number]
     x_arg = None if x_arg_index is None else args[x_arg_index]
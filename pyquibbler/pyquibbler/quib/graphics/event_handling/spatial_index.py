@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import math
+from numbers import Number
+from typing import Optional, Tuple, Any
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.collections import PathCollection
+from matplotlib.lines import Line2D
+from matplotlib.transforms import Transform
+from numpy.typing import NDArray
+
+from pyquibbler.env import PIXEL_INDEX_MIN_NUM_POINTS
+from pyquibbler.utilities.numpy_original_functions import np_concatenate
+
+# The hit-test used by `Collection.contains`. It is private to matplotlib, so if it is missing, or fails, path
+# collections are hit-tested by their own `contains`:
+try:
+    from matplotlib._path import point_in_path_collection
+except ImportError:
+    point_in_path_collection = None
+
+PIXEL_GRID_INDEX_NAME = '_quibbler_pixel_grid_index'
+
+# Pixel coordinates are clipped to this range (points beyond it are far outside the canvas anyway):
+MAX_PIXEL_COORDINATE = 1e9
+
+
+class PixelGridIndex:
+    """
+    A grid index over the pixel coordinates of the points of an artist, for finding the points near the mouse
+    without scanning all the points.
+
+    The points are sorted by the grid cell in which they lie (row by row), so the points within each row of cells
+    spanned by a query are found by binary search.
+    Queries use ndarray methods and operators, rather than the quib-supporting numpy functions.
+    """
+
+    def __init__(self, xy_pixels: NDArray[float], cell_size: float):
+        self.xy_pixels = xy_pixels
+        self.cell_size = cell_size
+
+        indices = np.flatnonzero(np.all(np.isfinite(xy_pixels), axis=1))
+        cells = np.floor(np.clip(xy_pixels[indices], -MAX_PIXEL_COORDINATE, MAX_PIXEL_COORDINATE) / cell_size) \
+            .astype(np.int64)
+        if len(indices) > 0:
+            (self._min_column, self._min_row), (self._max_column, self._max_row) = \
+                cells.min(axis=0).tolist(), cells.max(axis=0).tolist()
+        else:
+            self._min_column, self._min_row, self._max_column, self._max_row = 0, 0, -1, -1
+        self._num_columns = self._max_column - self._min_column + 1
+        keys = (cells[:, 1] - self._min_row) * self._num_columns + (cells[:, 0] - self._min_column)
+        order = keys.argsort(kind='stable')
+        self._keys = keys[order]
+        self._indices = indices[order]
+
+    def _get_cell(self, coordinate: float) -> int:
+        return math.floor(min(max(coordinate, -MAX_PIXEL_COORDINATE), MAX_PIXEL_COORDINATE) / self.cell_size)
+
+    def get_distances(self, indices: NDArray[np.intp], x: float, y: float) -> NDArray[float]:
+        """
+        The distances, in pixels, of the points at the given indices from the point (x, y).
+        """
+        dx = self.xy_pixels[indices, 0] - x
+        dy = self.xy_pixels[indices, 1] - y
+        return (dx * dx + dy * dy) ** 0.5
+
+    def get_candidate_indices(self, x: float, y: float, radius: float) -> NDArray[np.intp]:
+        """
+        The indices of the points in the grid cells overlapping the square of half-width `radius` around (x, y).
+        """
+        first_column = max(self._get_cell(x - radius), self._min_column) - self._min_column
+        last_column = min(self._get_cell(x + radius), self._max_column) - self._min_column
+        first_row = max(self._get_cell(y - radius), self._min_row) - self._min_row
+        last_row = min(self._get_cell(y + radius), self._max_row) - self._min_row
+        if first_column > last_column or first_row > last_row:
+            return self._indices[:0]
+
+        indices_in_rows = []
+        for row in range(first_row, last_row + 1):
+            start = self._keys.searchsorted(row * self._num_columns + first_column, side='left')
+            stop = self._keys.searchsorted(row * self._num_columns + last_column, side='right')
+            indices_in_rows.append(self._indices[start:stop])
+        return indices_in_rows[0] if len(indices_in_rows) == 1 else np_concatenate(indices_in_rows)
+
+    def get_indices_within_radius(self, x: float, y: float, radius: float) -> NDArray[np.intp]:
+        """
+        The indices of the points within `radius` pixels from the point (x, y), sorted from the closest.
+        """
+        indices = self.get_candidate_indices(x, y, radius)
+        distances = self.get_distances(indices, x, y)
+        is_within = distances <= radius
+        return indices[is_within][distances[is_within].argsort(kind='stable')]
+
+
+def _get_line_data_and_transform(artist: Line2D) -> Tuple[NDArray, Transform]:
+    return artist.get_xydata(), artist.get_transform()
+
+
+def _get_path_collection_data_and_transform(artist: PathCollection) -> Tuple[NDArray, Transform]:
+    return artist.get_offsets(), artist.get_offset_transform()
+
+
+ARTIST_TYPES_TO_GET_DATA_AND_TRANSFORM = {
+    Line2D: _get_line_data_and_transform,
+    PathCollection: _get_path_collection_data_and_transform,
+}
+
+
+def _get_data_and_transform(artist: Artist) -> Tuple[NDArray, Transform]:
+    if artist.axes is not None:
+        artist.axes.get_xlim()  # applies any pending autoscaling of the axes
+    return ARTIST_TYPES_TO_GET_DATA_AND_TRANSFORM[type(artist)](artist)
+
+
+def _get_transform_fingerprint(artist: Artist, transform: Transform) -> Tuple[Any, ...]:
+    """
+    A fingerprint of the mapping from data to pixels, which changes with the axes limits, position and size
+    (the affine part of the transform) and with the axes scales (the non-affine part).
+    """
+    ax = artist.axes
+    scales = () if ax is None else (ax.get_xscale(), ax.get_yscale())
+    return (transform.get_affine().get_matrix().tobytes(), *scales)
+
+
+def get_up_to_date_pixel_grid_index(artist: Artist) -> Optional[PixelGridIndex]:
+    """
+    Return the pixel grid index of the artist, if it was built for its current data and transform.
+    """
+    if type(artist) not in ARTIST_TYPES_TO_GET_DATA_AND_TRANSFORM or not hasattr(artist, PIXEL_GRID_INDEX_NAME):
+        return None
+    indexed_data, indexed_fingerprint, pixel_grid_index = getattr(artist, PIXEL_GRID_INDEX_NAME)
+    data, transform = _get_data_and_transform(artist)
+    if indexed_data is not data or indexed_fingerprint != _get_transform_fingerprint(artist, transform):
+        return None
+    return pixel_grid_index
+
+
+def get_or_create_pixel_grid_index(artist: Artist, cell_size: float) -> PixelGridIndex:
+    """
+    Return the pixel grid index of the artist, building it if its data or transform changed since it was built.
+    """
+    pixel_grid_index = get_up_to_date_pixel_grid_index(artist)
+    if pixel_grid_index is None:
+        data, transform = _get_data_and_transform(artist)
+        xy_pixels = transform.transform(np.ma.filled(np.ma.asarray(data, dtype=float), np.nan))
+        pixel_grid_index = PixelGridIndex(xy_pixels, max(cell_size, 1.))
+        setattr(artist, PIXEL_GRID_INDEX_NAME, (data, _get_transform_fingerprint(artist, transform), pixel_grid_index))
+    return pixel_grid_index
+
+
+def _get_line_hits(artist: Line2D, x: float, y: float) -> Optional[NDArray[np.intp]]:
+    """
+    The indices of the points of the line within its pick radius from (x, y), like `Line2D.contains`.
+    Returns None for lines with segments, which are hit-tested by `Line2D.contains` (segments can be hit far from
+    their points).
+    """
+    if artist.get_linestyle() not in ['None', None]:
+        return None
+    radius = artist.figure.dpi / 72. * artist.get_pickradius()
+    return get_or_create_pixel_grid_index(artist, radius).get_indices_within_radius(x, y, radius) + artist.ind_offset
+
+
+def _get_path_collection_hits(artist: PathCollection, x: float, y: float) -> Optional[NDArray[np.intp]]:
+    """
+    The indices of the markers of the collection containing (x, y), like `Collection.contains`.
+    We test only the markers near (x, y), within the pick radius plus the maximal marker radius.
+    Returns None if the markers cannot be hit-tested this way.
+    """
+    if point_in_path_collection is None:
+        return None
+    transform = artist.get_transform()
+    offset_trf = artist.get_offset_transform()
+    paths = artist.get_paths()
+    offsets = artist.get_offsets()
+    transforms = artist.get_transforms()
+    if not transform.is_affine or not offset_trf.is_affine or len(paths) == 0 or len(paths) > len(offsets):
+        return None
+    pickradius = float(artist.get_picker()) \
+        if isinstance(artist.get_picker(), Number) and artist.get_picker() is not True else artist.get_pickradius()
+
+    # An upper bound of the radius of the markers, in pixels (the norm of a 2x2 matrix is at most twice its largest
+    # element):
+    master_matrix = transform.get_matrix()
+    marker_transforms = transforms if len(transforms) > 0 else np.eye(3)[np.newaxis]
+    max_vertex_radius = max(float((path.vertices ** 2).sum(axis=1).max(initial=0.)) ** 0.5 for path in paths)
+    marker_radius = max_vertex_radius * 2 * float(abs(marker_transforms[:, :2, :2]).max()) \
+        + 2 ** 0.5 * float(abs(marker_transforms[:, :2, 2]).max())
+    marker_radius = marker_radius * 2 * float(abs(master_matrix[:2, :2]).max()) \
+        + 2 ** 0.5 * float(abs(master_matrix[:2, 2]).max())
+    radius = marker_radius + max(pickradius, 0.)
+
+    candidates = get_or_create_pixel_grid_index(artist, radius).get_indices_within_radius(x, y, radius)
+    if len(candidates) == 0:
+        return candidates
+    try:
+        ind = np.asarray(point_in_path_collection(
+            x, y, pickradius, transform.frozen(),
+            paths if len(paths) == 1 else [paths[i % len(paths)] for i in candidates],
+            transforms if len(transforms) <= 1 else transforms[candidates % len(transforms)],
+            np.ma.filled(np.ma.asarray(offsets, dtype=float)[candidates], np.nan), offset_trf.frozen(),
+            pickradius <= 0))
+        return candidates[ind.astype(np.intp, casting='safe')]
+    except Exception:
+        return None
+
+
+ARTIST_TYPES_TO_GET_HITS = {
+    Line2D: _get_line_hits,
+    PathCollection: _get_path_collection_hits,
+}
+
+
+def get_hits_using_pixel_grid_index(artist: Artist, mouseevent: MouseEvent) -> Optional[NDArray[np.intp]]:
+    """
+    The indices of the points of the artist hit by the mouse, sorted from the closest, using a grid index of the
+    pixel coordinates of the points. Returns None when the artist should be hit-tested by its own `contains`.
+    """
+    get_hits = ARTIST_TYPES_TO_GET_HITS.get(type(artist))
+    min_num_points = PIXEL_INDEX_MIN_NUM_POINTS.val
+    if get_hits is None or min_num_points is None \
+            or artist.figure is None or mouseevent.canvas is not artist.figure.canvas or not artist.get_visible() \
+            or mouseevent.x is None or mouseevent.y is None \
+            or len(ARTIST_TYPES_TO_GET_DATA_AND_TRANSFORM[type(artist)](artist)[0]) < min_num_points:
+        return None
+    return get_hits(artist, mouseevent.x, mouseevent.y)
@@ -16,6 +16,9 @@ class GraphicsUpdateType(StrEnum):
     DROP = 'drop'
     "Refresh at end of dragging, upon mouse drop (``'drop'``)."
 
+    BACKGROUND = 'background'
+    "Refresh as objects are dragged, showing the last graphics until calculated in background (``'background'``)."
+
     CENTRAL = 'central'
     "Do not refresh automatically; only refresh upon explicit `refresh_graphics` command (``'central'``)."
 
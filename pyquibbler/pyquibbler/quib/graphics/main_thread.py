@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from typing import Callable, Optional
+
+from pyquibbler.debug_utils import timeit
+
+PENDING_MAIN_THREAD_CALLS: queue.SimpleQueue[Callable[[], None]] = queue.SimpleQueue()
+
+
+def is_main_thread() -> bool:
+    return threading.current_thread() is threading.main_thread()
+
+
+def get_running_loop_or_none() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def call_in_main_thread(func: Callable[[], None], loop: Optional[asyncio.AbstractEventLoop] = None):
+    """
+    Call the given function in the main thread.
+
+    If called from the main thread, the function is called immediately. Otherwise, it is queued and called
+    by the main thread upon its next interaction with quibbler (any assignment, undo/redo, redraw),
+    or as soon as possible if an asyncio event loop is running in the main thread.
+    """
+    if is_main_thread():
+        func()
+        return
+
+    PENDING_MAIN_THREAD_CALLS.put(func)
+    if loop is not None and not loop.is_closed():
+        loop.call_soon_threadsafe(run_pending_main_thread_calls)
+
+
+def run_pending_main_thread_calls():
+    """
+    Run all functions that background threads have queued for the main thread.
+    """
+    if not is_main_thread() or PENDING_MAIN_THREAD_CALLS.empty():
+        return
+
+    from .redraw import aggregate_redraw_mode
+    with timeit("main_thread_calls", "running pending main-thread calls"), aggregate_redraw_mode():
+        while True:
+            try:
+                func = PENDING_MAIN_THREAD_CALLS.get_nowait()
+            except queue.Empty:
+                break
+            func()
@@ -3,14 +3,19 @@ from __future__ import annotations
 import contextlib
 import weakref
 
-from typing import Set, Dict, Optional
+from concurrent.futures import Future
+from time import perf_counter
+from typing import Set, Dict, Optional, List
+from matplotlib.backend_bases import FigureCanvasBase, TimerBase
 from matplotlib.figure import Figure
 from matplotlib.pyplot import fignum_exists as _fignum_exists
 from matplotlib._pylab_helpers import Gcf
 
 from pyquibbler.debug_utils import timeit
 
+from .blitting import get_drag_blitter
 from .graphics_update import GraphicsUpdateType
+from .main_thread import run_pending_main_thread_calls
 
 from typing import TYPE_CHECKING
 
@@ -27,11 +32,25 @@ def fignum_exists(fignum) -> bool:
 
 
 QUIBS_TO_REDRAW: Dict[GraphicsUpdateType, weakref.WeakSet[Quib]] = {GraphicsUpdateType.DRAG: weakref.WeakSet(),
-                                                                    GraphicsUpdateType.DROP: weakref.WeakSet()}
+                                                                    GraphicsUpdateType.DROP: weakref.WeakSet(),
+                                                                    GraphicsUpdateType.BACKGROUND: weakref.WeakSet()}
 QUIBS_THAT_NEED_TO_UPDATE_WIDGETS_TO_REFLECT_OVERRIDING_CHANGES: weakref.WeakSet[Quib] = weakref.WeakSet()
 IN_AGGREGATE_REDRAW_MODE = False
 IN_DRAGGING_BY: Optional[int] = None
 
+# Background redraws whose values are still being calculated, and the canvas timers polling for their completion:
+PENDING_BACKGROUND_REDRAWS: Set[Future] = set()
+BACKGROUND_POLLING_TIMERS: weakref.WeakKeyDictionary[FigureCanvasBase, TimerBase] = weakref.WeakKeyDictionary()
+BACKGROUND_POLLING_INTERVAL_MS = 20
+
+# Figures to redraw once the aggregate redraw mode ends (each canvas is then drawn once):
+FIGURES_TO_REDRAW: weakref.WeakSet[Figure] = weakref.WeakSet()
+
+# While dragging, canvases are drawn within a per-frame time budget. Canvases that do not fit within the budget,
+# and canvases that are not visible, are deferred to the event loop (draw_idle), which merges repeated requests.
+# None for drawing all canvases immediately.
+REDRAW_FRAME_BUDGET_SECONDS: Optional[float] = 1 / 30
+
 
 def reset_all_redraw():
     """
@@ -40,6 +59,9 @@ def reset_all_redraw():
     global IN_AGGREGATE_REDRAW_MODE, IN_DRAGGING_BY
     QUIBS_TO_REDRAW[GraphicsUpdateType.DRAG].clear()
     QUIBS_TO_REDRAW[GraphicsUpdateType.DROP].clear()
+    QUIBS_TO_REDRAW[GraphicsUpdateType.BACKGROUND].clear()
+    PENDING_BACKGROUND_REDRAWS.clear()
+    FIGURES_TO_REDRAW.clear()
     QUIBS_THAT_NEED_TO_UPDATE_WIDGETS_TO_REFLECT_OVERRIDING_CHANGES.clear()
     IN_AGGREGATE_REDRAW_MODE = False
     IN_DRAGGING_BY = None
@@ -51,6 +73,9 @@ def is_reset_all_redraw():
     """
     return (QUIBS_TO_REDRAW[GraphicsUpdateType.DRAG] == set() and
             QUIBS_TO_REDRAW[GraphicsUpdateType.DROP] == set() and
+            QUIBS_TO_REDRAW[GraphicsUpdateType.BACKGROUND] == set() and
+            PENDING_BACKGROUND_REDRAWS == set() and
+            FIGURES_TO_REDRAW == set() and
             QUIBS_THAT_NEED_TO_UPDATE_WIDGETS_TO_REFLECT_OVERRIDING_CHANGES == set() and
             IN_AGGREGATE_REDRAW_MODE is False and
             IN_DRAGGING_BY is None)
@@ -73,12 +98,16 @@ def aggregate_redraw_mode(temporarily: bool = False):
         IN_AGGREGATE_REDRAW_MODE = True
         try:
             yield
+            # values calculated in background threads are delivered to graphics quibs with the rest of the redraw:
+            run_pending_main_thread_calls()
         finally:
             IN_AGGREGATE_REDRAW_MODE = False
             if not temporarily:
-                _redraw_quibs_with_graphics(GraphicsUpdateType.DRAG)
+                figures = _reevaluate_quibs_with_graphics(GraphicsUpdateType.DRAG)
+                _redraw_quibs_with_graphics_in_background()
                 if not is_dragging():
-                    _redraw_quibs_with_graphics(GraphicsUpdateType.DROP)
+                    figures |= _reevaluate_quibs_with_graphics(GraphicsUpdateType.DROP)
+                redraw_figures(figures)
                 _update_pending_quib_widgets_to_reflect_overriding_changes()
 
 
@@ -134,7 +163,10 @@ def skip_canvas_draws(should_skip: bool = True):
             canvas_class.draw = original_canvas_draw
 
 
-def _redraw_quibs_with_graphics(graphics_update: GraphicsUpdateType):
+def _reevaluate_quibs_with_graphics(graphics_update: GraphicsUpdateType) -> Set[Figure]:
+    """
+    Reevaluate the graphics quibs pending redraw, and return the figures that need to be redrawn.
+    """
     quib_refs = QUIBS_TO_REDRAW[graphics_update]
     quibs = set(quib_refs)
     with timeit("quib redraw", f"redrawing {len(quib_refs)} quibs"), skip_canvas_draws():
@@ -142,9 +174,55 @@ def _redraw_quibs_with_graphics(graphics_update: GraphicsUpdateType):
             quib.handler.reevaluate_graphic_quib()
             quib_refs.remove(quib)
 
-    figures = {figure for quib in quibs for figure in quib.handler.get_figures() if figure is not None}
+    return {figure for quib in quibs for figure in quib.handler.get_figures() if figure is not None}
+
+
+def _redraw_quibs_with_graphics(graphics_update: GraphicsUpdateType):
+    redraw_figures(_reevaluate_quibs_with_graphics(graphics_update))
+
+
+def _poll_background_redraws_in_event_loop(canvas: FigureCanvasBase):
+    """
+    Background calculations deliver their values to the main thread. In an interactive session, the main thread
+    is running the event loop of the gui, so we use a timer of the canvas to poll for delivered values.
+    """
+    if canvas in BACKGROUND_POLLING_TIMERS:
+        return
 
-    redraw_figures(figures)
+    def _poll():
+        run_pending_main_thread_calls()
+        if all(future.done() for future in PENDING_BACKGROUND_REDRAWS):
+            PENDING_BACKGROUND_REDRAWS.clear()
+            timer = BACKGROUND_POLLING_TIMERS.pop(canvas, None)
+            if timer is not None:
+                timer.stop()
+
+    timer = canvas.new_timer(interval=BACKGROUND_POLLING_INTERVAL_MS)
+    timer.add_callback(_poll)
+    BACKGROUND_POLLING_TIMERS[canvas] = timer
+    timer.start()
+
+
+def _redraw_quibs_with_graphics_in_background():
+    """
+    Start calculating the values of the graphics quibs in the background. Their current graphics stay in place
+    until the new values are ready, and are then replaced (in the main thread).
+    If a quib is invalidated again before its new value is ready, its pending calculation is cancelled and its
+    (now outdated) value is never drawn.
+    """
+    quib_refs = QUIBS_TO_REDRAW[GraphicsUpdateType.BACKGROUND]
+    quibs = set(quib_refs)
+    if not quibs:
+        return
+    with timeit("quib redraw", f"starting background redraw of {len(quibs)} quibs"):
+        for quib in quibs:
+            quib_refs.remove(quib)
+            future = quib.get_value_future()
+            PENDING_BACKGROUND_REDRAWS.add(future)
+            future.add_done_callback(PENDING_BACKGROUND_REDRAWS.discard)
+            for figure in quib.handler.get_figures():
+                if figure is not None and fignum_exists(figure.number):
+                    _poll_background_redraws_in_event_loop(figure.canvas)
 
 
 def _update_pending_quib_widgets_to_reflect_overriding_changes():
@@ -157,12 +235,15 @@ def _update_pending_quib_widgets_to_reflect_overriding_changes():
 
 
 def redraw_quib_with_graphics_or_add_in_aggregate_mode(quib: Quib, graphics_update: GraphicsUpdateType):
-    if not (graphics_update == GraphicsUpdateType.DRAG or graphics_update == GraphicsUpdateType.DROP):
+    if graphics_update not in QUIBS_TO_REDRAW:
         return
 
     QUIBS_TO_REDRAW[graphics_update].add(quib)
     if not IN_AGGREGATE_REDRAW_MODE:
-        _redraw_quibs_with_graphics(graphics_update)
+        if graphics_update == GraphicsUpdateType.BACKGROUND:
+            _redraw_quibs_with_graphics_in_background()
+        else:
+            _redraw_quibs_with_graphics(graphics_update)
 
 
 def update_quib_widget_to_reflect_overriding_changes_or_add_in_aggregate_mode(quib: Quib):
@@ -175,6 +256,11 @@ def redraw_canvas(canvas):
     """
     Redraw a specified canvas
     """
+    blitter = get_drag_blitter(canvas)
+    if blitter is not None:
+        blitter.blit()
+        return
+
     canvas.draw()
 
     # old matplotlib:
@@ -190,11 +276,66 @@ def redraw_canvas(canvas):
     #     canvas.start_event_loop(0.001)
 
 
+def _is_canvas_visible(canvas: FigureCanvasBase) -> bool:
+    """
+    Whether the window of the canvas is shown.
+    Canvases whose visibility cannot be determined (like those of non-gui backends) are considered visible.
+    """
+    window = getattr(getattr(canvas, 'manager', None), 'window', None)
+    for is_visible_method_name in ('isVisible', 'winfo_viewable'):  # qt, tk
+        is_visible = getattr(window, is_visible_method_name, None)
+        if callable(is_visible):
+            try:
+                return bool(is_visible())
+            except Exception:
+                return True
+    return True
+
+
+def _get_dragged_canvas() -> Optional[FigureCanvasBase]:
+    from pyquibbler.quib.graphics.event_handling.canvas_event_handler import CanvasEventHandler
+    for canvas, event_handler in CanvasEventHandler.CANVASES_TO_TRACKERS.items():
+        if id(event_handler) == IN_DRAGGING_BY:
+            return canvas
+    return None
+
+
+def _get_canvases_in_drawing_order(figures: Set[Figure]) -> List[FigureCanvasBase]:
+    """
+    The canvas being dragged first, then visible canvases, then non-visible ones.
+    """
+    canvases = {figure.canvas for figure in figures if fignum_exists(figure.number)}
+    dragged_canvas = _get_dragged_canvas() if is_dragging() else None
+    return sorted(canvases, key=lambda canvas: (canvas is not dragged_canvas, not _is_canvas_visible(canvas)))
+
+
+def _draw_canvases_within_frame_budget(canvases: List[FigureCanvasBase]):
+    """
+    Draw the canvases, one after the other. While dragging, once the frame budget is used up (or for non-visible
+    canvases), drawing is deferred to the event loop, so that dragging stays responsive.
+    """
+    deadline = None if not is_dragging() or REDRAW_FRAME_BUDGET_SECONDS is None \
+        else perf_counter() + REDRAW_FRAME_BUDGET_SECONDS
+    for canvas in canvases:
+        if deadline is None or (perf_counter() < deadline and _is_canvas_visible(canvas)):
+            redraw_canvas(canvas)
+        else:
+            canvas.draw_idle()
+
+
 def redraw_figures(figures: Set[Figure]):
     """
     Actual redrawing of figure- this should be WITHOUT rendering anything except for the new artists
+
+    In aggregate redraw mode, figures are only marked for redraw. All the marked figures are drawn together
+    at the end of the aggregate redraw mode, so that each canvas is drawn once.
     """
-    canvases = {figure.canvas for figure in figures if fignum_exists(figure.number)}
+    FIGURES_TO_REDRAW.update(figures)
+    if IN_AGGREGATE_REDRAW_MODE:
+        return
+
+    figures = set(FIGURES_TO_REDRAW)
+    FIGURES_TO_REDRAW.clear()
+    canvases = _get_canvases_in_drawing_order(figures)
     with timeit("redraw", f"redraw {len(figures)} figures"):
-        for canvas in canvases:
-            redraw_canvas(canvas)
+        _draw_canvases_within_frame_budget(canvases)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+from matplotlib.axes import Axes
+
+
+def get_axes_size_in_pixels(ax: Axes) -> Tuple[int, int]:
+    """
+    The width and height of the axes, in pixels of the figure (based on the figure size and dpi).
+    We use the original position of the axes, before it is shrunk to apply its aspect (which only happens upon draw).
+    """
+    bbox = ax.get_position(original=True).transformed(ax.figure.transFigure)
+    return max(1, int(bbox.width)), max(1, int(bbox.height))
+
+
+def get_visible_index_range(lim: Tuple[float, float], start: float, stop: float, num: int) -> Tuple[int, int]:
+    """
+    Return the range of the indices of `num` items, evenly spanning the data coordinates from `start` to `stop`,
+    that are visible within the axis limits `lim`.
+    At least one item is always included.
+    """
+    positions = (np.asarray(lim, dtype=float) - start) / (stop - start) * num
+    first = int(np.clip(np.floor(np.min(positions)), 0, num - 1))
+    last = int(np.clip(np.ceil(np.max(positions)), first + 1, num))
+    return first, last
+
+
+def get_visible_index_range_of_monotonic_data(lim: Tuple[float, float], data: np.ndarray) -> Tuple[int, int]:
+    """
+    Return the range of the indices of the elements of the non-decreasing `data` that are visible within the axis
+    limits `lim`, extended by one element at each side (so that lines connecting to elements outside the limits are
+    drawn).
+    """
+    first = np.searchsorted(data, np.min(lim), side='left') - 1
+    last = np.searchsorted(data, np.max(lim), side='right') + 1
+    return max(int(first), 0), min(int(last), len(data))
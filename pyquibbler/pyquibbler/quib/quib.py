@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import copy
 import pathlib
 import weakref
+from time import perf_counter
 
 import numpy as np
 
@@ -50,11 +52,14 @@ from pyquibbler.quib.external_call_failed_exception_handling import raise_quib_c
 from pyquibbler.quib.get_value_context_manager import get_value_context, is_within_get_value_context
 from pyquibbler.quib.quib_guard import guard_raise_if_not_allowed_access_to_quib, \
     CannotAccessQuibInScopeException
+from pyquibbler.quib.async_get_value import QuibValueFuture, get_value_future, cancel_value_future
+from pyquibbler.quib.graphics.main_thread import get_running_loop_or_none
 from pyquibbler.function_definitions import FuncArgsKwargs
 
 # Cache:
 from pyquibbler.cache import create_cache, CacheStatus
 from pyquibbler.quib.func_calling.cache_mode import CacheMode
+from pyquibbler.quib.func_calling.quib_stats import QuibStats
 
 # Translations and inversion:
 from pyquibbler.utilities.multiple_instance_runner import NoRunnerWorkedException
@@ -143,6 +148,7 @@ class QuibHandler:
         self._has_ever_called_get_value = has_ever_called_get_value
         self._widget: Optional[QuibWidget] = None
         self.callbacks: Set[Callable] = set()
+        self.value_future: Optional[QuibValueFuture] = None
 
     """
     relationships
@@ -178,6 +184,7 @@ class QuibHandler:
         """
         for parent in self.parents:
             parent.handler.add_child(self.quib)
+        self.project._on_graph_change(self.quib)
 
     def disconnect_from_parents(self):
         """
@@ -185,6 +192,7 @@ class QuibHandler:
         """
         for parent in self.parents:
             parent.handler.remove_child(self.quib)
+        self.project._on_graph_change(self.quib)
 
     def get_children(self, return_proxy_children: bool = False) -> Set[Quib]:
         if return_proxy_children:
@@ -218,6 +226,7 @@ class QuibHandler:
         value = self.quib.get_value()
         for callback in self.callbacks:
             callback(value)
+        return value
 
     def _iter_artist_lists(self) -> Iterable[List[Artist]]:
         return map(lambda g: g.artists, self.quib_function_call.flat_graphics_collections())
@@ -225,6 +234,9 @@ class QuibHandler:
     def _iter_artists(self) -> Iterable[Artist]:
         return (artist for artists in self._iter_artist_lists() for artist in artists)
 
+    def get_artists(self) -> List[Artist]:
+        return list(self._iter_artists())
+
     def get_figures(self):
         return {artist.figure for artist in self._iter_artists()}
 
@@ -232,18 +244,29 @@ class QuibHandler:
     Invalidation
     """
 
+    def _invalidate_quib_function_call(self, path: Path, invalidate_cache: bool):
+        if len(path) == 0:
+            self.quib_function_call.on_type_change()
+
+        if invalidate_cache:
+            self.quib_function_call.invalidate_cache_at_path(path)
+
     def invalidate_self(self, path: Path, invalidate_cache=True):
         """
         Invalidate the quib itself.
         """
-        if self.quib.is_graphics_quib:
-            redraw_quib_with_graphics_or_add_in_aggregate_mode(self.quib, self.actual_graphics_update)
+        is_graphics_quib = self.quib.is_graphics_quib
 
-        if len(path) == 0:
-            self.quib_function_call.on_type_change()
+        # If the quib is being calculated in another thread, the invalidation is applied once the calculation is done
+        self.quib_function_call.cache_lock.run_or_defer(
+            lambda: self._invalidate_quib_function_call(path, invalidate_cache))
 
-        if invalidate_cache:
-            self.quib_function_call.invalidate_cache_at_path(path)
+        # Cancel only after invalidating, so that calculations re-requested upon cancellation see the invalid cache
+        cancel_value_future(self.quib)
+
+        if is_graphics_quib:
+            redraw_quib_with_graphics_or_add_in_aggregate_mode(self.quib, self.actual_graphics_update)
+            self.project.schedule_prefetch(self.quib)
 
     def _invalidate_and_redraw_at_path(self, path: Optional[Path] = None) -> None:
         """
@@ -304,18 +327,22 @@ class QuibHandler:
                                     if quib is invalidator_quib]
 
         invalidation_paths = []
-        for invalidator_quib_index in invalidator_quib_indices:
-            invalidation_paths_of_current_invalidator_quib_appearance = \
-                forwards_translate(
-                    func_call=func_call,
-                    source=list(sources_to_quibs)[invalidator_quib_index],
-                    source_location=self.quib_function_call.data_source_locations[invalidator_quib_index],
-                    path=path,
-                    shape=self.quib_function_call.get_shape(),
-                    type_=self.quib_function_call.get_type(),
-                    **self.quib_function_call.get_result_metadata()
-                )
-            invalidation_paths.extend(invalidation_paths_of_current_invalidator_quib_appearance)
+        start_time = perf_counter()
+        try:
+            for invalidator_quib_index in invalidator_quib_indices:
+                invalidation_paths_of_current_invalidator_quib_appearance = \
+                    forwards_translate(
+                        func_call=func_call,
+                        source=list(sources_to_quibs)[invalidator_quib_index],
+                        source_location=self.quib_function_call.data_source_locations[invalidator_quib_index],
+                        path=path,
+                        shape=self.quib_function_call.get_shape(),
+                        type_=self.quib_function_call.get_type(),
+                        **self.quib_function_call.get_result_metadata()
+                    )
+                invalidation_paths.extend(invalidation_paths_of_current_invalidator_quib_appearance)
+        finally:
+            self.quib_function_call.stats.add_translation(perf_counter() - start_time)
         return invalidation_paths
 
     def _get_paths_for_children_invalidation(self, invalidator_quib: Quib,
@@ -565,7 +592,13 @@ class QuibHandler:
                 paths = self._get_list_of_not_overridden_paths_at_first_component(path)
             result = self.quib_function_call.run(paths)
 
-        return self._overrider.override(result, self.assignment_template) if self.is_overridden else result
+        if not self.is_overridden:
+            return result
+
+        start_time = perf_counter()
+        result = self._overrider.override(result, self.assignment_template)
+        self.quib_function_call.stats.add_override(perf_counter() - start_time)
+        return result
 
     """
     file syncing
@@ -938,6 +971,22 @@ class Quib:
         self.handler.invalidate_self([])
         self.handler.invalidate_and_aggregate_redraw_at_path([])
 
+    @property
+    def stats(self) -> QuibStats:
+        """
+        QuibStats: Profiling statistics of the quib.
+
+        Number of evaluations of the quib's function, evaluation time, time spent on path translation and on
+        applying overrides, cache hits and misses, and the current size of the cache.
+
+        The statistics are always collected, starting from the creation of the quib.
+
+        See Also
+        --------
+        cache_mode, cache_status, Project.get_profile
+        """
+        return self.handler.quib_function_call.get_stats()
+
     """
     Graphics
     """
@@ -996,6 +1045,10 @@ class Quib:
         ``'drop'`` : Update only at the end of dragging of upstream quibs (at mouse 'drop'),
         or upon programmatic assignments to upstream quibs.
 
+        ``'background'`` : Update continuously as upstream quibs are being dragged, calculating the new
+        values in the background. The last graphics are shown until the new values are ready,
+        and outdated values are never drawn.
+
         ``'central'`` :  Do not automatically update graphics upon upstream changes.
         Only update upon explicit request for the quibs `get_value()`, or upon the
         central redraw command: `refresh_graphics()`.
@@ -1465,6 +1518,60 @@ class Quib:
         """
         return self.handler.get_value_valid_at_path([])
 
+    def get_value_future(self) -> QuibValueFuture:
+        """
+        Calculate the value of the quib in the background.
+
+        Return a future of the quib value. Non-graphics upstream quibs are calculated in background threads
+        (independent upstream branches concurrently); graphics quibs are evaluated in the main thread.
+
+        The future is cancelled if the quib is invalidated before its value is ready (for example, due to an
+        upstream assignment). When ready, the value is also delivered to the quib's callbacks, in the main thread.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            A future of the value of the quib.
+
+        See Also
+        --------
+        get_value, get_value_async, add_callback
+
+        Examples
+        --------
+        >>> a = iquib(3)
+        >>> b = a ** 2
+        >>> future = b.get_value_future()
+        >>> future.result()
+        9
+        """
+        return get_value_future(self, get_running_loop_or_none())
+
+    async def get_value_async(self) -> Any:
+        """
+        Calculate the value of the quib without blocking the event loop.
+
+        Await the value of the quib, calculated in the background (see ``get_value_future``).
+        If the quib is invalidated before its value is ready, ``asyncio.CancelledError`` is raised.
+
+        Returns
+        -------
+        any
+            The result of the function of the quib.
+
+        See Also
+        --------
+        get_value, get_value_future
+
+        Examples
+        --------
+        >>> a = iquib(3)
+        >>> b = a ** 2
+        >>> await b.get_value_async()
+        9
+        """
+        return await asyncio.wrap_future(self.get_value_future())
+
     @raise_quib_call_exceptions_as_own
     def get_type(self) -> Type:
         """
@@ -1747,6 +1854,9 @@ class Quib:
         >>> a.get_descendants(True)
         {b = a + 1, c = (a + 2) * b, d = b * (c + 1)}
         """
+        if depth is None and not bypass_intermediate_quibs:
+            return self.project.dependency_graph_index.get_descendants(self)
+
         descendants = set()
         if depth is None or depth > 0:
             for child in self.get_children(bypass_intermediate_quibs):
@@ -1851,6 +1961,9 @@ class Quib:
         >>> c.get_ancestors(True)
         {a = iquib(1), b = iquib(3)}
         """
+        if depth is None and not bypass_intermediate_quibs:
+            return self.project.dependency_graph_index.get_ancestors(self)
+
         ancestors = set()
         if depth is None or depth > 0:
             for parent in self.get_parents(bypass_intermediate_quibs):
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
-from typing import Set
+from typing import Set, List
 
 from pyquibbler.exceptions import PyQuibblerException
 
@@ -18,39 +19,58 @@ class CannotAccessQuibInScopeException(PyQuibblerException):
         return f"Illegal access to {self.quib}. Note that access to quibs from the global scope is not allowed"
 
 
+class _QuibGuardStack(threading.local):
+    """
+    Quib guards are kept per thread; a guard entered in one thread does not restrict quib access in other threads.
+    """
+    def __init__(self):
+        self.guards: List[QuibGuard] = []
+
+
 class QuibGuard:
     """
-    A quib guard allows us to specify places in which only certain quibs (and their recursive children)
-    are allowed to be accessed
+    A quib guard allows us to specify places in which only certain quibs (and their recursive parents)
+    are allowed to be accessed.
+
+    The ancestors of the allowed quibs are not collected upon creation of the guard. Instead, an accessed quib is
+    checked against the memoized ancestor closures of the dependency-graph index, so that guards created for each
+    call of a function with ``pass_quibs=True`` (like each iteration of a vectorized function) are cheap to create,
+    and each check takes constant time per allowed quib.
     """
-    _QUIB_GUARDS = []
+    _QUIB_GUARDS = _QuibGuardStack()
 
     def __init__(self, quibs_allowed: Set):
         self._quibs_allowed = set(quibs_allowed)
-        for quib in quibs_allowed:
-            self._quibs_allowed.update(quib.get_ancestors())
+        self._quibs_whose_ancestors_are_allowed = tuple(self._quibs_allowed)
 
     def __enter__(self):
-        self._QUIB_GUARDS.append(self)
+        self._QUIB_GUARDS.guards.append(self)
         return self
 
+    def _is_ancestor_of_allowed_quib(self, quib: Quib) -> bool:
+        return any(allowed_quib.project.dependency_graph_index.is_ancestor(quib, allowed_quib)
+                   for allowed_quib in self._quibs_whose_ancestors_are_allowed)
+
     def raise_if_not_allowed_access_to_quib(self, quib):
-        if quib not in self._quibs_allowed:
+        if quib in self._quibs_allowed:
+            return
+        if not self._is_ancestor_of_allowed_quib(quib):
             raise CannotAccessQuibInScopeException(quib)
+        self._quibs_allowed.add(quib)
 
     def add_allowed_quib(self, quib: Quib):
         self._quibs_allowed.add(quib)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._QUIB_GUARDS.pop()
+        self._QUIB_GUARDS.guards.pop()
 
     @classmethod
     def is_within_quib_guard(cls):
-        return len(cls._QUIB_GUARDS) > 0
+        return len(cls._QUIB_GUARDS.guards) > 0
 
     @classmethod
     def get_current_quib_guard(cls) -> QuibGuard:
-        return cls._QUIB_GUARDS[-1]
+        return cls._QUIB_GUARDS.guards[-1]
 
 
 def add_new_quib_to_guard_if_exists(quib: Quib):
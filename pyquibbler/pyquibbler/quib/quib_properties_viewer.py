@@ -15,6 +15,7 @@ HEADER_TO_PROPERTIES = (
     ('File saving', (('save_format', 'actual_save_format'), 'file_path')),
     ('Assignments', ('assignment_template', 'allow_overriding', 'assigned_quibs')),
     ('Caching', ('cache_mode', 'cache_status')),
+    ('Profiling', ('stats', )),
     ('Graphics', (('graphics_update', 'actual_graphics_update'), 'is_graphics_quib')),
 )
 
@@ -79,6 +79,16 @@ NETWORK_STYLE = \
             }
         },
 
+        {
+            'selector': 'node.aggregate',
+            'css': {
+                'shape': "round-rectangle",
+                'background-color': '#90B0C0',
+                'width': 40,
+                'height': 40,
+            }
+        },
+
         {
             'selector': 'node.hidden',
             'css': {
@@ -98,3 +108,11 @@ NETWORK_LAYOUT = {
     'nodeSpacing': 2,
     'edgeLengthVal': 0,
 }
+
+# Layout used once all nodes are positioned, so that updates of the network do not re-layout existing nodes:
+NETWORK_PRESET_LAYOUT = {
+    'name': 'preset',
+}
+
+# Offset, in pixels, of new nodes from the cached positions of their neighbours (children are placed below parents):
+NEW_NODE_OFFSET = (40, 70)
@@ -1,11 +1,16 @@
-from dataclasses import dataclass
+import asyncio
+import sys
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass, field
 
 from pyquibbler.optional_packages.exceptions import MissingPackagesForFunctionException
-from typing import Union, Set, Tuple, Optional
+from typing import Union, Set, Tuple, Optional, Dict, List, Callable
 from pyquibbler import Quib
+from pyquibbler.quib.graphics.main_thread import call_in_main_thread, get_running_loop_or_none
 from pyquibbler.utilities.input_validation_utils import validate_user_input, get_enum_by_str
 
-from .network_properties import NETWORK_STYLE, NETWORK_LAYOUT
+from .network_properties import NETWORK_STYLE, NETWORK_LAYOUT, NETWORK_PRESET_LAYOUT, NEW_NODE_OFFSET
 from .types import Direction, reverse_direction
 
 
@@ -28,6 +33,11 @@ if missing_packages:
 
 infinity = float('inf')
 
+DEFAULT_COLLAPSE_THRESHOLD = 50
+
+NodeId = Union[int, str]
+EdgeId = Tuple[NodeId, NodeId]
+
 
 def get_quib_class(quib: Quib) -> str:
     """
@@ -43,6 +53,13 @@ def get_quib_class(quib: Quib) -> str:
     return classes
 
 
+def is_intermediate_quib(quib: Quib) -> bool:
+    """
+    Intermediate quibs are unnamed and non-graphics quibs, typically representing intermediate calculations.
+    """
+    return quib.assigned_name is None and not quib.is_graphics_quib
+
+
 class QuibNode(ipycytoscape.Node):
     """
     A node in a quib network.
@@ -62,6 +79,24 @@ class QuibNode(ipycytoscape.Node):
         return cls(id(quib), quib.pretty_repr, tooltip, classes=get_quib_class(quib))
 
 
+def _create_graph_change_callback(network: 'QuibNetwork') -> Callable[[Quib], None]:
+    """
+    Create a graph change callback referencing the network weakly, so that the project does not keep the network
+    (and its widget) alive. The callback removes itself from the project once the network is deleted.
+    """
+    network_ref = weakref.ref(network)
+    project = network.focal_quib.project
+
+    def _on_graph_change(quib: Quib):
+        network_ = network_ref()
+        if network_ is None:
+            project.remove_graph_change_callback(_on_graph_change)
+        else:
+            network_._on_graph_change(quib)
+
+    return _on_graph_change
+
+
 class QuibEdge(ipycytoscape.Edge):
     """
     An edge between a source and a target quib nodes.
@@ -93,17 +128,28 @@ def _get_quibs_connected_up_down_or_all(focal_quib: Quib,
     Starting from a focal quib, recursively explore the quib network upstream, downstream or in all directions.
     """
     assert direction is not Direction.BOTH
+    if quibs is None and depth == infinity and not bypass_intermediate_quibs and direction is not Direction.ALL:
+        # The full closure is answered by the (memoized) dependency-graph index:
+        index = focal_quib.project.dependency_graph_index
+        closure = index.get_descendants(focal_quib) if direction is Direction.DOWNSTREAM \
+            else index.get_ancestors(focal_quib)
+        return closure | {focal_quib}
+
     quibs = set() if quibs is None else quibs
 
-    def _get_quibs_recursively(quib: Quib, depth_: int):
-        if quib in quibs:
-            return
-        quibs.add(quib)
-        if depth_ > 0:
+    # Breadth-first, so that each quib is reached in the fewest steps, and is visited only once:
+    quibs.add(focal_quib)
+    quibs_at_current_depth = [focal_quib]
+    current_depth = 0
+    while quibs_at_current_depth and current_depth < depth:
+        current_depth += 1
+        quibs_at_next_depth = []
+        for quib in quibs_at_current_depth:
             for neighbour_quib in _get_neighbour_quibs(quib, direction, bypass_intermediate_quibs):
-                _get_quibs_recursively(neighbour_quib, depth_ - 1)
-
-    _get_quibs_recursively(focal_quib, depth)
+                if neighbour_quib not in quibs:
+                    quibs.add(neighbour_quib)
+                    quibs_at_next_depth.append(neighbour_quib)
+        quibs_at_current_depth = quibs_at_next_depth
     return quibs
 
 
@@ -111,14 +157,32 @@ def _get_quibs_connected_up_down_or_all(focal_quib: Quib,
 class QuibNetwork:
     """
     A network of quibs extending from a focal quib.
+
+    The network widget is updated incrementally: upon each update, only the nodes and edges that were added or
+    removed are sent to the widget, and new nodes are positioned next to the cached positions of their neighbours,
+    so that the layout of the existing nodes is kept.
+    A live network is updated whenever quibs are connected to, or disconnected from, the network, and whenever
+    quibs of the network are deleted. The updates are done in the main thread. The project references a live
+    network weakly; the network is kept alive by its widget.
     """
     focal_quib: Quib
     direction: Union[str, Direction] = Direction.BOTH
     depth: int = infinity
     reverse_depth: int = 0
     bypass_intermediate_quibs: bool = True
+    collapse_threshold: Optional[int] = DEFAULT_COLLAPSE_THRESHOLD
     _quibs: Optional[Set[Quib]] = None
     _links: Optional[Set[Tuple[Quib, Quib]]] = None
+    _widget: Optional[ipycytoscape.CytoscapeWidget] = None
+    _node_ids_to_nodes: Dict[NodeId, QuibNode] = field(default_factory=dict)
+    _edge_ids_to_edges: Dict[EdgeId, QuibEdge] = field(default_factory=dict)
+    _positions: Dict[NodeId, Dict[str, float]] = field(default_factory=dict)
+    _quib_ids_to_refs: Dict[int, weakref.ref] = field(default_factory=dict)
+    _is_live: bool = False
+    _graph_change_callback: Optional[Callable[[Quib], None]] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _is_updating: bool = False
+    _is_update_pending: bool = False
 
     def __post_init__(self):
         self.depth = infinity if self.depth is None else self.depth
@@ -179,12 +243,218 @@ class QuibNetwork:
             self._links = self._get_connecting_links()
         return self._links
 
+    def _get_quibs_to_node_ids(self) -> Dict[Quib, NodeId]:
+        """
+        Map each quib of the network to the id of its node.
+        Connected groups of more than `collapse_threshold` intermediate quibs are mapped to a single aggregate node.
+        """
+        quibs_to_node_ids = {quib: id(quib) for quib in self.quibs}
+        if self.bypass_intermediate_quibs or self.collapse_threshold is None:
+            return quibs_to_node_ids
+
+        intermediate_quibs = {quib for quib in self.quibs
+                              if quib is not self.focal_quib and is_intermediate_quib(quib)}
+        intermediate_neighbours = defaultdict(set)
+        for source, target, _ in self.links:
+            if source in intermediate_quibs and target in intermediate_quibs:
+                intermediate_neighbours[source].add(target)
+                intermediate_neighbours[target].add(source)
+
+        grouped_quibs = set()
+        for quib in intermediate_quibs:
+            if quib in grouped_quibs:
+                continue
+            group = {quib}
+            quibs_to_visit = [quib]
+            while quibs_to_visit:
+                for neighbour in intermediate_neighbours[quibs_to_visit.pop()]:
+                    if neighbour not in group:
+                        group.add(neighbour)
+                        quibs_to_visit.append(neighbour)
+            grouped_quibs |= group
+            if len(group) > self.collapse_threshold:
+                aggregate_node_id = f'aggregate-{min(id(quib_in_group) for quib_in_group in group)}'
+                for quib_in_group in group:
+                    quibs_to_node_ids[quib_in_group] = aggregate_node_id
+        return quibs_to_node_ids
+
+    def get_nodes_and_edges(self) -> Tuple[Dict[NodeId, List[Quib]], Dict[EdgeId, bool]]:
+        """
+        Return the quibs of each node of the network, and whether each edge links a data source.
+        """
+        quibs_to_node_ids = self._get_quibs_to_node_ids()
+        node_ids_to_quibs = defaultdict(list)
+        for quib, node_id in quibs_to_node_ids.items():
+            node_ids_to_quibs[node_id].append(quib)
+        edge_ids_to_is_data = {}
+        for source, target, is_data in self.links:
+            edge_id = quibs_to_node_ids[source], quibs_to_node_ids[target]
+            if edge_id[0] != edge_id[1]:
+                edge_ids_to_is_data[edge_id] = edge_ids_to_is_data.get(edge_id, False) or is_data
+        return dict(node_ids_to_quibs), edge_ids_to_is_data
+
     def create_quib_node(self, quib):
         node = QuibNode.from_quib(quib)
         if quib is self.focal_quib:
             node.classes += ' focal'
         return node
 
+    def _create_node(self, node_id: NodeId, quibs: List[Quib]) -> QuibNode:
+        if len(quibs) == 1 and node_id == id(quibs[0]):
+            return self.create_quib_node(quibs[0])
+        return QuibNode(node_id, f'{len(quibs)} intermediate quibs', '', ' aggregate')
+
+    def _cache_positions(self):
+        for node_id, node in self._node_ids_to_nodes.items():
+            if node.position:
+                self._positions[node_id] = dict(node.position)
+
+    def _position_new_nodes(self, new_node_ids: Set[NodeId], edge_ids: Set[EdgeId]):
+        """
+        Place new nodes at their cached position, or next to a positioned neighbour (children below their
+        parents, and parents above their children).
+        """
+        dx, dy = NEW_NODE_OFFSET
+        num_placed_next_to = defaultdict(int)
+        node_ids_to_position = {node_id for node_id in new_node_ids if node_id not in self._positions}
+        while node_ids_to_position:
+            positioned_node_ids = set()
+            for source_id, target_id in edge_ids:
+                for node_id, neighbour_id, direction in ((target_id, source_id, 1), (source_id, target_id, -1)):
+                    if node_id in node_ids_to_position and node_id not in positioned_node_ids \
+                            and neighbour_id in self._positions:
+                        neighbour_position = self._positions[neighbour_id]
+                        self._positions[node_id] = {
+                            'x': neighbour_position['x'] + dx * num_placed_next_to[neighbour_id, direction],
+                            'y': neighbour_position['y'] + dy * direction}
+                        num_placed_next_to[neighbour_id, direction] += 1
+                        positioned_node_ids.add(node_id)
+            if not positioned_node_ids:
+                break
+            node_ids_to_position -= positioned_node_ids
+        for node_id in new_node_ids:
+            if node_id in self._positions:
+                self._node_ids_to_nodes[node_id].position = dict(self._positions[node_id])
+
+    def _watch_quibs(self, node_ids_to_quibs: Dict[NodeId, List[Quib]]):
+        """
+        Keep weak references to the quibs of a live network, to update the network when they are deleted.
+        """
+        quibs = {id(quib): quib for quibs in node_ids_to_quibs.values() for quib in quibs}
+        for quib_id in self._quib_ids_to_refs.keys() - quibs.keys():
+            del self._quib_ids_to_refs[quib_id]
+        for quib_id, quib in quibs.items():
+            if quib_id not in self._quib_ids_to_refs or self._quib_ids_to_refs[quib_id]() is not quib:
+                self._quib_ids_to_refs[quib_id] = weakref.ref(quib, self._on_quib_deleted)
+
+    def _update_widget(self):
+        graph = self._widget.graph
+        self._cache_positions()
+        self._quibs = None
+        self._links = None
+        node_ids_to_quibs, edge_ids_to_is_data = self.get_nodes_and_edges()
+
+        removed_edge_ids = {edge_id for edge_id, edge in self._edge_ids_to_edges.items()
+                            if edge_id not in edge_ids_to_is_data
+                            or ('data_source' in edge.classes) != edge_ids_to_is_data[edge_id]}
+        removed_node_ids = self._node_ids_to_nodes.keys() - node_ids_to_quibs.keys()
+        if removed_edge_ids:
+            removed_edges = {id(self._edge_ids_to_edges.pop(edge_id)) for edge_id in removed_edge_ids}
+            graph.edges = [edge for edge in graph.edges if id(edge) not in removed_edges]
+        if removed_node_ids:
+            removed_nodes = {id(self._node_ids_to_nodes.pop(node_id)) for node_id in removed_node_ids}
+            graph.nodes = [node for node in graph.nodes if id(node) not in removed_nodes]
+
+        new_node_ids = node_ids_to_quibs.keys() - self._node_ids_to_nodes.keys()
+        for node_id in new_node_ids:
+            self._node_ids_to_nodes[node_id] = self._create_node(node_id, node_ids_to_quibs[node_id])
+        self._position_new_nodes(new_node_ids, edge_ids_to_is_data.keys())
+        new_edge_ids = edge_ids_to_is_data.keys() - self._edge_ids_to_edges.keys()
+        for edge_id in new_edge_ids:
+            self._edge_ids_to_edges[edge_id] = QuibEdge(*edge_id, edge_ids_to_is_data[edge_id])
+        if new_node_ids:
+            graph.add_nodes([self._node_ids_to_nodes[node_id] for node_id in new_node_ids])
+        if new_edge_ids:
+            graph.add_edges([self._edge_ids_to_edges[edge_id] for edge_id in new_edge_ids], directed=True)
+
+        # Once all nodes are positioned, we keep their positions rather than re-layout the whole network:
+        if all(node_id in self._positions for node_id in self._node_ids_to_nodes):
+            self._widget.set_layout(**NETWORK_PRESET_LAYOUT)
+        else:
+            self._widget.set_layout(**NETWORK_LAYOUT)
+
+        if self._is_live:
+            self._watch_quibs(node_ids_to_quibs)
+            # do not keep the quibs of a live network alive:
+            self._quibs = None
+            self._links = None
+
+    def update(self):
+        """
+        Update the network widget to the current quib network, sending only the added and removed nodes and edges.
+        """
+        if self._widget is None:
+            return
+        self._is_update_pending = True
+        if self._is_updating:
+            return
+        self._is_updating = True
+        try:
+            while self._is_update_pending:
+                self._is_update_pending = False
+                self._update_widget()
+        finally:
+            self._is_updating = False
+
+    def _is_network_affected_by(self, quib: Quib) -> bool:
+        quib_ids = self._quib_ids_to_refs
+        return id(quib) in quib_ids \
+            or any(id(neighbour) in quib_ids
+                   for neighbour in _get_neighbour_quibs(quib, Direction.BOTH, self.bypass_intermediate_quibs))
+
+    def _update_in_main_thread(self):
+        call_in_main_thread(self.update, self._loop)
+
+    def _on_graph_change(self, quib: Quib):
+        if self._is_network_affected_by(quib):
+            self._update_in_main_thread()
+
+    def _on_quib_deleted(self, _quib_ref: weakref.ref):
+        # quibs can be deleted in any thread (like the prefetch thread)
+        if self._is_live and not sys.is_finalizing():
+            self._update_in_main_thread()
+
+    def _on_widget_comm_change(self, change):
+        if change['new'] is None:
+            self.stop_live_updates()
+
+    def start_live_updates(self):
+        """
+        Update the network widget whenever quibs are connected to, disconnected from, or deleted from the network.
+        """
+        if self._is_live:
+            return
+        self._is_live = True
+        self._loop = get_running_loop_or_none()
+        self._graph_change_callback = _create_graph_change_callback(self)
+        self.focal_quib.project.add_graph_change_callback(self._graph_change_callback)
+        if self._widget is not None:
+            self._widget.observe(self._on_widget_comm_change, names='comm')
+            self.update()
+
+    def stop_live_updates(self):
+        """
+        Stop updating the network widget upon changes of the quib network.
+        """
+        if not self._is_live:
+            return
+        self._is_live = False
+        self.focal_quib.project.remove_graph_change_callback(self._graph_change_callback)
+        self._graph_change_callback = None
+        if self._widget is not None:
+            self._widget.unobserve(self._on_widget_comm_change, names='comm')
+        self._quib_ids_to_refs.clear()
+
     def get_legend_widget(self):
         labels_classes = (
             ('input', 'iquib'),
@@ -221,19 +491,20 @@ class QuibNetwork:
         w.set_layout(name='preset')
         return w
 
-    def get_network_widget(self) -> ipycytoscape.CytoscapeWidget:
+    def get_network_widget(self, live: bool = False) -> ipycytoscape.CytoscapeWidget:
         w = ipycytoscape.CytoscapeWidget()
-        w.graph.add_nodes([self.create_quib_node(quib) for quib in self.quibs])
-        w.graph.add_edges([QuibEdge(id(source), id(target), is_data)
-                           for source, target, is_data in self.links],
-                          directed=True)
         w.set_style(NETWORK_STYLE)
-        w.set_layout(**NETWORK_LAYOUT)
+        self._widget = w
+        self._node_ids_to_nodes.clear()
+        self._edge_ids_to_edges.clear()
+        self.update()
+        if live:
+            self.start_live_updates()
         return w
 
-    def get_network_widget_with_legend(self) -> ipywidgets.Box:
+    def get_network_widget_with_legend(self, live: bool = False) -> ipywidgets.Box:
         legend_widget = self.get_legend_widget()
-        network_widget = self.get_network_widget()
+        network_widget = self.get_network_widget(live)
         box = ipywidgets.Box()
         box.children = [legend_widget, network_widget]
 
@@ -244,12 +515,16 @@ class QuibNetwork:
                      direction=(type(None), str, Direction),
                      depth=(type(None), int),
                      reverse_depth=(type(None), int),
-                     bypass_intermediate_quibs=bool)
+                     bypass_intermediate_quibs=bool,
+                     collapse_threshold=(type(None), int),
+                     live=bool)
 def dependency_graph(focal_quib: Quib,
                      direction: Union[None, str, Direction] = None,
                      depth: Optional[int] = None,
                      reverse_depth: Optional[int] = 0,
-                     bypass_intermediate_quibs: bool = True) -> ipywidgets.Box:
+                     bypass_intermediate_quibs: bool = True,
+                     collapse_threshold: Optional[int] = DEFAULT_COLLAPSE_THRESHOLD,
+                     live: bool = False) -> ipywidgets.Box:
     """
     Draw a network of quibs
 
@@ -296,6 +571,17 @@ def dependency_graph(focal_quib: Quib,
         quibs (``assigned_name=None`` and ``is_graphics=False``), typically representing
         intermediate calculations.
 
+    collapse_threshold : int or None, default: 50
+        When intermediate quibs are not bypassed, connected groups of more than `collapse_threshold`
+        intermediate quibs are collapsed into a single aggregate node.
+
+        ``None`` to never collapse intermediate quibs.
+
+    live : bool, default: False
+        Indicates whether to update the network as quibs are created, connected, disconnected or deleted.
+        Updates only add and remove the changed nodes and edges, keeping the layout of the existing nodes.
+        Live updates stop when the widget is closed.
+
     Returns
     -------
     ipywidgets.Box
@@ -314,4 +600,5 @@ def dependency_graph(focal_quib: Quib,
                        direction=direction,
                        depth=depth,
                        reverse_depth=reverse_depth,
-                       bypass_intermediate_quibs=bypass_intermediate_quibs).get_network_widget_with_legend()
+                       bypass_intermediate_quibs=bypass_intermediate_quibs,
+                       collapse_threshold=collapse_threshold).get_network_widget_with_legend(live)
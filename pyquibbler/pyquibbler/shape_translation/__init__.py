@@ -0,0 +1 @@
+from .translators import ShapeTranslator
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pyquibbler.utilities.general_utils import Shape
+from pyquibbler.utilities.multiple_instance_runner import MultipleInstanceRunner
+
+if TYPE_CHECKING:
+    from pyquibbler.function_definitions.func_call import FuncCall
+
+
+def translate_shape(func_call: FuncCall) -> Shape:
+    """
+    Try getting the shape of the result of the func call without evaluating the function.
+    Raise NoRunnerWorkedException if the shape cannot be calculated.
+    """
+    return MultipleInstanceRunner(run_condition=None,
+                                  runner_types=func_call.func_definition.result_shape_translators,
+                                  func_call=func_call).run()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import math
+import numbers
+from abc import abstractmethod
+from typing import Optional, List, Any
+
+import numpy as np
+from numpy.lib.array_utils import normalize_axis_tuple, normalize_axis_index
+
+from pyquibbler.function_definitions.func_call import FuncCall, FuncArgsKwargs
+from pyquibbler.type_translation.utils import get_representative_value_of_type
+from pyquibbler.utilities.general_utils import Shape
+from pyquibbler.utilities.multiple_instance_runner import ConditionalRunner, BaseRunnerFailedException, RunCondition
+
+
+class ShapeTranslator(ConditionalRunner):
+    """
+    Translate the shapes of the data arguments to the shape of the result, without running the function.
+
+    The data sources of the func call are replaced with zero-stride proxies: arrays of their shape whose elements
+    all share a single byte of memory (or representative values of their type, for scalars).
+
+    Shape translators only translate calls whose result is an array (of type np.ndarray).
+    """
+    RUN_CONDITIONS: Optional[List[RunCondition]] = None
+
+    def __init__(self, func_call: FuncCall):
+        self._func_call = func_call
+        self._proxy_func_args_kwargs: Optional[FuncArgsKwargs] = None
+
+    @property
+    def _func(self):
+        return self._func_call.func
+
+    def _create_proxy_of_data_source(self, quib) -> Any:
+        if quib.handler.is_overridden:
+            # assignments can change the shape and type of the quib's value
+            value = quib.get_value_valid_at_path(None)
+            type_, get_shape = type(value), lambda: np.shape(value)
+        else:
+            type_, get_shape = quib.get_type(), quib.get_shape
+        if type_ is np.ndarray:
+            return np.broadcast_to(np.zeros((), dtype=bool), get_shape())
+        if isinstance(type_, type) and issubclass(type_, (np.generic, numbers.Number)):
+            return get_representative_value_of_type(type_)
+        self._raise_run_failed_exception(f'cannot create a shape proxy for {type_}')
+
+    def _get_proxy_func_args_kwargs(self) -> FuncArgsKwargs:
+        """
+        The args and kwargs of the func call, with the data sources replaced by their proxies, and the parameter
+        sources by their values.
+        """
+        if self._proxy_func_args_kwargs is None:
+            args, kwargs = self._func_call.transform_sources_in_args_kwargs(
+                transform_data_source_func=self._create_proxy_of_data_source,
+                transform_parameter_func=lambda quib: quib.get_value_valid_at_path([]),
+            )
+            self._proxy_func_args_kwargs = FuncArgsKwargs(self._func, args, kwargs)
+        return self._proxy_func_args_kwargs
+
+    def _get_data_argument_values(self) -> List[Any]:
+        func_args_kwargs = self._get_proxy_func_args_kwargs()
+        return [func_args_kwargs.get_arg_value_by_argument(data_argument) for data_argument
+                in self._func_call.func_definition.get_data_arguments(func_args_kwargs)]
+
+    def _get_non_data_argument_values_by_name(self) -> dict:
+        """
+        The values of the arguments following the (first) data argument, by name.
+        """
+        arg_values_by_name = dict(self._get_proxy_func_args_kwargs().get_arg_values_by_keyword(include_defaults=False))
+        arg_values_by_name.pop(next(iter(arg_values_by_name)))
+        return arg_values_by_name
+
+    def _get_array_data_argument(self) -> np.ndarray:
+        data = self._get_data_argument_values()[0]
+        if type(data) is not np.ndarray:
+            self._raise_run_failed_exception('data argument is not an array')
+        return data
+
+    @abstractmethod
+    def get_shape(self) -> Shape:
+        """
+        Return the shape of the result.
+        Call _raise_run_failed_exception if the shape cannot be determined.
+        """
+        pass
+
+    def try_run(self):
+        try:
+            return self.get_shape()
+        except BaseRunnerFailedException:
+            raise
+        except Exception as e:
+            # the function would fail, or behave differently, with the proxies. We will have to run it.
+            self._raise_run_failed_exception(e)
+
+
+# Elementwise functions that convert their argument to a Python scalar (and fail for arrays of more than one element)
+SCALAR_ONLY_FUNCS = {math.ceil, math.floor, math.trunc}
+
+
+class ElementwiseShapeTranslator(ShapeTranslator):
+    """
+    The shape of the result of elementwise functions is the broadcast shape of their data arguments.
+    """
+
+    def get_shape(self) -> Shape:
+        data_argument_values = self._get_data_argument_values()
+        if self._func in SCALAR_ONLY_FUNCS and any(isinstance(value, np.ndarray) for value in data_argument_values):
+            self._raise_run_failed_exception('function of a scalar')
+        func_args_kwargs = self._get_proxy_func_args_kwargs()
+        data_argument_ids = {id(value) for value in data_argument_values}
+        if any(id(value) not in data_argument_ids and np.ndim(value) > 0
+               for value in (*func_args_kwargs.args, *func_args_kwargs.kwargs.values())):
+            # array kwargs, like `where` or `out`
+            self._raise_run_failed_exception('non-data array argument')
+
+        if any(type(value) is not np.ndarray and np.ndim(value) > 0 for value in data_argument_values):
+            # sequences, like lists, are not necessarily processed elementwise (`[1, 2] * 3`), and array subclasses,
+            # like np.matrix, return their own type
+            self._raise_run_failed_exception('non-array data argument')
+
+        shape = np.broadcast_shapes(*(np.shape(value) for value in data_argument_values))
+        if len(shape) == 0:
+            # elementwise functions of scalars and 0-d arrays return a scalar
+            self._raise_run_failed_exception('scalar result')
+        return shape
+
+
+class AxisReductionShapeTranslator(ShapeTranslator):
+    """
+    The shape of the result of reductions along axes, like np.sum(a, axis=0, keepdims=False).
+    """
+
+    def get_shape(self) -> Shape:
+        data = self._get_array_data_argument()
+        arg_values = self._get_non_data_argument_values_by_name()
+        axis = arg_values.pop('axis', None)
+        keepdims = arg_values.pop('keepdims', False)
+        arg_values.pop('where', None)
+        if arg_values.pop('returned', False):
+            # np.average(..., returned=True) returns a tuple
+            self._raise_run_failed_exception('tuple result')
+        if arg_values.pop('out', None) is not None or any(np.ndim(value) > 0 for value in arg_values.values()):
+            # array arguments, like the `q` of np.quantile, can add axes
+            self._raise_run_failed_exception('non-data array argument')
+
+        axes = tuple(range(data.ndim)) if axis is None else normalize_axis_tuple(axis, data.ndim)
+        if keepdims is True:
+            shape = tuple(1 if dim in axes else size for dim, size in enumerate(data.shape))
+        else:
+            shape = tuple(size for dim, size in enumerate(data.shape) if dim not in axes)
+        if len(shape) == 0:
+            # full reductions return an element, which could be an object of any shape
+            self._raise_run_failed_exception('scalar result')
+        return shape
+
+
+class AxisAccumulationShapeTranslator(ShapeTranslator):
+    """
+    The shape of the result of accumulations along an axis, like np.cumsum(a, axis=0).
+    """
+
+    def get_shape(self) -> Shape:
+        data = self._get_array_data_argument()
+        arg_values = self._get_non_data_argument_values_by_name()
+        axis = arg_values.pop('axis', None)
+        if arg_values.pop('out', None) is not None or any(np.ndim(value) > 0 for value in arg_values.values()):
+            self._raise_run_failed_exception('non-data array argument')
+
+        if axis is None:
+            return (data.size, )
+        normalize_axis_index(axis, data.ndim)
+        return data.shape
+
+
+class ProxyShapeTranslator(ShapeTranslator):
+    """
+    Get the shape of the result by running the function on the zero-stride proxies of the data sources.
+    Suitable for functions whose result shape depends only on the shapes of their data arguments, like
+    transpositional functions (np.transpose, np.concatenate, getitem).
+    """
+
+    def get_shape(self) -> Shape:
+        func_args_kwargs = self._get_proxy_func_args_kwargs()
+        result = self._func(*func_args_kwargs.args, **func_args_kwargs.kwargs)
+        if type(result) is not np.ndarray:
+            # an element of the proxy; the actual element could be an object of any shape
+            self._raise_run_failed_exception('non-array result')
+        return result.shape
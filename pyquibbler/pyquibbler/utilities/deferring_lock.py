@@ -0,0 +1,56 @@
+import threading
+from typing import Callable, List
+
+
+class DeferringRLock:
+    """
+    A re-entrant lock, allowing threads that find the lock taken to defer an action instead of waiting.
+
+    Deferred actions are run by the thread holding the lock, just before it finally releases it.
+    This allows, for example, invalidating a cache while another thread is calculating it: the invalidation is
+    applied right after the calculation stores its (now outdated) result.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._mutex = threading.Lock()
+        self._depth = 0
+        self._deferred_actions: List[Callable[[], None]] = []
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        while True:
+            with self._mutex:
+                if self._depth > 1 or not self._deferred_actions:
+                    self._depth -= 1
+                    self._lock.release()
+                    return
+                deferred_actions, self._deferred_actions = self._deferred_actions, []
+            # we still hold the lock, so the deferred actions run before any other thread can acquire it:
+            try:
+                for action in deferred_actions:
+                    action()
+            except BaseException:
+                with self._mutex:
+                    self._depth -= 1
+                    self._lock.release()
+                raise
+
+    def run_or_defer(self, action: Callable[[], None]):
+        """
+        Run the action now if the lock is free (or held by the current thread).
+        Otherwise, defer the action to be run by the thread holding the lock, once it is done.
+        """
+        with self._mutex:
+            if not self._lock.acquire(blocking=False):
+                self._deferred_actions.append(action)
+                return
+            self._depth += 1
+        try:
+            action()
+        finally:
+            self.__exit__(None, None, None)
@@ -18,5 +18,6 @@ np_maximum = get_original_func(np.maximum)
 np_minimum = get_original_func(np.minimum)
 np_round = get_original_func(np.round)
 np_zeros = get_original_func(np.zeros)
+np_concatenate = get_original_func(np.concatenate)
 np_True = np.bool_(True)
 np_shape = get_original_func(np.shape)
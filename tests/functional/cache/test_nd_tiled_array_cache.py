@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from pyquibbler.cache import create_cache, NdTiledArrayCache, NdUnstructuredArrayCache
+from pyquibbler.cache.cache import CacheStatus
+from pyquibbler.path import PathComponent, FailedToDeepAssignException
+
+
+@pytest.fixture
+def result():
+    return np.arange(60).reshape((10, 6))
+
+
+@pytest.fixture
+def cache(result):
+    return NdTiledArrayCache.create_invalid_cache_from_result(result, (4, 4))
+
+
+@pytest.fixture
+def valid_cache(cache, result):
+    cache.set_valid_value_at_path([], result)
+    return cache
+
+
+def test_create_cache_creates_tiled_cache_for_arrays_spanning_more_than_one_tile(result):
+    assert isinstance(create_cache(result, (4, 4)), NdTiledArrayCache)
+    assert type(create_cache(result, (10, 6))) is NdUnstructuredArrayCache
+    assert type(create_cache(result)) is NdUnstructuredArrayCache
+
+
+def test_tiled_cache_is_invalid_upon_creation(cache):
+    assert cache.get_cache_status() == CacheStatus.ALL_INVALID
+    assert cache._invalid_mask.shape == (3, 2)
+
+
+def test_tiled_cache_set_invalid_invalidates_whole_tiles(valid_cache):
+    valid_cache.set_invalid_at_path([PathComponent((5, 1))])
+
+    assert valid_cache.get_cache_status() == CacheStatus.PARTIAL
+    assert valid_cache.get_uncached_paths([PathComponent((7, 3))]) == [[PathComponent((slice(4, 8), slice(0, 4)))]]
+    assert valid_cache.get_uncached_paths([PathComponent((7, 4))]) == []
+
+
+def test_tiled_cache_set_valid_validates_only_covered_tiles(cache, result):
+    cache.set_valid_value_at_path([PathComponent((slice(0, 6), slice(None)))], result[0:6])
+
+    assert cache.get_uncached_paths([]) == [[PathComponent((slice(4, 12), slice(0, 8)))]]
+
+
+@pytest.mark.parametrize('component', [
+    (slice(None), 4),
+    (..., 5),
+    np.arange(60).reshape((10, 6)) % 6 == 5,
+    ([0, 9], [4, 5]),
+])
+def test_tiled_cache_get_uncached_paths_references_whole_tiles(valid_cache, component):
+    valid_cache.set_invalid_at_path([PathComponent((slice(None), slice(4, 6)))])
+    valid_cache.set_valid_value_at_path([PathComponent((slice(4, 8), slice(4, 6)))], 0)
+
+    uncached_paths = valid_cache.get_uncached_paths([PathComponent(component)])
+
+    assert len(uncached_paths) == 1
+    expected_mask = np.zeros((10, 6), dtype=bool)
+    expected_mask[0:4, 4:6] = True
+    expected_mask[8:10, 4:6] = True
+    assert np.array_equal(uncached_paths[0][0].component, expected_mask)
+
+
+def test_tiled_cache_keeps_value_of_partially_valid_tile(cache, result):
+    cache.set_valid_value_at_path([PathComponent((0, 0))], 7)
+
+    assert cache.get_value()[0, 0] == 7
+    assert cache.get_uncached_paths([PathComponent((0, 0))]) == [[PathComponent((slice(0, 4), slice(0, 4)))]]
+
+
+def test_tiled_cache_raises_on_invalid_indexing(valid_cache):
+    with pytest.raises(FailedToDeepAssignException):
+        valid_cache.set_invalid_at_path([PathComponent((10, 0))])
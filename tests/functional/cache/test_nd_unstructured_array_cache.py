@@ -50,6 +50,14 @@ class TestNdUnstructuredArrayCache(IndexableCacheTest):
     def test_nd_cache_does_not_match_nd_array_of_different_dtype(self, cache):
         assert not cache.matches_result(np.full((2, 3), "hello mike"))
 
+    def test_nd_cache_set_valid_at_path_keeps_value(self, cache, result):
+        result[0, 1] = 7
+        cache.set_valid_at_path([PathComponent((0, 1))])
+
+        assert cache.get_value() is result
+        assert cache.get_uncached_paths([PathComponent((0, 1))]) == []
+        assert cache.get_cache_status() == CacheStatus.PARTIAL
+
     def test_cache_get_cache_status_on_partial(self, cache):
         cache.set_valid_value_at_path([PathComponent((1, 1))], 5)
 
@@ -70,3 +78,57 @@ class TestNdUnstructuredArrayCache(IndexableCacheTest):
     def set_completely_invalid(self, result, cache):
         cache.set_invalid_at_path([PathComponent(True)])
 
+
+    def test_nd_cache_keeps_sparse_invalid_mask_for_few_invalid_elements(self):
+        cache = NdUnstructuredArrayCache.create_invalid_cache_from_result(np.zeros((3, 4)))
+        cache.set_valid_value_at_path([], np.zeros((3, 4)))
+        cache.set_invalid_at_path([PathComponent((1, 2))])
+        cache.set_invalid_at_path([PathComponent((1, 2))])
+
+        assert not cache._invalid_mask.is_dense
+        assert np.array_equal(cache._invalid_mask, [[0, 0, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0]])
+        assert cache.get_uncached_paths([PathComponent((0, 1))]) == []
+        assert cache.get_cache_status() == CacheStatus.PARTIAL
+
+    def test_nd_cache_converts_invalid_mask_to_dense_above_density_threshold(self, cache, result):
+        cache.set_valid_value_at_path([], result)
+        cache.set_invalid_at_path([PathComponent(slice(0, 1))])
+
+        assert cache._invalid_mask.is_dense
+        assert np.array_equal(cache._invalid_mask, [[True, True, True], [False, False, False]])
+
+        cache.set_valid_value_at_path([], result)
+
+        assert not cache._invalid_mask.is_dense
+        assert cache.get_uncached_paths([]) == []
+
+    def test_nd_cache_invalid_mask_becomes_uniform_when_all_elements_are_set(self, cache):
+        cache.set_valid_value_at_path([PathComponent((0, 0))], 7)
+        cache.set_invalid_at_path([PathComponent(np.full((2, 3), True))])
+
+        assert not cache._invalid_mask.is_dense
+        assert cache.get_cache_status() == CacheStatus.ALL_INVALID
+
+    def test_nd_cache_get_uncached_paths_of_large_array_with_sparse_invalid_mask(self):
+        cache = NdUnstructuredArrayCache.create_invalid_cache_from_result(np.zeros((1000, 1000)))
+        cache.set_valid_value_at_path([], np.zeros((1000, 1000)))
+        cache.set_invalid_at_path([PathComponent((500, slice(300, 303)))])
+
+        uncached_paths = cache.get_uncached_paths([PathComponent((slice(None), 301))])
+
+        assert not cache._invalid_mask.is_dense
+        assert cache._invalid_mask.nbytes < 100
+        assert len(uncached_paths) == 1
+        assert isinstance(uncached_paths[0][0].component, tuple)
+        assert np.array_equal(np.transpose(uncached_paths[0][0].component), [[500, 301]])
+
+    def test_nd_cache_get_uncached_paths_with_dense_invalid_mask_is_a_bool_mask(self):
+        cache = NdUnstructuredArrayCache.create_invalid_cache_from_result(np.zeros((10, 10)))
+        cache.set_valid_value_at_path([PathComponent((slice(None), slice(0, 5)))], 1.)
+
+        uncached_paths = cache.get_uncached_paths([])
+
+        expected_mask = np.full((10, 10), False)
+        expected_mask[:, 5:] = True
+        assert len(uncached_paths) == 1
+        assert np.array_equal(uncached_paths[0][0].component, expected_mask)
@@ -122,3 +122,14 @@ def test_inverse_elementwise_single_argument(func, func_arg, indices, value, exp
         assert np.array_equal(value, expected_value)
     else:
         assert value == expected_value
+
+
+def test_inverse_elementwise_bulk_assignment_with_two_sources_inverts_to_first_source():
+    first_source = Source(np.array([1, 2, 3, 4]))
+    second_source = Source(np.array([10, 20, 30, 40]))
+    sources_to_results, inversals = inverse(np.add, indices=slice(1, 3), value=[100, 200],
+                                            args=(first_source, second_source))
+
+    assert len(inversals) == 1
+    assert np.array_equal(sources_to_results[first_source], [1, 80, 170, 4])
+    assert np.array_equal(inversals[0].assignment.path[0].component, [False, True, True, False])
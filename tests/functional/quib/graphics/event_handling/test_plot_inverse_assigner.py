@@ -73,6 +73,7 @@ def create_mock_pick_event_and_mouse_event(indices, x_data, y_data, artist_index
     pick_event = mock.Mock()
     pick_event.ind = indices
     pick_event.artist._index_in_plot = artist_index
+    pick_event.artist._index_map_in_plot = None
     pick_event.artist.axes = ax
     pick_event.mouseevent = mouse_event
 
@@ -83,6 +84,7 @@ def create_mock_pick_event_right_click(indices, artist_index):
     pick_event = mock.Mock()
     pick_event.ind = indices
     pick_event.artist._index_in_plot = artist_index
+    pick_event.artist._index_map_in_plot = None
     pick_event.mouseevent = mock.Mock()
     pick_event.mouseevent.button = MouseButton.RIGHT
 
@@ -0,0 +1,121 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.collections import PathCollection
+from matplotlib.lines import Line2D
+
+from pyquibbler import iquib
+from pyquibbler.env import PIXEL_INDEX_MIN_NUM_POINTS
+from pyquibbler.quib.graphics.event_handling.spatial_index import PixelGridIndex, get_up_to_date_pixel_grid_index
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+@pytest.fixture(autouse=True)
+def small_pixel_index_min_num_points():
+    with PIXEL_INDEX_MIN_NUM_POINTS.temporary_set(10):
+        yield
+
+
+def brute_force_indices_within_radius(xy_pixels, x, y, radius):
+    distances = np.hypot(xy_pixels[:, 0] - x, xy_pixels[:, 1] - y)
+    indices = np.flatnonzero(distances <= radius)
+    return indices[np.argsort(distances[indices], kind='stable')]
+
+
+@pytest.mark.parametrize('cell_size', [1., 5., 30.])
+def test_pixel_grid_index_finds_points_within_radius(rng, cell_size):
+    xy_pixels = rng.random((1000, 2)) * 500
+    pixel_grid_index = PixelGridIndex(xy_pixels, cell_size)
+
+    for x, y in rng.random((50, 2)) * 520 - 10:
+        assert np.array_equal(pixel_grid_index.get_indices_within_radius(x, y, 10.),
+                              brute_force_indices_within_radius(xy_pixels, x, y, 10.))
+
+
+def test_pixel_grid_index_ignores_non_finite_points():
+    xy_pixels = np.array([[10., 10.], [np.nan, 10.], [12., np.inf], [11., 11.], [1e300, 1e300]])
+    pixel_grid_index = PixelGridIndex(xy_pixels, 5.)
+
+    assert np.array_equal(pixel_grid_index.get_indices_within_radius(10.5, 10.5, 3.), [0, 3])
+
+
+def test_pixel_grid_index_of_no_points():
+    pixel_grid_index = PixelGridIndex(np.zeros((0, 2)), 5.)
+
+    assert len(pixel_grid_index.get_indices_within_radius(10., 10., 3.)) == 0
+
+
+def assert_contains_as_matplotlib(artist, mouse_events):
+    original_contains = type(artist).contains.__wrapped__
+    for mouse_event in mouse_events:
+        is_hit, details = artist.contains(mouse_event)
+        expected_is_hit, expected_details = original_contains(artist, mouse_event)
+        assert is_hit == expected_is_hit
+        assert set(details['ind']) == set(expected_details['ind'])
+
+
+def create_mouse_events(figure, rng, num):
+    return [MouseEvent('button_press_event', figure.canvas, x, y)
+            for x, y in rng.random((num, 2)) * figure.bbox.size]
+
+
+def test_scatter_quib_is_picked_using_pixel_index(axes, rng):
+    scatter = axes.scatter(iquib(rng.random(2000)), iquib(rng.random(2000)), s=iquib(rng.random(2000) * 100))
+    artist: PathCollection = scatter.handler.get_artists()[0]
+
+    assert_contains_as_matplotlib(artist, create_mouse_events(axes.figure, rng, 100))
+    assert get_up_to_date_pixel_grid_index(artist) is not None
+
+
+@pytest.mark.parametrize('point_in_path_collection', [
+    None,
+    mock.Mock(side_effect=TypeError),
+])
+def test_scatter_quib_is_picked_by_matplotlib_when_hit_test_is_unavailable(axes, rng, point_in_path_collection):
+    scatter = axes.scatter(iquib(rng.random(2000)), iquib(rng.random(2000)))
+    artist: PathCollection = scatter.handler.get_artists()[0]
+
+    with mock.patch('pyquibbler.quib.graphics.event_handling.spatial_index.point_in_path_collection',
+                    point_in_path_collection):
+        assert_contains_as_matplotlib(artist, create_mouse_events(axes.figure, rng, 20))
+    assert point_in_path_collection is None or point_in_path_collection.called
+
+
+def test_plot_quib_is_picked_using_pixel_index(axes, rng):
+    line_quib = axes.plot(iquib(rng.random(2000)), iquib(rng.random(2000)), 'o')
+    artist: Line2D = line_quib.handler.get_artists()[0]
+
+    assert_contains_as_matplotlib(artist, create_mouse_events(axes.figure, rng, 100))
+    assert get_up_to_date_pixel_grid_index(artist) is not None
+
+
+def test_plot_quib_with_segments_is_picked_by_matplotlib(axes, rng):
+    line_quib = axes.plot(iquib(np.sort(rng.random(2000))), iquib(rng.random(2000)), 'o-')
+    artist: Line2D = line_quib.handler.get_artists()[0]
+
+    assert_contains_as_matplotlib(artist, create_mouse_events(axes.figure, rng, 20))
+    assert get_up_to_date_pixel_grid_index(artist) is None
+
+
+def test_pixel_index_is_rebuilt_upon_change_of_axes_limits(axes, rng):
+    scatter = axes.scatter(iquib(rng.random(2000)), iquib(rng.random(2000)))
+    artist = scatter.handler.get_artists()[0]
+    mouse_events = create_mouse_events(axes.figure, rng, 20)
+    assert_contains_as_matplotlib(artist, mouse_events)
+
+    axes.set_xlim(0.2, 0.3)
+    assert get_up_to_date_pixel_grid_index(artist) is None
+    assert_contains_as_matplotlib(artist, mouse_events)
+
+
+def test_non_quib_artists_are_not_indexed(axes, rng):
+    artist, = axes.plot(rng.random(2000), 'o')
+    artist.contains(create_mouse_events(axes.figure, rng, 1)[0])
+
+    assert get_up_to_date_pixel_grid_index(artist) is None
@@ -12,7 +12,8 @@ from pyquibbler import iquib
 from pyquibbler.function_definitions import add_definition_for_function
 from pyquibbler.function_definitions.func_definition import create_or_reuse_func_definition
 from pyquibbler.quib.factory import create_quib
-from pyquibbler.quib.graphics.redraw import aggregate_redraw_mode, redraw_figures
+from pyquibbler.quib.graphics import redraw
+from pyquibbler.quib.graphics.redraw import aggregate_redraw_mode, redraw_figures, start_dragging, end_dragging
 from weakref import ref
 
 
@@ -42,6 +43,58 @@ def test_redraw_axes_happy_flow(figure):
     figure.canvas.draw.assert_called_once()
 
 
+def test_redraw_figures_in_aggregate_mode_draws_each_canvas_once(figure):
+    with aggregate_redraw_mode():
+        redraw_figures({figure})
+        redraw_figures({figure})
+        figure.canvas.draw.assert_not_called()
+
+    figure.canvas.draw.assert_called_once()
+
+
+@pytest.fixture
+def mock_figures():
+    plt.close("all")
+    figures = [plt.figure() for _ in range(3)]
+    for figure in figures:
+        figure.canvas = Mock()
+    yield figures
+    plt.close("all")
+
+
+def test_redraw_figures_defers_canvases_beyond_frame_budget_while_dragging(mock_figures, monkeypatch):
+    monkeypatch.setattr(redraw, 'REDRAW_FRAME_BUDGET_SECONDS', 0.)
+    start_dragging(79)
+    try:
+        redraw_figures(set(mock_figures))
+    finally:
+        end_dragging(79)
+
+    assert sum(figure.canvas.draw.call_count for figure in mock_figures) == 0
+    assert all(figure.canvas.draw_idle.call_count == 1 for figure in mock_figures)
+
+
+def test_redraw_figures_defers_non_visible_canvases_while_dragging(mock_figures):
+    visible_figure, hidden_figure, _ = mock_figures
+    hidden_figure.canvas.manager.window.isVisible.return_value = False
+    start_dragging(79)
+    try:
+        redraw_figures({visible_figure, hidden_figure})
+    finally:
+        end_dragging(79)
+
+    visible_figure.canvas.draw.assert_called_once()
+    hidden_figure.canvas.draw.assert_not_called()
+    hidden_figure.canvas.draw_idle.assert_called_once()
+
+
+def test_redraw_figures_draws_all_canvases_when_not_dragging(mock_figures, monkeypatch):
+    monkeypatch.setattr(redraw, 'REDRAW_FRAME_BUDGET_SECONDS', 0.)
+    redraw_figures(set(mock_figures))
+
+    assert all(figure.canvas.draw.call_count == 1 for figure in mock_figures)
+
+
 def test_redraw_in_aggregate_mode():
     mock_func = mock.Mock()
     quib = iquib(1)
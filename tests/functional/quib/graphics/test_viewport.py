@@ -0,0 +1,187 @@
+import numpy as np
+import pytest
+
+from pyquibbler import iquib
+from pyquibbler.quib.graphics.decimation import get_minmax_decimation_indices, get_lttb_decimation_indices
+from pyquibbler.utilities.input_validation_utils import UnknownEnumException
+from pyquibbler.quib.graphics.viewport import get_visible_index_range, get_visible_index_range_of_monotonic_data
+
+
+@pytest.fixture
+def viewport_project(project):
+    project.viewport_evaluation = True
+    return project
+
+
+@pytest.fixture
+def small_axes(axes):
+    axes.figure.set_size_inches(2, 2)
+    axes.figure.set_dpi(100)
+    axes.set_position([0, 0, 1, 1])
+    return axes
+
+
+def test_viewport_evaluation_is_off_by_default(project):
+    assert project.viewport_evaluation is False
+
+
+def test_viewport_evaluation_validates_input(project):
+    with pytest.raises(Exception, match='.*viewport_evaluation.*'):
+        project.viewport_evaluation = 'yes'
+
+
+def test_minmax_decimation_keeps_short_data():
+    assert np.array_equal(get_minmax_decimation_indices(np.arange(10), 5), np.arange(10))
+
+
+def test_minmax_decimation_keeps_extremes_of_each_bin():
+    y = np.array([0, 5, -3, 1, 2, 9, 4, 4, 7, -1, 3])
+    indices = get_minmax_decimation_indices(y, 3)
+
+    assert np.array_equal(indices, [0, 1, 2, 4, 5, 8, 9, 10])
+
+
+def test_lttb_decimation_keeps_first_last_and_peaks():
+    y = np.array([0, 0, 5, 0, 0, -3, 0, 0, 0])
+    indices = get_lttb_decimation_indices(None, y, 5)
+
+    assert np.array_equal(indices, [0, 2, 3, 5, 8])
+
+
+def test_lttb_decimation_returns_requested_number_of_sorted_indices():
+    x = np.arange(10000) ** 2
+    indices = get_lttb_decimation_indices(x, np.sin(np.arange(10000) / 100.), 100)
+
+    assert len(indices) == 100
+    assert np.all(np.diff(indices) > 0)
+
+
+@pytest.mark.parametrize(['lim', 'expected'], [
+    ((-0.5, 9.5), (0, 10)),
+    ((2.2, 4.7), (2, 6)),
+    ((4.7, 2.2), (2, 6)),
+    ((20, 30), (9, 10)),
+])
+def test_get_visible_index_range(lim, expected):
+    assert get_visible_index_range(lim, -0.5, 9.5, 10) == expected
+
+
+def test_get_visible_index_range_of_monotonic_data():
+    assert get_visible_index_range_of_monotonic_data((2.5, 4.5), np.arange(10.)) == (2, 6)
+
+
+def test_imshow_is_downsampled_to_axes_pixels(viewport_project, small_axes):
+    a = iquib(np.arange(1000 * 800).reshape((1000, 800)))
+    img = small_axes.imshow(a * 2)
+    small_axes.set_xlim(-0.5, 799.5)
+    small_axes.set_ylim(999.5, -0.5)
+
+    image = img.handler.get_artists()[0]
+    assert image.get_array().shape == (200, 200)
+    assert np.array_equal(image.get_array(), (a.get_value() * 2)[::5, ::4])
+    assert image.get_extent() == [-0.5, 799.5, 999.5, -0.5]
+
+
+def test_imshow_is_cropped_to_axes_limits(viewport_project, small_axes):
+    a = iquib(np.arange(1000 * 800).reshape((1000, 800)))
+    b = a * 2
+    img = small_axes.imshow(b)
+    small_axes.set_xlim(99.5, 149.5)
+    small_axes.set_ylim(299.5, 199.5)
+
+    image = img.handler.get_artists()[0]
+    assert np.array_equal(image.get_array(), b.get_value()[200:300, 100:150])
+
+
+def test_imshow_only_calculates_the_visible_part_of_its_data(viewport_project, small_axes):
+    a = iquib(np.arange(100 * 100).reshape((100, 100)))
+    b = a * 2
+    small_axes.set_xlim(9.5, 19.5)
+    small_axes.set_ylim(19.5, 9.5)
+    small_axes.imshow(b)
+
+    cache = b.handler.quib_function_call.cache
+    assert len(cache.get_uncached_paths([])) > 0
+
+
+def test_imshow_is_not_affected_by_limits_when_viewport_evaluation_is_off(project, small_axes):
+    a = iquib(np.arange(1000 * 800).reshape((1000, 800)))
+    img = small_axes.imshow(a)
+    small_axes.set_xlim(99.5, 149.5)
+
+    assert img.handler.get_artists()[0].get_array().shape == (1000, 800)
+
+
+def test_plot_is_decimated_with_index_map(viewport_project, small_axes):
+    y = iquib(np.sin(np.arange(100000) / 1000.))
+    line_quib = small_axes.plot(y, 'r')
+
+    line = line_quib.handler.get_artists()[0]
+    index_map = line_quib.handler.quib_function_call.get_index_map(0)
+    assert len(line.get_xdata()) <= 2 * 200 + 2
+    assert np.array_equal(line.get_xdata(), index_map)
+    assert np.array_equal(line.get_ydata(), y.get_value()[index_map])
+
+
+def test_plot_is_cropped_to_axes_limits(viewport_project, small_axes):
+    x = iquib(np.arange(100000) / 10.)
+    y = iquib(np.arange(100000) * 2.)
+    line_quib = small_axes.plot(x, y)
+    small_axes.set_xlim(500, 510)
+
+    line = line_quib.handler.get_artists()[0]
+    assert line.get_xdata()[0] < 500 <= line.get_xdata()[1]
+    assert line.get_xdata()[-2] <= 510 < line.get_xdata()[-1]
+    assert np.array_equal(line.get_ydata(), line.get_xdata() * 20)
+
+
+def test_drag_cropped_plot_assigns_to_data_index(viewport_project, small_axes,
+                                                 create_axes_mouse_press_move_release_events):
+    y = iquib(np.zeros(1000))
+    small_axes.plot(y, 'o')
+    small_axes.set_xlim(500, 510)
+    small_axes.set_ylim(-10, 10)
+
+    create_axes_mouse_press_move_release_events(((505, 0), (505, 5)))
+
+    assert np.flatnonzero(y.get_value()).tolist() == [505]
+    assert y.get_value()[505] == pytest.approx(5, abs=0.2)
+
+
+@pytest.mark.parametrize('decimate', ['minmax', 'lttb'])
+def test_plot_with_decimate_kwarg(project, small_axes, decimate):
+    y = iquib(np.sin(np.arange(100000) / 1000.))
+    line_quib = small_axes.plot(y, quibbler_decimate=decimate)
+
+    line = line_quib.handler.get_artists()[0]
+    assert 200 <= len(line.get_xdata()) <= 2 * 200 + 2
+    assert np.array_equal(line.get_ydata(), y.get_value()[line.get_xdata()])
+
+
+def test_plot_with_decimate_kwarg_is_re_decimated_upon_zoom(project, small_axes):
+    y = iquib(np.arange(100000) * 2.)
+    line_quib = small_axes.plot(y, quibbler_decimate='lttb')
+    small_axes.set_xlim(500, 520)
+
+    line = line_quib.handler.get_artists()[0]
+    assert np.array_equal(line.get_xdata(), np.arange(499, 522))
+
+
+def test_plot_with_decimate_kwarg_as_quib(project, small_axes):
+    y = iquib(np.sin(np.arange(100000) / 1000.))
+    decimate = iquib('minmax')
+    line_quib = small_axes.plot(y, quibbler_decimate=decimate)
+    decimate.assign('lttb')
+
+    assert len(line_quib.handler.get_artists()[0].get_xdata()) == 2 * 200
+
+
+def test_plot_with_invalid_decimate_kwarg_raises(project, small_axes):
+    with pytest.raises(UnknownEnumException):
+        small_axes.plot(iquib([1, 2, 3]), quibbler_decimate='every_other')
+
+
+def test_plot_of_non_quib_data_ignores_decimate_kwarg(small_axes):
+    line, = small_axes.plot(np.arange(10000), quibbler_decimate='lttb')
+
+    assert len(line.get_xdata()) == 10000
@@ -3,8 +3,9 @@ from unittest import mock
 import numpy as np
 import pytest
 
-from pyquibbler import q
+from pyquibbler import q, iquib
 from pyquibbler.path import PathComponent
+from pyquibbler.quib.func_calling.func_calls.axis_accumulation_call import AxisAccumulationQuibFuncCall
 from tests.functional.quib.test_quib.get_value.test_apply_along_axis import parametrize_data
 from tests.functional.quib.test_quib.get_value.utils import check_get_value_valid_at_path
 
@@ -39,3 +40,66 @@ def test_accumulation_axiswise_get_value_valid_at_path_with_list_arg(indices_to_
     b.get_value_valid_at_path([PathComponent(indices_to_get_value_at)])
     assert mock_func_a.call_count == expected_a_calls
     assert mock_func_b.call_count == expected_b_calls
+
+
+@pytest.mark.parametrize('func', [np.cumsum, np.cumprod, np.nancumsum])
+@pytest.mark.parametrize('axis', [0, -1, None])
+def test_accumulation_resumes_from_first_invalidated_element(func, axis):
+    data = np.arange(1., 25.).reshape((4, 6)) / 7
+    data[0, 1] = np.nan
+    a = iquib(data)
+    quib = func(a, axis=axis)
+    quib.get_value()
+    num_in_place_evaluations = quib.stats.num_in_place_evaluations
+
+    a[2, 3] = 10.
+    data[2, 3] = 10.
+
+    assert np.array_equal(quib.get_value(), func(data, axis=axis), equal_nan=True)
+    assert quib.stats.num_in_place_evaluations == num_in_place_evaluations + 1
+
+
+@pytest.mark.parametrize('axis', [0, None])
+def test_accumulation_of_a_requested_element_resumes_from_first_invalid_element(axis):
+    data = np.arange(12.).reshape((6, 2))
+    a = iquib(data)
+    quib = np.cumsum(a, axis=axis)
+    quib.get_value()
+
+    a[1, 0] = 100.
+    data[1, 0] = 100.
+
+    assert quib[4].get_value().tolist() == np.cumsum(data, axis=axis)[4].tolist()
+    assert np.array_equal(quib.get_value(), np.cumsum(data, axis=axis))
+
+
+def test_accumulation_with_dtype_resumes_from_first_invalidated_element():
+    data = np.array([1, 2, 3, 4])
+    a = iquib(data)
+    quib = np.cumsum(a, dtype=float)
+    quib.get_value()
+
+    a[2] = 10
+    data[2] = 10
+
+    result = quib.get_value()
+    assert result.dtype == float
+    assert np.array_equal(result, np.cumsum(data, dtype=float))
+    assert quib.stats.num_in_place_evaluations == 1
+
+
+def test_accumulation_with_rejected_partial_result_is_evaluated_once():
+    data = np.arange(1., 7.)
+    a = iquib(data)
+    quib = np.cumsum(a)
+    quib.get_value()
+    num_evaluations = quib.stats.num_evaluations
+
+    a[3] = 10.
+    data[3] = 10.
+    with mock.patch.object(AxisAccumulationQuibFuncCall, '_get_dtype_of_partial_call',
+                           return_value=np.dtype(np.int8)):
+        assert np.array_equal(quib.get_value(), np.cumsum(data))
+
+    assert quib.stats.num_evaluations == num_evaluations + 1
+    assert quib.stats.num_in_place_evaluations == 0
@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from pyquibbler import iquib, CacheMode
+from pyquibbler.quib.func_calling.cached_quib_func_call import CachedQuibFuncCall
+from pyquibbler.quib.func_calling.fused_evaluation import call_elementwise_func, is_fusable_into_child
+from pyquibbler.utilities.get_original_func import get_original_func
+from pyquibbler.utilities.input_validation_utils import InvalidArgumentTypeException
+
+
+np_multiply = get_original_func(np.multiply)
+np_true_divide = get_original_func(np.true_divide)
+
+
+@pytest.fixture
+def fused_project(project, monkeypatch):
+    # quibs whose cache is forced on are not fused:
+    monkeypatch.setattr(CachedQuibFuncCall, 'DEFAULT_CACHE_MODE', CacheMode.AUTO)
+    project.fuse_elementwise_chains = True
+    return project
+
+
+def test_fuse_elementwise_chains_is_off_by_default(project):
+    assert project.fuse_elementwise_chains is False
+
+
+def test_fuse_elementwise_chains_validates_input(project):
+    with pytest.raises(InvalidArgumentTypeException, match='.*'):
+        project.fuse_elementwise_chains = 1
+
+
+def test_call_elementwise_func_writes_into_temporary_argument():
+    temporary = np.array([1., 2., 3.])
+
+    result, is_temporary = call_elementwise_func(np_multiply, (temporary, 2), {}, [temporary])
+
+    assert result is temporary and is_temporary
+    assert np.array_equal(temporary, [2., 4., 6.])
+
+
+def test_call_elementwise_func_does_not_write_into_temporary_of_different_dtype():
+    temporary = np.array([1, 2, 3])
+
+    result, is_temporary = call_elementwise_func(np_true_divide, (temporary, 2), {}, [temporary])
+
+    assert result is not temporary and is_temporary
+    assert np.array_equal(temporary, [1, 2, 3])
+    assert np.array_equal(result, [0.5, 1., 1.5])
+
+
+def test_call_elementwise_func_does_not_write_into_non_temporary_argument():
+    argument = np.array([1., 2., 3.])
+
+    result, _ = call_elementwise_func(np_multiply, (argument, 2), {}, [])
+
+    assert result is not argument
+    assert np.array_equal(argument, [1., 2., 3.])
+
+
+def test_fused_evaluation_of_elementwise_expression(fused_project):
+    a = iquib(np.arange(5.))
+    b = iquib(np.arange(5.))
+    c = np.sin(a) * 2 + b ** 2 - 1
+    parents = c.get_ancestors() - {a, b}
+
+    assert np.array_equal(c.get_value(), np.sin(np.arange(5.)) * 2 + np.arange(5.) ** 2 - 1)
+    assert all(is_fusable_into_child(parent) for parent in parents)
+    assert all(parent.handler.quib_function_call.cache is None for parent in parents)
+    assert all(parent.stats.num_evaluations == 1 for parent in parents)
+
+
+def test_fused_evaluation_does_not_change_source_values(fused_project):
+    a = iquib(np.arange(5.))
+    b = np.negative(a)
+    c = b * 2 + 1
+
+    c.get_value()
+
+    assert np.array_equal(a.get_value(), np.arange(5.))
+
+
+def test_fused_evaluation_with_changing_dtype(fused_project):
+    a = iquib(np.array([1, 2, 3]))
+    b = (a + 1) / 2 > 1
+
+    assert np.array_equal(b.get_value(), [False, True, True])
+
+
+def test_fused_evaluation_of_list_operators(fused_project):
+    a = iquib([1, 2])
+    b = (a + [3]) * 2
+
+    assert b.get_value() == [1, 2, 3, 1, 2, 3]
+
+
+def test_fused_evaluation_of_non_elementwise_child(fused_project):
+    a = iquib(np.arange(5.))
+    b = np.sum(a * 2 + 1)
+
+    assert b.get_value() == 25.
+
+
+def test_fused_evaluation_after_partial_invalidation(fused_project):
+    a = iquib(np.arange(5.))
+    c = (a * 2 + 1) ** 2
+    c.get_value()
+
+    a[2] = 10.
+
+    assert np.array_equal(c.get_value(), [1., 9., 441., 49., 81.])
+
+
+def test_inverse_assignment_through_fused_chain(fused_project):
+    a = iquib(np.arange(5.))
+    c = (a * 2 + 1) ** 2
+    c.get_value()
+
+    c[2] = 81.
+
+    assert np.array_equal(a.get_value(), [0., 1., 4., 3., 4.])
+    assert np.array_equal(c.get_value(), [1., 9., 81., 49., 81.])
+
+
+def test_named_quibs_are_not_fused(fused_project):
+    a = iquib(np.arange(5.))
+    b = (a * 2).setp(assigned_name='b')
+    c = b + 1
+
+    assert not is_fusable_into_child(b)
+    assert np.array_equal(c.get_value(), np.arange(5.) * 2 + 1)
+
+
+def test_quibs_with_several_children_are_not_fused(fused_project):
+    a = iquib(np.arange(5.))
+    b = a * 2
+    c = b + 1
+    d = b - 1
+
+    assert not is_fusable_into_child(b)
+    assert np.array_equal(c.get_value(), np.arange(5.) * 2 + 1)
+    assert np.array_equal(d.get_value(), np.arange(5.) * 2 - 1)
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from pyquibbler import iquib, quiby
+
+
+def test_get_value_future_returns_value():
+    a = iquib(3)
+    b = a ** 2 + a
+
+    assert b.get_value_future().result(timeout=5) == 12
+
+
+def test_get_value_async_returns_value():
+    a = iquib(3)
+    b = a ** 2
+
+    assert asyncio.run(b.get_value_async()) == 9
+
+
+def test_get_value_future_calculates_in_background_thread():
+    threads = []
+    a = iquib(3)
+    b = quiby(lambda x: threads.append(threading.current_thread()) or x)(a)
+
+    assert b.get_value_future().result(timeout=5) == 3
+    assert threads[0] is not threading.main_thread()
+
+
+def test_get_value_future_calculates_independent_parents_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    @quiby
+    def wait_for_other_branch(x):
+        barrier.wait()
+        return x
+
+    a = iquib(1)
+    b = wait_for_other_branch(a)
+    c = wait_for_other_branch(a + 1)
+    d = b + c
+
+    assert d.get_value_future().result(timeout=10) == 3
+
+
+def test_get_value_future_is_shared_while_pending():
+    release = threading.Event()
+    a = iquib(3)
+    b = quiby(lambda x: release.wait() and x)(a)
+
+    future = b.get_value_future()
+    assert b.get_value_future() is future
+    release.set()
+    assert future.result(timeout=5) == 3
+
+
+def test_get_value_future_is_cancelled_upon_invalidation():
+    started = threading.Event()
+    release = threading.Event()
+
+    @quiby
+    def blocking_square(x):
+        started.set()
+        release.wait()
+        return x ** 2
+
+    a = iquib(3)
+    b = blocking_square(a)
+    future = b.get_value_future()
+    started.wait(timeout=5)
+    a.assign(4)
+    release.set()
+
+    with pytest.raises(CancelledError):
+        future.result(timeout=5)
+    assert b.get_value_future().result(timeout=5) == 16
+
+
+def test_get_value_future_delivers_value_to_callbacks_in_main_thread():
+    callback_calls = []
+    a = iquib(3)
+    b = a ** 2
+    b.add_callback(lambda value: callback_calls.append((value, threading.current_thread())))
+
+    b.get_value_future().result(timeout=5)
+
+    assert callback_calls == [(9, threading.main_thread())]
+
+
+def test_get_value_future_evaluates_graphics_quib_in_main_thread():
+    threads = []
+    a = iquib(3)
+    b = a ** 2
+    c = quiby(lambda x: threads.append(threading.current_thread()) or x, is_graphics=True)(b)
+
+    assert c.get_value_future().result(timeout=5) == 9
+    assert threads[-1] is threading.main_thread()
+
+
+def test_get_value_future_raises_exception_of_calculation():
+    a = iquib(0)
+    b = quiby(lambda x: 1 / x)(a)
+
+    assert isinstance(b.get_value_future().exception(timeout=5), ZeroDivisionError)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from pyquibbler import iquib
+from pyquibbler.quib import consts
+from pyquibbler.quib.func_calling.out_of_core_evaluation import evaluate_elementwise_in_chunks, \
+    evaluate_reduction_in_chunks, is_memory_mapped_array
+from pyquibbler.utilities.get_original_func import get_original_func
+from pyquibbler.utilities.input_validation_utils import InvalidArgumentTypeException
+
+
+np_add = get_original_func(np.add)
+np_sum = get_original_func(np.sum)
+np_median = get_original_func(np.median)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # chunks of 3 rows of float64 arrays with 4 columns:
+    monkeypatch.setattr(consts, 'OUT_OF_CORE_CHUNK_BYTES', 3 * 4 * 8)
+
+
+@pytest.fixture
+def data():
+    return np.arange(40.).reshape((10, 4))
+
+
+@pytest.fixture
+def out_of_core_project(project, small_chunks):
+    project.out_of_core_evaluation = True
+    return project
+
+
+@pytest.fixture
+def memory_mapped_quib(data, tmp_path):
+    path = tmp_path / 'data.npy'
+    np.save(path, data)
+    return np.load(iquib(str(path)), mmap_mode='r')
+
+
+def test_out_of_core_evaluation_is_off_by_default(project):
+    assert project.out_of_core_evaluation is False
+
+
+def test_out_of_core_evaluation_validates_input(project):
+    with pytest.raises(InvalidArgumentTypeException, match='.*'):
+        project.out_of_core_evaluation = 1
+
+
+def test_evaluate_elementwise_in_chunks_with_broadcast_args(small_chunks, data):
+    result = evaluate_elementwise_in_chunks(np_add, data, np.arange(4.))
+
+    assert is_memory_mapped_array(result)
+    assert np.array_equal(result, data + np.arange(4.))
+
+
+@pytest.mark.parametrize('axis', [0, 1, (0, 1), None])
+@pytest.mark.parametrize('keepdims', [False, True])
+def test_evaluate_reduction_in_chunks(small_chunks, data, axis, keepdims):
+    result = evaluate_reduction_in_chunks(np_sum, np_add, data, axis=axis, keepdims=keepdims)
+
+    assert np.array_equal(result, np.sum(data, axis=axis, keepdims=keepdims))
+
+
+def test_evaluate_non_combinable_reduction_in_chunks(small_chunks, data):
+    assert np.array_equal(evaluate_reduction_in_chunks(np_median, None, data, axis=0), np.median(data, axis=0))
+
+
+def test_out_of_core_elementwise_quib_is_cached_as_memory_mapped_array(out_of_core_project, memory_mapped_quib, data):
+    quib = np.sin(memory_mapped_quib) * 2 + 1
+
+    assert np.array_equal(quib.get_value(), np.sin(data) * 2 + 1)
+    assert is_memory_mapped_array(quib.handler.quib_function_call.cache.get_value())
+
+
+@pytest.mark.parametrize('func', [np.sum, np.min, np.any, np.mean])
+@pytest.mark.parametrize('axis', [0, 1, None])
+def test_out_of_core_reduction(out_of_core_project, memory_mapped_quib, data, func, axis):
+    quib = func(memory_mapped_quib + 1, axis=axis)
+
+    assert np.array_equal(quib.get_value(), func(data + 1, axis=axis))
+
+
+def test_out_of_core_evaluation_after_partial_invalidation(out_of_core_project, memory_mapped_quib, data):
+    offset = iquib(np.zeros(4))
+    quib = memory_mapped_quib + offset
+    quib.get_value()
+
+    offset[2] = 10.
+
+    assert np.array_equal(quib.get_value(), data + [0., 0., 10., 0.])
+
+
+def test_memory_mapped_arrays_are_copied_without_out_of_core_evaluation(project, memory_mapped_quib):
+    quib = np.negative(memory_mapped_quib)
+
+    assert not isinstance(quib.get_value(), np.memmap)
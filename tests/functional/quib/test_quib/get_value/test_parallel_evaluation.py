@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+import pytest
+
+from pyquibbler import iquib, quiby
+from pyquibbler.utilities.input_validation_utils import InvalidArgumentTypeException
+
+
+@pytest.fixture
+def parallel_project(project):
+    project.parallel_evaluation = True
+    return project
+
+
+def test_parallel_evaluation_is_off_by_default(project):
+    assert project.parallel_evaluation is False
+
+
+def test_parallel_evaluation_validates_input(project):
+    with pytest.raises(InvalidArgumentTypeException, match='.*'):
+        project.parallel_evaluation = 1
+
+
+def test_parallel_evaluation_calculates_independent_parents_concurrently(parallel_project):
+    barrier = threading.Barrier(3, timeout=5)
+
+    @quiby
+    def wait_for_other_branches(x):
+        barrier.wait()
+        return x
+
+    a = iquib(np.array([1, 2]))
+    branches = [wait_for_other_branches(a * factor).setp(cache_mode='on') for factor in range(3)]
+    b = np.concatenate(branches)
+
+    assert np.array_equal(b.get_value(), [0, 0, 1, 2, 2, 4])
+
+
+def test_parallel_evaluation_calculates_shared_ancestor_as_often_as_serial_evaluation(project):
+    def _count_shared_ancestor_calculations():
+        calls = []
+        a = iquib(np.array([1, 2, 3]))
+        shared = quiby(lambda x: calls.append(x) or x)(a).setp(cache_mode='on')
+        b = np.concatenate([shared + 1, shared * 2])
+        assert np.array_equal(b.get_value(), [2, 3, 4, 2, 4, 6])
+        return len(calls)
+
+    serial_calculations = _count_shared_ancestor_calculations()
+    project.parallel_evaluation = True
+    assert _count_shared_ancestor_calculations() == serial_calculations
+
+
+def test_parallel_evaluation_passes_data_and_parameter_sources_in_place(parallel_project):
+    a = iquib(np.array([1., 2.]))
+    decimals = iquib(2)
+    b = np.round(a / 3, decimals + 0)
+
+    assert np.array_equal(b.get_value(), [0.33, 0.67])
+
+
+def test_parallel_evaluation_valid_at_path(parallel_project):
+    a = iquib(np.array([1, 2, 3]))
+    b = (a + 1) * (a + 2)
+
+    assert b[1].get_value() == 12
+
+
+def test_parallel_evaluation_raises_exception_of_first_failing_parent(parallel_project):
+    @quiby
+    def fail(x, message):
+        raise ValueError(message)
+
+    a = iquib(1)
+    b = quiby(lambda x, y: x + y)(fail(a, 'first'), fail(a, 'second'))
+
+    with pytest.raises(ValueError, match='first'):
+        b.get_value()
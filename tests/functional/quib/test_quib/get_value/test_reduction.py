@@ -1,8 +1,11 @@
+from unittest import mock
+
 import numpy as np
 import pytest
 
-from pyquibbler import CacheMode
+from pyquibbler import CacheMode, iquib
 from pyquibbler.path import PathComponent
+from pyquibbler.quib.func_calling.func_calls.axis_reduction_call import AxisReductionQuibFuncCall
 from pyquibbler.utilities.iterators import recursively_compare_objects
 from tests.functional.quib.test_quib.get_value.test_apply_along_axis import parametrize_keepdims, \
     parametrize_where, parametrize_data
@@ -63,3 +66,54 @@ def test_quib_get_value_valid_at_path_with_data_source_kwarg():
 
     assert len(paths) == 1
     assert [] not in paths
+
+
+@pytest.mark.parametrize('func', [np.sum, np.mean, np.prod, np.min, np.max])
+@pytest.mark.parametrize(['axis', 'keepdims'], [
+    (0, False),
+    (-1, False),
+    ((0, 2), False),
+    (1, True),
+])
+def test_reduction_recalculates_only_invalidated_elements(func, axis, keepdims):
+    data = np.arange(24.).reshape((2, 3, 4))
+    a = iquib(data)
+    quib = func(a, axis=axis, keepdims=keepdims)
+    quib.get_value()
+    num_in_place_evaluations = quib.stats.num_in_place_evaluations
+
+    a[1, 2, 3] = 100.
+    data[1, 2, 3] = 100.
+
+    assert np.array_equal(quib.get_value(), func(data, axis=axis, keepdims=keepdims))
+    assert quib.stats.num_in_place_evaluations == num_in_place_evaluations + 1
+
+
+def test_reduction_with_where_recalculates_whole_result():
+    data = np.arange(12.).reshape((3, 4))
+    where = np.array([True, False, True, True])
+    a = iquib(data)
+    quib = np.sum(a, axis=1, where=where)
+    quib.get_value()
+
+    a[1, 0] = 100.
+    data[1, 0] = 100.
+
+    assert np.array_equal(quib.get_value(), np.sum(data, axis=1, where=where))
+    assert quib.stats.num_in_place_evaluations == 0
+
+
+def test_reduction_with_rejected_partial_result_is_evaluated_once():
+    data = np.arange(12.).reshape((3, 4))
+    a = iquib(data)
+    quib = np.sum(a, axis=1)
+    quib.get_value()
+    num_evaluations = quib.stats.num_evaluations
+
+    a[1, 0] = 100.
+    data[1, 0] = 100.
+    with mock.patch.object(AxisReductionQuibFuncCall, '_get_dtype_of_partial_call', return_value=np.dtype(np.int8)):
+        assert np.array_equal(quib.get_value(), np.sum(data, axis=1))
+
+    assert quib.stats.num_evaluations == num_evaluations + 1
+    assert quib.stats.num_in_place_evaluations == 0
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from pyquibbler import iquib
+from pyquibbler.cache import NdTiledArrayCache, CacheStatus
+from pyquibbler.path import PathComponent
+
+
+@pytest.fixture
+def tiled_project(project):
+    project.cache_tile_shape = (4, 4)
+    return project
+
+
+def test_cache_tile_shape_is_none_by_default(project):
+    assert project.cache_tile_shape is None
+
+
+@pytest.mark.parametrize('tile_shape', [(0, 4), (4, 'a'), [4, 4]])
+def test_cache_tile_shape_validates_input(project, tile_shape):
+    with pytest.raises(Exception, match='.*cache_tile_shape.*'):
+        project.cache_tile_shape = tile_shape
+
+
+def test_tiled_quib_invalidates_and_recalculates_whole_tiles(tiled_project):
+    a = iquib(np.arange(100).reshape((10, 10)))
+    b = a * 2
+    c = b + 1
+    c.get_value()
+
+    a[5, 5] = 0
+
+    cache = c.handler.quib_function_call.cache
+    assert isinstance(cache, NdTiledArrayCache)
+    assert cache.get_uncached_paths([PathComponent((0, 0))]) == []
+    assert cache.get_uncached_paths([]) == [[PathComponent((slice(4, 8), slice(4, 8)))]]
+
+    assert c.get_value_valid_at_path([PathComponent((5, 5))])[5, 5] == 1
+    assert c.cache_status == CacheStatus.ALL_VALID
+    assert b.cache_status == CacheStatus.ALL_VALID
+    assert np.array_equal(c.get_value(), a.get_value() * 2 + 1)
+
+
+def test_tiled_quib_requests_parents_at_referenced_tiles(tiled_project):
+    a = iquib(np.arange(100).reshape((10, 10)))
+    b = a * 2
+    c = b + 1
+
+    c.get_value_valid_at_path([PathComponent((slice(0, 2), slice(0, 2)))])
+    c.get_value_valid_at_path([PathComponent((slice(0, 2), slice(0, 2)))])
+
+    assert b.handler.quib_function_call.cache.get_uncached_paths([PathComponent((slice(0, 4), slice(0, 4)))]) == []
+    assert b.cache_status == CacheStatus.PARTIAL
@@ -85,3 +85,23 @@ def test_transpositional_get_value_minors_2(create_quib_with_return_value):
     a = iquib(np.array([1, 2, 3, 4]))
     b = np.repeat([a], 3, 0)
     assert np.array_equal(b.get_value(), np.repeat([a.get_value()], 3, 0))
+
+
+@pytest.mark.parametrize('func', [
+    lambda q: np.transpose(q, (2, 0, 1)),
+    lambda q: np.swapaxes(q, 1, 2),
+    lambda q: np.flip(q),
+    lambda q: np.rot90(q, 3),
+    lambda q: np.reshape(q, (3, 8), order='F'),
+    lambda q: np.ravel(q),
+    lambda q: q[:, ::-1, 1:3],
+    lambda q: q[1, ..., 2:, None],
+])
+@pytest.mark.parametrize('indices_to_get_value_at', [-1, 0, (1, 1), (0, ...), (slice(None), 0)])
+def test_index_mapping_translation_get_value(func, indices_to_get_value_at):
+    data = np.arange(24).reshape((2, 3, 4))
+    result_shape = np.shape(func(data))
+    if len(result_shape) < 2 and isinstance(indices_to_get_value_at, tuple):
+        pytest.skip()
+    path_to_get_value_at = [PathComponent(indices_to_get_value_at)]
+    check_get_value_valid_at_path(func, data, path_to_get_value_at)
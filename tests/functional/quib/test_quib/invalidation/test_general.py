@@ -3,10 +3,13 @@ from unittest import mock
 import numpy as np
 import pytest
 
+from pyquibbler import iquib
 from pyquibbler.function_definitions import add_definition_for_function
 from pyquibbler.function_definitions.func_definition import create_or_reuse_func_definition
 from pyquibbler.quib.factory import create_quib
 from pyquibbler.quib.graphics import GraphicsUpdateType
+from pyquibbler.quib.quib import QuibHandler
+from pyquibbler.path import PathComponent, FailedToDeepAssignException
 
 
 def test_quib_does_not_request_shape_or_parents_shapes_on_first_attempt(create_mock_quib):
@@ -50,3 +53,45 @@ def test_invalidation_does_not_request_shape(create_quib_with_return_value):
 
     a[0] = 7
     func.assert_not_called(),
+
+
+@pytest.mark.parametrize('func', [
+    lambda a, b: a + b,
+    lambda a, b: np.transpose(a)[::2] * 2,
+    lambda a, b: np.sum(a, axis=0),
+    lambda a, b: np.concatenate([a, b]),
+])
+def test_invalidation_does_not_get_the_values_of_overridden_parents(func):
+    a = iquib(np.zeros((4, 6)))
+    b = iquib(np.zeros((4, 6)))
+    a[1, 2] = 10
+    c = func(a, b)
+    c.get_value()
+
+    with mock.patch.object(QuibHandler, 'get_value_valid_at_path', side_effect=AssertionError):
+        a.handler.invalidate_and_aggregate_redraw_at_path([PathComponent((3, 4))])
+
+    assert np.array_equal(c.get_value(), func(a.get_value(), b.get_value()))
+
+
+def test_invalidation_raises_on_assignment_out_of_the_shape_of_an_array():
+    a = iquib(np.zeros(3))
+    b = a + 10
+    b.get_value()
+
+    with pytest.raises(FailedToDeepAssignException):
+        a.assign(1, 4)
+
+
+def test_invalidation_with_assignments_into_fields_of_a_field_array():
+    a = iquib(np.zeros(4, dtype=[('x', float), ('y', int)]))
+    b = a['x']
+    c = a[1:3]
+    b.get_value()
+    c.get_value()
+
+    a['x'][0] = 5
+    a['y'][2] = 3
+
+    assert np.array_equal(b.get_value(), [5, 0, 0, 0])
+    assert c.get_value().tolist() == [(0., 0), (0., 3)]
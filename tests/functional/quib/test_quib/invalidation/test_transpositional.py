@@ -320,3 +320,50 @@ def test_assignments_with_quib_index():
 ])
 def test_transpose_invalidation(data, indices_to_invalidate, axes):
     check_invalidation(lambda q: np.transpose(q, axes=axes), data, indices_to_invalidate)
+
+
+@pytest.mark.parametrize('func', [
+    lambda q: np.transpose(q),
+    lambda q: np.transpose(q, (1, 2, 0)),
+    lambda q: np.swapaxes(q, 0, -1),
+    lambda q: np.moveaxis(q, 0, -1),
+    lambda q: np.flip(q, 1),
+    lambda q: np.fliplr(q),
+    lambda q: np.flipud(q),
+    lambda q: np.rot90(q),
+    lambda q: np.rot90(q, 2),
+    lambda q: np.rot90(q, -1, axes=(1, 2)),
+    lambda q: np.reshape(q, (4, 6)),
+    lambda q: np.reshape(q, (6, 4), order='F'),
+    lambda q: np.ravel(q),
+    lambda q: np.expand_dims(q, 1),
+    lambda q: q[1, ::-2],
+    lambda q: q[:, 1:, None, ::3],
+    lambda q: q[..., -1],
+    lambda q: q[5:],
+])
+@pytest.mark.parametrize('indices_to_invalidate', [[0], [(1, 2)], [(-1, 0, 3)], [(0, slice(None), 1)]])
+def test_invalidation_of_index_mapping_translation(func, indices_to_invalidate):
+    check_invalidation(func, np.arange(24).reshape((2, 3, 4)), indices_to_invalidate)
+
+
+def test_index_mapping_translation_does_not_run_func_on_index_codes():
+    a = iquib(np.arange(24).reshape((2, 3, 4)))
+    b = np.transpose(a)[1:, ::2]
+    b.get_value()
+
+    with mock.patch('pyquibbler.path_translation.translators.transpositional.run_func_call_with_new_args_kwargs',
+                    side_effect=AssertionError):
+        a[1, 2, 3] = 100
+
+    assert b.get_value()[2, 1, 1] == 100
+
+
+def test_index_mapping_translation_does_not_create_masks_of_whole_arrays():
+    a = iquib(np.arange(24).reshape((2, 3, 4)))
+    b = np.transpose(a)[1:, ::2]
+    b.get_value()
+
+    with mock.patch('pyquibbler.path_translation.translators.index_mapping.np_zeros', side_effect=AssertionError):
+        a[1, :, 1:3] = 100
+        assert np.array_equal(b[:, 1].get_value(), [[9, 100], [10, 100], [11, 23]])
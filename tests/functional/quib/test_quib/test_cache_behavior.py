@@ -1,7 +1,9 @@
 from unittest import mock
 
+import numpy as np
 import pytest
 
+from pyquibbler import iquib
 from pyquibbler.function_definitions import add_definition_for_function
 from pyquibbler.function_definitions.func_definition import FuncDefinition
 from pyquibbler.utilities.input_validation_utils import InvalidArgumentTypeException, UnknownEnumException
@@ -38,3 +40,63 @@ def test_can_set_quib_cache_mode_to_on_when_random(random_quib):
 
 def test_quib_cache_mode_on_by_default_when_is_random(random_quib):
     assert random_quib.cache_mode == CacheMode.ON
+
+
+def test_ufunc_reevaluation_writes_into_cached_array_upon_partial_invalidation():
+    a = iquib(np.array([1., 2., 3.]))
+    b = (a * 10).setp(cache_mode='on')
+    b.get_value()
+    cached_array = b.handler.quib_function_call.cache.get_value()
+
+    a[1] = 5.
+
+    assert np.array_equal(b.get_value(), [10., 50., 30.])
+    assert b.get_value().base is cached_array
+
+
+def test_ufunc_reevaluation_writes_into_cached_array_upon_whole_invalidation():
+    a = iquib(np.array([1., 2., 3.]))
+    b = (a * 10).setp(cache_mode='on')
+    b.get_value()
+    num_array_allocations = b.stats.num_array_allocations
+
+    a.assign(np.array([4., 5., 6.]))
+
+    assert np.array_equal(b.get_value(), [40., 50., 60.])
+    assert b.stats.num_array_allocations == num_array_allocations
+
+
+def test_ufunc_reevaluation_allocates_new_array_upon_dtype_change():
+    a = iquib(np.array([1., 2., 3.]))
+    b = (a * 10).setp(cache_mode='on')
+    cached_array = b.get_value()
+
+    a.assign(np.array([4, 5, 6]))
+
+    assert np.array_equal(b.get_value(), [40, 50, 60])
+    assert b.get_value().dtype == np.int64
+    assert np.array_equal(cached_array, [10., 20., 30.])
+
+
+def test_ufunc_reevaluation_does_not_write_into_cached_array_held_by_consumer():
+    a = iquib(np.array([1., 2., 3.]))
+    b = (a * 10).setp(cache_mode='on')
+    held_array = b.get_value()
+
+    a.assign(np.array([4., 5., 6.]))
+
+    assert np.array_equal(b.get_value(), [40., 50., 60.])
+    assert np.array_equal(held_array, [10., 20., 30.])
+
+
+def test_ufunc_reevaluation_writes_into_cached_array_released_by_consumer():
+    a = iquib(np.array([1., 2., 3.]))
+    b = (a * 10).setp(cache_mode='on')
+    held_array = b.get_value()
+    num_array_allocations = b.stats.num_array_allocations
+    del held_array
+
+    a.assign(np.array([4., 5., 6.]))
+
+    assert np.array_equal(b.get_value(), [40., 50., 60.])
+    assert b.stats.num_array_allocations == num_array_allocations
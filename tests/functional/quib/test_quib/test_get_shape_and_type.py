@@ -4,7 +4,7 @@ import operator
 import numpy as np
 import pytest
 
-from pyquibbler import create_quib, obj2quib
+from pyquibbler import create_quib, obj2quib, iquib
 from pyquibbler.function_definitions import FuncArgsKwargs
 from pyquibbler.function_definitions.func_definition import create_or_reuse_func_definition
 from pyquibbler.quib.func_calling import QuibFuncCall
@@ -24,11 +24,21 @@ class NoRunNoTypeQuibFuncCall(NoRunQuibFuncCall):
         assert False
 
 
+class NoRunWithShapeQuibFuncCall(NoRunQuibFuncCall):
+    def _calculate_shape(self):
+        self.result_shape = np.shape(self.func_args_kwargs.args[0])
+
+
 def create_type_only_quib(arg):
     return Quib(quib_function_call=NoRunQuibFuncCall(func_args_kwargs=FuncArgsKwargs(None, (arg,), {}),
                                                      func_definition=create_or_reuse_func_definition()))
 
 
+def create_shape_and_type_only_quib(arg):
+    return Quib(quib_function_call=NoRunWithShapeQuibFuncCall(func_args_kwargs=FuncArgsKwargs(None, (arg,), {}),
+                                                              func_definition=create_or_reuse_func_definition()))
+
+
 no_value_or_shape_quib = Quib(quib_function_call=NoRunQuibFuncCall(), func_definition=create_or_reuse_func_definition())
 
 
@@ -71,3 +81,62 @@ def test_quib2quib_can_know_its_type_from_the_type_of_its_argument():
     quib = obj2quib({'a': no_value_or_shape_quib})
     assert quib.get_type() == dict
 
+
+@pytest.mark.parametrize("func, args_values, kwargs, expected_shape", [
+    [np.sin, (np.zeros((3, 4)), ), {}, (3, 4)],
+    [np.add, (np.zeros((3, 1)), np.zeros(4)), {}, (3, 4)],
+    [np.add, (np.zeros((3, 4)), 2.), {}, (3, 4)],
+    [np.sum, (np.zeros((3, 4, 5)), ), {'axis': 1}, (3, 5)],
+    [np.sum, (np.zeros((3, 4, 5)), ), {'axis': (0, -1), 'keepdims': True}, (1, 4, 1)],
+    [np.mean, (np.zeros((3, 4)), ), {'axis': 0}, (4, )],
+    [np.cumsum, (np.zeros((3, 4)), ), {}, (12, )],
+    [np.cumsum, (np.zeros((3, 4)), ), {'axis': 1}, (3, 4)],
+    [np.transpose, (np.zeros((3, 4, 5)), ), {'axes': (2, 0, 1)}, (5, 3, 4)],
+    [np.reshape, (np.zeros((3, 4)), (2, -1)), {}, (2, 6)],
+    [np.tile, (np.zeros((3, 4)), (2, 1)), {}, (6, 4)],
+    [operator.getitem, (np.zeros((3, 4)), (slice(1, None), None)), {}, (2, 1, 4)],
+    [np.zeros_like, (np.zeros((3, 4)), ), {}, (3, 4)],
+])
+def test_quib_can_know_its_shape_without_getting_the_value_of_its_arguments(
+        func, args_values, kwargs, expected_shape):
+    args = [create_shape_and_type_only_quib(args_values[0]), *args_values[1:]]
+    quib = create_quib(func=func, args=args, kwargs=kwargs)
+    assert quib.get_shape() == expected_shape
+    assert quib.get_type() is np.ndarray
+    assert quib.handler.quib_function_call.result_shape is None, "the function should not be evaluated"
+    assert np.shape(func(*args_values, **kwargs)) == expected_shape
+
+
+def test_quib_concatenate_can_know_its_shape_without_getting_the_value_of_its_arguments():
+    a = create_shape_and_type_only_quib(np.zeros((3, 4)))
+    b = create_shape_and_type_only_quib(np.zeros((2, 4)))
+    quib = create_quib(func=np.concatenate, args=([a, b], ))
+    assert quib.get_shape() == (5, 4)
+
+
+def test_quib_chain_can_know_its_shape_and_type_without_evaluating():
+    a = create_shape_and_type_only_quib(np.zeros((3, 4)))
+    quib = np.sum(np.exp(np.transpose(a) + 1)[::2], axis=1)
+    assert quib.get_shape() == (2, )
+    assert quib.get_type() is np.ndarray
+
+
+@pytest.mark.parametrize("func, args, kwargs", [
+    [np.sin, (7., ), {}],
+    [np.sum, (np.zeros((3, 4)), ), {}],
+    [np.quantile, (np.zeros((3, 4)), [0.2, 0.8]), {'axis': 1}],
+    [operator.getitem, (np.zeros((3, 4)), (0, 0)), {}],
+    [operator.mul, ([1, 2], 3), {}],
+])
+def test_quib_evaluates_to_get_its_shape_when_shape_cannot_be_inferred(func, args, kwargs):
+    quib = create_quib(func=func, args=args, kwargs=kwargs)
+    assert quib.get_shape() == np.shape(func(*args, **kwargs))
+    assert quib.handler.quib_function_call.result_shape is not None
+
+
+def test_inferred_shape_is_reset_upon_invalidation():
+    a = iquib(np.zeros((3, 4)))
+    b = np.sum(a, axis=0)
+    assert b.get_shape() == (4, )
+    a.assign(np.zeros((5, 6)))
+    assert b.get_shape() == (6, )
@@ -1,9 +1,11 @@
+import threading
 from unittest import mock
 
 import numpy as np
 import pytest
 from matplotlib.axes import Axes
 
+from pyquibbler import iquib, quiby
 from pyquibbler.function_definitions import add_definition_for_function
 from pyquibbler.function_definitions.func_definition import create_or_reuse_func_definition
 from pyquibbler.path import PathComponent
@@ -207,3 +209,45 @@ def test_inverse_assignment_is_not_invoked_when_axis_lim_is_set_manually(create_
 
     axes.set_xlim([1., 3.])
     assert quib.get_value() == 2.
+
+
+@pytest.fixture()
+def slow_parent_and_background_graphics_quib():
+    release = threading.Event()
+    release.set()
+    values = []
+
+    @quiby
+    def slow_identity(x):
+        release.wait(timeout=5)
+        return x
+
+    a = iquib(1)
+    graphics_quib = quiby(lambda x: values.append(x), is_graphics=True)(slow_identity(a))
+    graphics_quib.graphics_update = 'background'
+    release.clear()
+    return a, graphics_quib, release, values
+
+
+def test_graphics_quib_background_update_keeps_graphics_until_value_is_ready(slow_parent_and_background_graphics_quib):
+    a, graphics_quib, release, values = slow_parent_and_background_graphics_quib
+
+    a.assign(2)
+    assert values == [1]
+
+    release.set()
+    graphics_quib.handler.value_future.result(timeout=5)
+    assert values == [1, 2]
+
+
+def test_graphics_quib_background_update_discards_outdated_values(slow_parent_and_background_graphics_quib):
+    a, graphics_quib, release, values = slow_parent_and_background_graphics_quib
+
+    a.assign(2)
+    outdated_future = graphics_quib.handler.value_future
+    a.assign(3)
+    release.set()
+    graphics_quib.handler.value_future.result(timeout=5)
+
+    assert outdated_future.cancelled()
+    assert values == [1, 3]
@@ -1,3 +1,4 @@
+import gc
 from unittest import mock
 
 import numpy as np
@@ -42,6 +43,36 @@ def test_descendants():
     assert me.get_descendants(depth=2, bypass_intermediate_quibs=True) == {child, great_grand_child}
 
 
+def test_descendants_are_updated_upon_connecting_new_quibs():
+    me = create_quib(func=mock.Mock())
+    child = create_quib(func=mock.Mock(), args=(me,))
+    assert me.get_descendants() == {child}
+
+    grand_child = create_quib(func=mock.Mock(), args=(child,))
+    assert me.get_descendants() == {child, grand_child}
+
+
+def test_descendants_do_not_include_deleted_quibs():
+    me = create_quib(func=mock.Mock())
+    child = create_quib(func=mock.Mock(), args=(me,))
+    grand_child = create_quib(func=mock.Mock(), args=(child,))
+    assert me.get_descendants() == {child, grand_child}
+
+    del grand_child
+    gc.collect()
+    assert me.get_descendants() == {child}
+
+
+def test_closures_visit_diamond_shaped_networks_once():
+    top = create_quib(func=mock.Mock())
+    layer = [top]
+    for _ in range(30):
+        layer = [create_quib(func=mock.Mock(), args=tuple(layer)) for _ in range(2)]
+
+    assert len(layer[0].get_ancestors()) == 1 + 2 * 29
+    assert len(top.get_descendants()) == 2 * 30
+
+
 def test_named_parents():
     grandma = create_quib(func=mock.Mock(), assigned_name='grandma')
     mom = create_quib(func=mock.Mock(), args=(grandma,), assigned_name='mom')
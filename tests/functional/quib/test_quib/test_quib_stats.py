@@ -0,0 +1,100 @@
+import re
+
+import numpy as np
+
+from pyquibbler import iquib, quiby
+
+
+def test_stats_count_evaluations():
+    a = iquib(np.array([1., 2., 3.]))
+    b = quiby(lambda x: x * 2)(a).setp(cache_mode='on')
+    assert b.stats.num_evaluations == 0
+
+    b.get_value()
+    stats = b.stats
+    assert stats.num_evaluations == 1
+    assert stats.last_evaluation_time is not None
+    assert stats.total_evaluation_time >= stats.last_evaluation_time
+
+
+def test_stats_count_cache_hits_and_misses():
+    a = iquib(np.array([1., 2., 3.]))
+    b = quiby(lambda x: x * 2)(a).setp(cache_mode='on')
+    b.get_value()
+    b.get_value()
+    b.get_value()
+
+    stats = b.stats
+    assert (stats.cache_hits, stats.cache_misses) == (2, 1)
+    assert stats.cache_hit_rate == 2 / 3
+
+
+def test_stats_count_cache_miss_after_invalidation():
+    a = iquib(np.array([1., 2., 3.]))
+    b = quiby(lambda x: x * 2)(a).setp(cache_mode='on')
+    b.get_value()
+    a.assign(4., 0)
+    b.get_value()
+
+    assert b.stats.num_evaluations == 2
+    assert b.stats.cache_misses == 2
+
+
+def test_stats_cached_bytes():
+    a = iquib(np.zeros(100))
+    b = (a + 1).setp(cache_mode='on')
+    assert b.stats.cached_bytes == 0
+
+    b.get_value()
+    assert b.stats.cached_bytes >= 800
+
+
+def test_stats_translation_time():
+    a = iquib(np.zeros(100))
+    b = (a + 1).setp(cache_mode='on')
+    b[3].get_value()
+
+    assert b.stats.translation_time > 0
+
+
+def test_stats_override_time():
+    a = iquib(np.zeros(3))
+    b = (a + 1).setp(allow_overriding=True)
+    b.assigned_quibs = b
+    b.assign(7., 1)
+    b.get_value()
+
+    assert b.stats.override_time > 0
+
+
+def test_stats_count_array_allocations_and_in_place_evaluations():
+    a = iquib(np.zeros(3))
+    b = (a + 1).setp(cache_mode='on')
+    b.get_value()
+    num_array_allocations, num_in_place_evaluations = b.stats.num_array_allocations, b.stats.num_in_place_evaluations
+    assert num_array_allocations == 1
+
+    a[1] = 2.
+    b.get_value()
+    assert b.stats.num_array_allocations == num_array_allocations
+    assert b.stats.num_in_place_evaluations == num_in_place_evaluations + 1
+
+
+def test_stats_count_in_place_evaluation_of_sparse_invalidation():
+    a = iquib(np.zeros(10000))
+    b = (a + 1).setp(cache_mode='on')
+    b.get_value()
+    num_array_allocations, num_in_place_evaluations = b.stats.num_array_allocations, b.stats.num_in_place_evaluations
+
+    a[5] = 1.
+    assert b.get_value()[5] == 2.
+    assert b.stats.num_array_allocations == num_array_allocations
+    assert b.stats.num_in_place_evaluations == num_in_place_evaluations + 1
+
+
+def test_stats_str():
+    a = iquib(np.zeros(3))
+    b = (a + 1).setp(cache_mode='on')
+    b.get_value()
+
+    assert re.match(r'\d+ evaluations \(.* ms\), 0% cache hits, \d+ bytes cached', str(b.stats))
@@ -57,3 +57,20 @@ def test_quib_guard_within_quib_guard_exits_and_goes_back_to_previous_quib_guard
             pass
         # sanity, make sure we don't raise exception
         assert quib.get_value() == 3
+
+
+def test_quib_guard_allows_ancestors_of_allowed_quibs():
+    grandparent = iquib(3)
+    parent = grandparent + 1
+    quib = parent * 2
+    with QuibGuard({quib}):
+        assert grandparent.get_value() == 3
+        assert parent.get_value() == 4
+
+
+def test_quib_guard_does_not_allow_descendants_of_allowed_quibs():
+    quib = iquib(3)
+    child = quib + 1
+    with QuibGuard({quib}):
+        with pytest.raises(CannotAccessQuibInScopeException, match='.*'):
+            child.get_value()
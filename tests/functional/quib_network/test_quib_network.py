@@ -1,10 +1,15 @@
+import gc
+import threading
+import weakref
+
 import pytest
 from dataclasses import dataclass, field
 
-from typing import Set
+from typing import Set, Optional
 from unittest.mock import Mock
 
 from pyquibbler import iquib
+from pyquibbler.quib.graphics.main_thread import run_pending_main_thread_calls
 from pyquibbler.optional_packages.emulate_missing_packages import EMULATE_MISSING_PACKAGES
 
 
@@ -21,6 +26,8 @@ class MockQuib:
     parents: Set['MockQuib'] = field(default_factory=set)
     is_iquib: bool = False
     is_graphics: bool = False
+    assigned_name: Optional[str] = None
+    is_graphics_quib: bool = False
 
     def __hash__(self):
         return id(self)
@@ -109,3 +116,108 @@ def test_network_widget_is_created():
     b = a + 2
     w = dependency_graph(a, bypass_intermediate_quibs=False)
     assert {w.children[1].graph.nodes[0].data['id'], w.children[1].graph.nodes[1].data['id']} == {id(a), id(b)}
+
+
+def test_network_collapses_large_groups_of_intermediate_quibs():
+    from pyquibbler.quib_network.quib_network import QuibNetwork
+    focal = MockQuib('focal', assigned_name='focal')
+    intermediates = [MockQuib(str(num)) for num in range(4)]
+    result = MockQuib('result', assigned_name='result')
+    for parent, child in zip([focal] + intermediates, intermediates + [result]):
+        connect_quibs(parent, child)
+
+    network = QuibNetwork(focal_quib=focal, direction='all', bypass_intermediate_quibs=False,
+                          collapse_threshold=3)
+    node_ids_to_quibs, edge_ids_to_is_data = network.get_nodes_and_edges()
+
+    aggregate_node_id = f'aggregate-{min(id(quib) for quib in intermediates)}'
+    assert set(node_ids_to_quibs[aggregate_node_id]) == set(intermediates)
+    assert set(edge_ids_to_is_data) == {(id(focal), aggregate_node_id), (aggregate_node_id, id(result))}
+
+
+def test_network_does_not_collapse_small_groups_of_intermediate_quibs():
+    from pyquibbler.quib_network.quib_network import QuibNetwork
+    focal = MockQuib('focal', assigned_name='focal')
+    intermediate = MockQuib('intermediate')
+    connect_quibs(focal, intermediate)
+
+    network = QuibNetwork(focal_quib=focal, direction='all', bypass_intermediate_quibs=False,
+                          collapse_threshold=3)
+    node_ids_to_quibs, _ = network.get_nodes_and_edges()
+
+    assert node_ids_to_quibs == {id(focal): [focal], id(intermediate): [intermediate]}
+
+
+def test_live_network_widget_is_updated_incrementally():
+    from pyquibbler.quib_network.quib_network import QuibNetwork
+    a = iquib(1)
+    b = a + 2
+    network = QuibNetwork(focal_quib=a, bypass_intermediate_quibs=False)
+    w = network.get_network_widget(live=True)
+    original_nodes = list(w.graph.nodes)
+
+    c = b * 3
+    assert {node.data['id'] for node in w.graph.nodes} == {id(a), id(b), id(c)}
+    assert all(node in w.graph.nodes for node in original_nodes)
+    assert {(edge.data['source'], edge.data['target']) for edge in w.graph.edges} == {(id(a), id(b)), (id(b), id(c))}
+
+    del c
+    assert {node.data['id'] for node in w.graph.nodes} == {id(a), id(b)}
+
+    network.stop_live_updates()
+    d = b * 4  # noqa
+    assert len(w.graph.nodes) == 2
+
+
+def test_new_nodes_are_placed_next_to_positioned_neighbours():
+    from pyquibbler.quib_network.quib_network import QuibNetwork
+    a = iquib(1)
+    network = QuibNetwork(focal_quib=a, bypass_intermediate_quibs=False)
+    w = network.get_network_widget(live=True)
+    w.graph.nodes[0].position = {'x': 100., 'y': 100.}
+
+    b = a + 2
+    b_node, = [node for node in w.graph.nodes if node.data['id'] == id(b)]
+    assert b_node.position['y'] > 100.
+    assert w.cytoscape_layout['name'] == 'preset'
+
+
+def test_dependency_graph_is_not_live_by_default():
+    from pyquibbler.quib_network.quib_network import dependency_graph
+    a = iquib(1)
+    dependency_graph(a)
+
+    assert a.project._graph_change_callbacks == []
+
+
+def test_closing_live_network_widget_releases_the_network():
+    from pyquibbler.quib_network.quib_network import QuibNetwork
+    a = iquib(1)
+    network = QuibNetwork(focal_quib=a, bypass_intermediate_quibs=False)
+    w = network.get_network_widget(live=True)
+    network_ref = weakref.ref(network)
+
+    w.close()
+    del network, w
+    gc.collect()
+    b = a + 2  # noqa
+
+    assert network_ref() is None
+    assert a.project._graph_change_callbacks == []
+
+
+def test_live_network_is_updated_in_main_thread_upon_deletion_in_another_thread():
+    from pyquibbler.quib_network.quib_network import QuibNetwork
+    a = iquib(1)
+    quibs = [a + 2]
+    network = QuibNetwork(focal_quib=a, bypass_intermediate_quibs=False)
+    w = network.get_network_widget(live=True)
+
+    thread = threading.Thread(target=quibs.clear)
+    thread.start()
+    thread.join()
+    gc.collect()
+    assert len(w.graph.nodes) == 2
+
+    run_pending_main_thread_calls()
+    assert len(w.graph.nodes) == 1
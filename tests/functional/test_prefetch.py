@@ -0,0 +1,161 @@
+import threading
+
+import pytest
+
+from pyquibbler import iquib, quiby, CacheStatus
+from pyquibbler.quib.get_value_context_manager import get_value_context, is_within_get_value_context
+from pyquibbler.quib.quib_guard import QuibGuard
+from pyquibbler.utilities.deferring_lock import DeferringRLock
+from pyquibbler.utilities.input_validation_utils import InvalidArgumentTypeException
+
+
+@pytest.fixture
+def prefetching_project(project):
+    project.prefetch = True
+    yield project
+    assert project.wait_for_prefetch(timeout=5)
+
+
+@pytest.fixture
+def calculated_threads():
+    return []
+
+
+@pytest.fixture
+def slow_square(calculated_threads):
+    @quiby
+    def _slow_square(x):
+        calculated_threads.append(threading.current_thread())
+        return x ** 2
+    return _slow_square
+
+
+def test_project_prefetch_is_off_by_default(project):
+    assert project.prefetch is False
+
+
+def test_project_prefetch_validates_input(project):
+    with pytest.raises(InvalidArgumentTypeException, match='.*'):
+        project.prefetch = 'yes'
+
+
+def test_prefetch_calculates_parents_of_central_graphics_quib_in_background(prefetching_project,
+                                                                            slow_square, calculated_threads):
+    a = iquib(3)
+    b = slow_square(a).setp(cache_mode='on')
+    values = []
+    graphics_quib = quiby(lambda x: values.append(x), is_graphics=True)(b).setp(graphics_update='central')
+    assert values == [9]
+
+    a.assign(4)
+    assert prefetching_project.wait_for_prefetch(timeout=5)
+
+    assert b.cache_status == CacheStatus.ALL_VALID
+    assert calculated_threads[-1] is not threading.main_thread()
+
+    graphics_quib.get_value()
+    assert values == [9, 16]
+    assert len(calculated_threads) == 2
+
+
+def test_prefetch_does_not_calculate_when_off(project, slow_square, calculated_threads):
+    a = iquib(3)
+    b = slow_square(a).setp(cache_mode='on')
+    quiby(lambda x: None, is_graphics=True)(b).setp(graphics_update='central')
+    a.assign(4)
+
+    assert project.wait_for_prefetch(timeout=5)
+    assert b.cache_status == CacheStatus.ALL_INVALID
+    assert calculated_threads == [threading.main_thread()]
+
+
+def test_prefetch_does_not_calculate_graphics_quibs(prefetching_project):
+    a = iquib(3)
+    values = []
+    graphics_parent = quiby(lambda x: values.append(x) or x, is_graphics=True)(a)
+    quiby(lambda x: None, is_graphics=True)(graphics_parent).setp(graphics_update='central')
+    graphics_parent.graphics_update = 'never'
+    a.assign(4)
+
+    assert prefetching_project.wait_for_prefetch(timeout=5)
+    assert values == [3]
+
+
+def test_get_value_context_is_per_thread():
+    in_context_in_other_thread = []
+    with get_value_context():
+        thread = threading.Thread(target=lambda: in_context_in_other_thread.append(is_within_get_value_context()))
+        thread.start()
+        thread.join()
+        assert is_within_get_value_context()
+    assert in_context_in_other_thread == [False]
+
+
+def test_quib_guard_is_per_thread():
+    a = iquib(7)
+    values = []
+    with QuibGuard(set()):
+        thread = threading.Thread(target=lambda: values.append(a.get_value()))
+        thread.start()
+        thread.join()
+    assert values == [7]
+
+
+def test_deferring_lock_runs_action_immediately_when_free():
+    lock = DeferringRLock()
+    actions = []
+    lock.run_or_defer(lambda: actions.append(1))
+    assert actions == [1]
+
+
+def test_deferring_lock_runs_action_immediately_when_held_by_same_thread():
+    lock = DeferringRLock()
+    actions = []
+    with lock:
+        lock.run_or_defer(lambda: actions.append(1))
+        assert actions == [1]
+
+
+def test_deferring_lock_defers_action_when_held_by_other_thread():
+    lock = DeferringRLock()
+    actions = []
+    locked = threading.Event()
+    release = threading.Event()
+
+    def _hold_lock():
+        with lock:
+            locked.set()
+            release.wait()
+            actions.append('calculated')
+
+    thread = threading.Thread(target=_hold_lock)
+    thread.start()
+    locked.wait()
+    lock.run_or_defer(lambda: actions.append('invalidated'))
+    assert actions == []
+    release.set()
+    thread.join()
+    assert actions == ['calculated', 'invalidated']
+
+
+def test_invalidation_during_background_calculation_is_applied_after_it():
+    a = iquib(3)
+    started = threading.Event()
+    release = threading.Event()
+
+    @quiby
+    def blocking_square(x):
+        started.set()
+        release.wait()
+        return x ** 2
+
+    b = blocking_square(a).setp(cache_mode='on')
+    thread = threading.Thread(target=b.get_value)
+    thread.start()
+    started.wait()
+    a.assign(4)
+    release.set()
+    thread.join()
+
+    assert b.cache_status == CacheStatus.ALL_INVALID
+    assert b.get_value() == 16
@@ -1,6 +1,7 @@
 import weakref
 from unittest import mock
 
+import numpy as np
 import pytest
 
 import pyquibbler as qb
@@ -398,3 +399,16 @@ def test_set_project_directory_affects_quib_directory(project):
     assert(str(quib.actual_save_directory).endswith('test'))
     project.directory = None
     assert quib.actual_save_directory is None
+
+
+def test_get_profile(project):
+    a = iquib(np.zeros(3))
+    b = (a + 1).setp(cache_mode='on')
+    c = (b * 2).setp(cache_mode='on')
+    c.get_value()
+
+    profile = project.get_profile()
+    assert set(profile['quib']) == {b, c}
+    assert all(num_evaluations > 0 for num_evaluations in profile['num_evaluations'])
+    assert profile['total_evaluation_time'] == sorted(profile['total_evaluation_time'], reverse=True)
+    assert set(profile) >= {'quib', 'num_evaluations', 'cache_hits', 'cache_misses', 'cached_bytes'}
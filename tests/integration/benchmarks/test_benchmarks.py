@@ -1,7 +1,11 @@
+import tracemalloc
+
 import pytest
 
 from ...conftest import plt_show
-from pyquibbler import iquib, q
+from pyquibbler import iquib, q, CacheMode
+from pyquibbler.path import PathComponent
+from pyquibbler.quib.func_calling.cached_quib_func_call import CachedQuibFuncCall
 import numpy as np
 
 
@@ -84,3 +88,141 @@ def test_speed_drag(benchmark, axes, create_axes_mouse_press_move_release_events
     # default -> 2.23 s
     # TkAgg -> 1.34 s
     # macos -> 1.34 s
+
+
+@pytest.mark.benchmark()
+def test_speed_pass_quibs_vectorize_over_deep_network(benchmark):
+    a = iquib(np.arange(10.))
+    for _ in range(50):
+        a = a + 1
+
+    b = np.vectorize(lambda x: x.get_value(), pass_quibs=True, otypes=[float])(a)
+
+    def reevaluate():
+        b.invalidate()
+        return b.get_value()
+
+    benchmark(reevaluate)
+
+
+@pytest.mark.benchmark()
+def test_speed_bulk_assignment_through_elementwise_chain(benchmark):
+    a = iquib(np.arange(100_000.))
+    b = a
+    for index in range(10):
+        b = b * 2. if index % 2 else b + 1.
+    b.get_value()
+    values = np.arange(99_900.)
+
+    def assign():
+        b[100:] = values
+
+    benchmark(assign)
+    assert np.array_equal(b.get_value()[100:], values)
+
+
+@pytest.mark.benchmark()
+@pytest.mark.parametrize('fuse', [False, True])
+def test_speed_reevaluate_elementwise_expression(benchmark, project, monkeypatch, fuse):
+    monkeypatch.setattr(CachedQuibFuncCall, 'DEFAULT_CACHE_MODE', CacheMode.AUTO)
+    project.fuse_elementwise_chains = fuse
+    a = iquib(np.arange(1_000_000.))
+    b = iquib(np.arange(1_000_000.))
+    c = np.sin(a) * 2 + b ** 2 - 1
+
+    def reevaluate():
+        a.invalidate()
+        return c.get_value()
+
+    benchmark(reevaluate)
+
+
+@pytest.mark.benchmark()
+def test_speed_reevaluate_partially_invalidated_reduction(benchmark):
+    a = iquib(np.zeros((1000, 1000)))
+    b = np.sum(a, axis=0)
+    b.get_value()
+
+    def invalidate():
+        b.handler.quib_function_call.invalidate_cache_at_path([PathComponent(500)])
+
+    benchmark.pedantic(b.get_value, setup=invalidate, rounds=50)
+
+
+@pytest.mark.benchmark()
+def test_speed_reevaluate_accumulation_invalidated_near_end(benchmark):
+    a = iquib(np.zeros(1_000_000))
+    b = np.cumsum(a)
+    b.get_value()
+
+    def invalidate():
+        b.handler.quib_function_call.invalidate_cache_at_path([PathComponent(slice(-100, None))])
+
+    benchmark.pedantic(b.get_value, setup=invalidate, rounds=50)
+
+
+@pytest.mark.benchmark()
+def test_speed_invalidate_element_through_transposed_slice(benchmark):
+    a = iquib(np.zeros((1000, 1000)))
+    b = np.transpose(a)[100:900:2]
+    b.get_value()
+
+    def invalidate():
+        a.handler.invalidate_and_aggregate_redraw_at_path([PathComponent((500, 300))])
+
+    benchmark(invalidate)
+
+
+@pytest.mark.benchmark()
+def test_memory_invalidate_element_through_binary_elementwise(benchmark):
+    a = iquib(np.zeros((1000, 1000)))
+    b = iquib(np.zeros((1000, 1000)))
+    c = a + b
+    c.get_value()
+
+    def invalidate():
+        a.handler.invalidate_and_aggregate_redraw_at_path([PathComponent((500, 300))])
+
+    tracemalloc.start()
+    invalidate()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    benchmark.extra_info['peak_memory_bytes'] = peak_memory
+    benchmark(invalidate)
+
+    # narrower than a single int64 index-code array of the data:
+    assert peak_memory < a.get_value().nbytes
+
+
+@pytest.mark.benchmark()
+def test_speed_get_shape_of_unevaluated_array_chain(benchmark):
+    a = iquib(np.zeros((1000, 1000)))
+
+    def create_chain():
+        return (np.sum(np.exp(np.transpose(a) + 1)[::2], axis=0), ), {}
+
+    benchmark.pedantic(lambda b: b.get_shape(), setup=create_chain, rounds=50)
+
+
+@pytest.mark.benchmark()
+def test_speed_invalidate_element_of_overridden_array(benchmark):
+    a = iquib(np.zeros((1000, 1000)))
+    a[0, 0] = 1
+    b = np.transpose(a + 1)
+    b.get_value()
+
+    def invalidate():
+        a.handler.invalidate_and_aggregate_redraw_at_path([PathComponent((500, 300))])
+
+    benchmark(invalidate)
+
+
+@pytest.mark.benchmark()
+def test_speed_get_cached_value_of_array(benchmark):
+    a = iquib(np.zeros((2000, 2000)))
+    b = a + 1
+    b.get_value()
+    a.handler.invalidate_and_aggregate_redraw_at_path([PathComponent((500, 300))])
+    b.get_value()
+
+    benchmark(b.get_value)
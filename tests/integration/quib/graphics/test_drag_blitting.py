@@ -0,0 +1,73 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from pyquibbler import iquib
+from pyquibbler.env import BLIT_WHILE_DRAGGING
+from pyquibbler.quib.graphics.blitting import get_drag_blitter, start_drag_blitting
+from tests.integration.quib.graphics.widgets.utils import count_canvas_draws
+
+
+@pytest.fixture
+def agg_axes(axes):
+    template_canvas = axes.figure.canvas
+    canvas = FigureCanvasAgg(axes.figure)
+    canvas.manager = template_canvas.manager
+    axes.set_xlim([0, 20])
+    axes.set_ylim([0, 1])
+    return axes
+
+
+@pytest.fixture
+def blit_while_dragging():
+    with BLIT_WHILE_DRAGGING.temporary_set(True):
+        yield
+
+
+def test_drag_with_blitting_draws_canvas_only_at_start_and_end(agg_axes, blit_while_dragging,
+                                                               create_axes_mouse_press_move_release_events):
+    marker_x = iquib(15)
+    agg_axes.plot(marker_x, 0.5, marker='o', markersize=30, pickradius=30)
+    static_plot = agg_axes.plot(np.arange(20), np.random.rand(20))
+    mirrored_x = agg_axes.plot(20 - marker_x, 0.5, marker='x')
+
+    with count_canvas_draws(agg_axes.figure.canvas) as canvas_draw_count:
+        create_axes_mouse_press_move_release_events(((15, 0.5), (12, 0.5), (10, 0.5), (8, 0.5)))
+
+    assert marker_x.get_value() == 8
+    assert canvas_draw_count.count == 2  # start + end of dragging
+    assert get_drag_blitter(agg_axes.figure.canvas) is None
+    assert not mirrored_x.get_value()[0].get_animated()
+    assert not static_plot[0].get_animated()
+    assert np.array_equal(mirrored_x.get_value()[0].get_xdata(), [12])
+
+
+def test_drag_blits_only_graphics_quibs_downstream_of_assigned_quibs(agg_axes, blit_while_dragging,
+                                                                     create_axes_mouse_press_move_release_events):
+    base_x = iquib(15)
+    marker_x = (base_x + 0).setp(assigned_quibs='self')
+    marker = agg_axes.plot(marker_x, 0.5, marker='o', markersize=30, pickradius=30)
+    mirrored_marker = agg_axes.plot(20 - marker_x, 0.5, marker='x')
+    agg_axes.plot(base_x, 0.2, marker='x')
+
+    with mock.patch('pyquibbler.quib.graphics.event_handling.canvas_event_handler.start_drag_blitting',
+                    wraps=start_drag_blitting) as mock_start_drag_blitting:
+        create_axes_mouse_press_move_release_events(((15, 0.5), (12, 0.5), (10, 0.5), (8, 0.5)))
+
+    assert marker_x.get_value() == 8
+    assert base_x.get_value() == 15
+    mock_start_drag_blitting.assert_called_once()
+    assert set(mock_start_drag_blitting.call_args[0][1]) == {marker, mirrored_marker}
+
+
+def test_drag_without_blitting_draws_canvas_upon_each_motion(agg_axes, create_axes_mouse_press_move_release_events):
+    marker_x = iquib(15)
+    agg_axes.plot(marker_x, 0.5, marker='o', markersize=30, pickradius=30)
+
+    with count_canvas_draws(agg_axes.figure.canvas) as canvas_draw_count:
+        create_axes_mouse_press_move_release_events(((15, 0.5), (12, 0.5), (10, 0.5), (8, 0.5)))
+
+    assert marker_x.get_value() == 8
+    assert canvas_draw_count.count == 3